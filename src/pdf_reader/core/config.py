@@ -2,9 +2,40 @@
 
 import os
 import json
+import mmap
+import time
+import logging
+import functools
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+if orjson is not None:
+    def _dumps(obj) -> bytes:
+        """Serialize configuration data to indented JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _loads(data):
+        """Deserialize configuration data from JSON bytes."""
+        return orjson.loads(data)
+else:
+    def _dumps(obj) -> bytes:
+        """Serialize configuration data to indented JSON bytes."""
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+    def _loads(data):
+        """Deserialize configuration data from JSON bytes."""
+        # json.loads does not accept buffer objects such as memoryview
+        return json.loads(bytes(data))
 
 # Application information
 APP_NAME = "PDF Reader"
@@ -20,6 +51,7 @@ MAX_RECENT_DOCUMENTS = 5  # Maximum number of recent documents to track
 # Performance settings
 CONTINUOUS_SCROLL_BUFFER_PAGES = 2  # Pages to render around visible area
 VIRTUALIZATION_ENABLED = True
+PAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # On-disk budget for rasterized pages
 
 # UI settings
 DEFAULT_WINDOW_WIDTH = 1200
@@ -34,6 +66,51 @@ THEMES_DIR = ASSETS_DIR / "themes"
 # Configuration directory
 CONFIG_DIR = Path.home() / ".pdf_reader"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+PAGE_CACHE_FILE_NAME = "page_cache.sqlite3"
+
+
+# Default configuration as flat (key path, value) pairs
+_DEFAULTS = (
+    (('window', 'width'), DEFAULT_WINDOW_WIDTH),
+    (('window', 'height'), DEFAULT_WINDOW_HEIGHT),
+    (('window', 'maximized'), False),
+    (('viewer', 'default_zoom'), DEFAULT_ZOOM_FACTOR),
+    (('viewer', 'zoom_step'), ZOOM_STEP),
+    (('viewer', 'virtualization'), VIRTUALIZATION_ENABLED),
+    (('viewer', 'buffer_pages'), CONTINUOUS_SCROLL_BUFFER_PAGES),
+    (('ui', 'toolbar_icon_size'), TOOLBAR_ICON_SIZE),
+    (('ui', 'theme'), "default"),
+    (('files', 'max_recent'), MAX_RECENT_FILES),
+    (('files', 'recent_files'), []),
+    # file_path: {"last_page": int, "last_opened": str, "total_pages": int}
+    (('document_history', 'documents'), {}),
+    # List of recently opened documents with reading progress
+    (('document_history', 'recent_documents'), []),
+    (('app', 'first_run'), True),
+)
+
+# Pre-split key paths for settings read on hot paths
+_K_RECENT_FILES = ('files', 'recent_files')
+_K_MAX_RECENT = ('files', 'max_recent')
+_K_RECENT_DOCUMENTS = ('document_history', 'recent_documents')
+
+
+# Last generated progress timestamp as [monotonic time, ISO string]
+_last_timestamp = [float('-inf'), ""]
+
+
+def _progress_timestamp() -> str:
+    """Return a second-precision UTC ISO timestamp, reused within the same second."""
+    now = time.monotonic()
+    if now - _last_timestamp[0] >= 1.0:
+        _last_timestamp[:] = [now, datetime.now(timezone.utc).isoformat(timespec='seconds')]
+    return _last_timestamp[1]
+
+
+@functools.lru_cache(maxsize=64)
+def _split_key_path(key_path: str) -> tuple:
+    """Split a dot-notation key path into a tuple of keys."""
+    return tuple(key_path.split('.'))
 
 
 class Config:
@@ -41,76 +118,77 @@ class Config:
     
     def __init__(self):
         self._config = self._load_default_config()
+        self._recent_files = OrderedDict()  # file_path -> None, most recent first
+        self._recent_documents = OrderedDict()  # file_path -> recent document entry
+        self._pending_progress = {}  # file_path -> (current_page, total_pages) not yet committed
         self.load()
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration values."""
-        return {
-            "window": {
-                "width": DEFAULT_WINDOW_WIDTH,
-                "height": DEFAULT_WINDOW_HEIGHT,
-                "maximized": False,
-            },
-            "viewer": {
-                "default_zoom": DEFAULT_ZOOM_FACTOR,
-                "zoom_step": ZOOM_STEP,
-                "virtualization": VIRTUALIZATION_ENABLED,
-                "buffer_pages": CONTINUOUS_SCROLL_BUFFER_PAGES,
-            },
-            "ui": {
-                "toolbar_icon_size": TOOLBAR_ICON_SIZE,
-                "theme": "default",
-            },
-            "files": {
-                "max_recent": MAX_RECENT_FILES,
-                "recent_files": [],
-            },
-            "document_history": {
-                "documents": {},  # file_path: {"last_page": int, "last_opened": str, "total_pages": int}
-                "recent_documents": []  # List of recently opened documents with reading progress
-            },
-            "app": {
-                "first_run": True
-            }
-        }
+        config = {}
+        for keys, value in _DEFAULTS:
+            section = config
+            for key in keys[:-1]:
+                section = section.setdefault(key, {})
+            # Copy mutable defaults so instances never share them
+            section[keys[-1]] = value.copy() if isinstance(value, (dict, list)) else value
+        return config
     
     def load(self):
         """Load configuration from file."""
         if CONFIG_FILE.exists():
             try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    saved_config = json.load(f)
-                self._merge_config(saved_config)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading config: {e}")
+                saved_config = None
+                with open(CONFIG_FILE, 'rb') as f:
+                    # mmap cannot map an empty file, so treat it as no saved config
+                    if os.fstat(f.fileno()).st_size > 0:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                saved_config = _loads(view)
+                if saved_config is not None:
+                    self._merge_config(saved_config)
+            except (json.JSONDecodeError, IOError):
+                logger.exception("Error loading config")
+        self._rebuild_recent_indexes()
     
     def save(self):
         """Save configuration to file."""
         CONFIG_DIR.mkdir(exist_ok=True)
+        # Recent documents are kept in the OrderedDict index and only
+        # materialized into the serializable list when writing to disk
+        self._set_path(_K_RECENT_DOCUMENTS, list(self._recent_documents.values()))
         try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2)
-        except IOError as e:
-            print(f"Error saving config: {e}")
+            with open(CONFIG_FILE, 'wb') as f:
+                f.write(_dumps(self._config))
+        except IOError:
+            logger.exception("Error saving config")
+
+    def page_cache_file(self) -> Path:
+        """Get the path of the on-disk page image cache."""
+        return CONFIG_DIR / PAGE_CACHE_FILE_NAME
 
     def _merge_config(self, saved_config: Dict[str, Any]):
         """Merge saved configuration with defaults."""
-        def merge_dict(default, saved):
-            for key, value in saved.items():
-                if key in default:
-                    if isinstance(default[key], dict) and isinstance(value, dict):
-                        merge_dict(default[key], value)
-                    else:
-                        default[key] = value
-                else:
-                    # Allow new keys to be added to dictionaries (especially for documents)
-                    default[key] = value
-        
-        merge_dict(self._config, saved_config)
+        # Defaults are at most two levels deep (section -> key), so updating
+        # each section in a single pass is equivalent to a recursive merge.
+        # Keys not in the defaults (e.g. documents, dock_state) are kept as saved.
+        for section, value in saved_config.items():
+            default = self._config.get(section)
+            if isinstance(default, dict) and isinstance(value, dict):
+                default.update(value)
+            else:
+                self._config[section] = value
     
     def get(self, key_path: str, default=None):
         """Get configuration value using dot notation (e.g., 'window.width')."""
-        keys = key_path.split('.')
+        return self._get_path(_split_key_path(key_path), default)
+    
+    def set(self, key_path: str, value: Any):
+        """Set configuration value using dot notation."""
+        self._set_path(_split_key_path(key_path), value)
+    
+    def _get_path(self, keys: tuple, default=None):
+        """Get configuration value using a pre-split key tuple."""
         value = self._config
         
         for key in keys:
@@ -121,9 +199,8 @@ class Config:
         
         return value
     
-    def set(self, key_path: str, value: Any):
-        """Set configuration value using dot notation."""
-        keys = key_path.split('.')
+    def _set_path(self, keys: tuple, value: Any):
+        """Set configuration value using a pre-split key tuple."""
         config = self._config
         
         for key in keys[:-1]:
@@ -133,30 +210,43 @@ class Config:
         
         config[keys[-1]] = value
     
+    def _rebuild_recent_indexes(self):
+        """Rebuild the ordered recent-file/document indexes from the stored lists."""
+        self._recent_files = OrderedDict.fromkeys(self._get_path(_K_RECENT_FILES, []))
+        self._recent_documents = OrderedDict(
+            (doc.get('file_path'), doc)
+            for doc in self._get_path(_K_RECENT_DOCUMENTS, [])
+        )
+    
     def get_recent_files(self):
         """Get list of recent files."""
-        return self.get('files.recent_files', [])
+        return self._get_path(_K_RECENT_FILES, [])
     
     def add_recent_file(self, file_path: str):
         """Add a file to the recent files list."""
-        recent_files = self.get_recent_files()
-        
-        # Remove if already exists
-        if file_path in recent_files:
-            recent_files.remove(file_path)
-        
-        # Add to beginning
-        recent_files.insert(0, file_path)
+        if next(iter(self._recent_files), None) == file_path:
+            return  # Already the most recent file; keep the stored list as it is
+        # Move (or insert) to the front in O(1)
+        self._recent_files[file_path] = None
+        self._recent_files.move_to_end(file_path, last=False)
         
         # Limit to max recent files
-        max_recent = self.get('files.max_recent', MAX_RECENT_FILES)
-        if len(recent_files) > max_recent:
-            recent_files = recent_files[:max_recent]
+        max_recent = self._get_path(_K_MAX_RECENT, MAX_RECENT_FILES)
+        while len(self._recent_files) > max_recent:
+            self._recent_files.popitem()
         
-        self.set('files.recent_files', recent_files)
+        # Stored as a plain list to keep the on-disk format unchanged
+        self._set_path(_K_RECENT_FILES, list(self._recent_files))
+
+    def remove_recent_file(self, file_path: str):
+        """Remove a file from the recent files list."""
+        if file_path in self._recent_files:
+            del self._recent_files[file_path]
+            self._set_path(_K_RECENT_FILES, list(self._recent_files))
 
     def clear_recent_files(self):
         """Clear the recent files list."""
+        self._recent_files.clear()
         self._config["files"]["recent_files"] = []
 
     def is_first_run(self):
@@ -178,12 +268,17 @@ class Config:
 
     def get_recent_documents(self) -> List[Dict]:
         """Get list of recent documents with reading progress."""
-        return self.get('document_history.recent_documents', [])
+        return list(self._recent_documents.values())
+    
+    def get_recent_document(self, file_path: str) -> Optional[Dict]:
+        """Get the recent document entry for a file, or None if it has none."""
+        return self._recent_documents.get(file_path)
     
     def update_document_progress(self, file_path: str, current_page: int, total_pages: int):
         """Update reading progress for a document."""
-        documents = self.get_document_history()
-        timestamp = datetime.now().isoformat()
+        # Mutate the stored dict in place; no need to write it back
+        documents = self._config.setdefault("document_history", {}).setdefault("documents", {})
+        timestamp = _progress_timestamp()
         
         # Update or create document entry
         documents[file_path] = {
@@ -192,33 +287,48 @@ class Config:
             "total_pages": total_pages
         }
         
-        self.set('document_history.documents', documents)
-        
         # Update recent documents list
         self._update_recent_documents(file_path, current_page, total_pages, timestamp)
+        
+        # An explicit update supersedes any pending page for this document
+        self._pending_progress.pop(file_path, None)
+    
+    def record_page(self, file_path: str, current_page: int, total_pages: int):
+        """Record the current page in memory; applied later by commit_progress()."""
+        self._pending_progress[file_path] = (current_page, total_pages)
+    
+    def commit_progress(self) -> bool:
+        """Apply recorded pages to the document history. Returns True if anything changed."""
+        if not self._pending_progress:
+            return False
+        pending, self._pending_progress = self._pending_progress, {}
+        for file_path, (current_page, total_pages) in pending.items():
+            self.update_document_progress(file_path, current_page, total_pages)
+        return True
     
     def _update_recent_documents(self, file_path: str, current_page: int, total_pages: int, timestamp: str):
         """Update the recent documents list with current document."""
-        recent_docs = self.get_recent_documents()
-        
-        # Remove existing entry for this document
-        recent_docs = [doc for doc in recent_docs if doc.get('file_path') != file_path]
+        progress_percent = round((current_page / max(total_pages, 1)) * 100, 1)
+        doc_entry = self._recent_documents.get(file_path)
+        if doc_entry is None:
+            # Create new entry
+            doc_entry = {
+                "file_path": file_path,
+                "filename": os.path.basename(file_path),
+            }
+            self._recent_documents[file_path] = doc_entry
         
-        # Create new entry
-        doc_entry = {
-            "file_path": file_path,
-            "filename": os.path.basename(file_path),
-            "last_page": current_page,
-            "total_pages": total_pages,
-            "last_opened": timestamp,
-            "progress_percent": round((current_page / max(total_pages, 1)) * 100, 1)
-        }
-          # Add to beginning of list
-        recent_docs.insert(0, doc_entry)
+        # Update the entry in place and move it to the beginning
+        doc_entry.update(
+            last_page=current_page,
+            total_pages=total_pages,
+            last_opened=timestamp,
+            progress_percent=progress_percent,
+        )
+        self._recent_documents.move_to_end(file_path, last=False)
         # Keep only the most recent documents
-        recent_docs = recent_docs[:MAX_RECENT_DOCUMENTS]
-        
-        self.set('document_history.recent_documents', recent_docs)
+        while len(self._recent_documents) > MAX_RECENT_DOCUMENTS:
+            self._recent_documents.popitem()
 
     def get_document_history(self):
         """Get the document history dictionary."""
@@ -232,15 +342,10 @@ class Config:
     def remove_document_from_history(self, file_path: str):
         """Remove a document from reading history."""
         # Remove from documents history
-        documents = self.get_document_history()
-        if file_path in documents:
-            del documents[file_path]
-            self.set('document_history.documents', documents)
+        self.get_document_history().pop(file_path, None)
         
         # Remove from recent documents
-        recent_docs = self.get_recent_documents()
-        recent_docs = [doc for doc in recent_docs if doc.get('file_path') != file_path]
-        self.set('document_history.recent_documents', recent_docs)
+        self._recent_documents.pop(file_path, None)
         
     def get_window_state(self):
         """Get window state with defaults."""
@@ -2,8 +2,10 @@
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Optional
-from PyQt6.QtCore import QPoint
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PyQt6.QtCore import QPoint
 
 
 class ViewMode(Enum):
@@ -41,8 +43,8 @@ class Annotation:
     """Represents an annotation in a PDF document."""
     type: AnnotationType
     page: int
-    start: QPoint
-    end: QPoint = None
+    start: "QPoint"
+    end: "QPoint" = None
     text: str = None
     
     def __post_init__(self):
@@ -0,0 +1,202 @@
+"""Persistent on-disk cache of rasterized PDF pages."""
+
+import os
+import time
+import zlib
+import struct
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional
+
+from .config import PAGE_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Bytes hashed from each end of a file to identify a document
+_KEY_HEAD_BYTES = 1024 * 1024
+_KEY_TAIL_BYTES = 64 * 1024
+
+# Pages written between prunes, so one long session cannot outgrow the budget
+_PRUNE_EVERY_WRITES = 32
+
+# Stored pages are raw RGB samples behind a (magic, width, height, stride) header
+_SAMPLES_MAGIC = b'RGB1'
+_SAMPLES_HEADER = struct.Struct('<4sIII')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    doc_key TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    zoom REAL NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (doc_key, page, zoom)
+)
+"""
+
+
+def document_key(file_path: str) -> Optional[str]:
+    """
+    Identify a document by its size, modification time and the bytes at both
+    ends of the file.
+
+    Hashing only the head and tail keeps this cheap for large files, while
+    incremental saves, which append to the end of a PDF, still change the key.
+    The modification time catches rewrites that leave both ends untouched.
+
+    Args:
+        file_path: Path to the PDF file
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            digest = hashlib.sha256(f"{size}:{stat.st_mtime_ns}".encode('ascii'))
+            digest.update(f.read(_KEY_HEAD_BYTES))
+            if size > _KEY_HEAD_BYTES:
+                f.seek(max(_KEY_HEAD_BYTES, size - _KEY_TAIL_BYTES))
+                digest.update(f.read())
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+def encode_page_samples(width: int, height: int, stride: int, samples: bytes) -> bytes:
+    """
+    Pack raw RGB page samples for storage.
+
+    The fastest zlib level is used: stored pages must decode quicker than
+    PyMuPDF can render them again, which rules out image formats like PNG.
+    """
+    return _SAMPLES_HEADER.pack(_SAMPLES_MAGIC, width, height, stride) + zlib.compress(samples, 1)
+
+
+def decode_page_samples(data: bytes) -> Optional[tuple]:
+    """Unpack stored samples as (width, height, stride, samples), or None if not in this format."""
+    if len(data) < _SAMPLES_HEADER.size:
+        return None
+    magic, width, height, stride = _SAMPLES_HEADER.unpack_from(data)
+    if magic != _SAMPLES_MAGIC:
+        return None
+    try:
+        samples = zlib.decompress(memoryview(data)[_SAMPLES_HEADER.size:])
+    except zlib.error:
+        return None
+    if len(samples) != stride * height:
+        return None
+    return width, height, stride, samples
+
+
+class PageCache:
+    """SQLite store of encoded page images, pruned to a size budget by last use."""
+
+    def __init__(self, path: Path, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._disabled = False
+        self._writes_since_prune = 0
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use; None once an error has disabled the cache."""
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(self.path)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(_SCHEMA)
+                self._prune()
+                self._conn.commit()
+            except sqlite3.Error:
+                logger.exception("Error opening page cache")
+                self._disable()
+        return self._conn
+
+    def _disable(self):
+        """Stop using the cache after a database error."""
+        self._disabled = True
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _prune(self):
+        """Delete least recently used pages until the cache fits its budget."""
+        excess = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for doc_key, page, zoom, size in self._conn.execute(
+            "SELECT doc_key, page, zoom, size FROM pages ORDER BY last_used"
+        ):
+            stale.append((doc_key, page, zoom))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM pages WHERE doc_key = ? AND page = ? AND zoom = ?", stale)
+
+    def get(self, doc_key: str, page: int, zoom: float) -> Optional[bytes]:
+        """Return the stored image for a page, or None if it is not cached."""
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT data FROM pages WHERE doc_key = ? AND page = ? AND zoom = ?",
+                (doc_key, page, zoom)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE pages SET last_used = ? WHERE doc_key = ? AND page = ? AND zoom = ?",
+                (int(time.time()), doc_key, page, zoom)
+            )
+            return row[0]
+        except sqlite3.Error:
+            logger.exception("Error reading page cache")
+            self._disable()
+            return None
+
+    def put(self, doc_key: str, page: int, zoom: float, data: bytes):
+        """Store the image for a page; written to disk on the next flush()."""
+        conn = self._connection()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (doc_key, page, zoom, data, len(data), int(time.time()))
+            )
+            self._writes_since_prune += 1
+        except sqlite3.Error:
+            logger.exception("Error writing page cache")
+            self._disable()
+
+    def put_many(self, entries):
+        """Store (doc_key, page, zoom, data) entries and commit them together."""
+        for entry in entries:
+            self.put(*entry)
+        self.flush()
+
+    def flush(self):
+        """Commit pending writes, pruning to the budget once enough pages have been written."""
+        if self._conn is not None:
+            try:
+                if self._writes_since_prune >= _PRUNE_EVERY_WRITES:
+                    self._prune()
+                    self._writes_since_prune = 0
+                self._conn.commit()
+            except sqlite3.Error:
+                logger.exception("Error writing page cache")
+                self._disable()
+
+    def close(self):
+        """Commit pending writes and close the database; later writes are ignored."""
+        self.flush()
+        self._disable()
@@ -3,10 +3,17 @@
 import os
 import sys
 import logging
+import functools
 from pathlib import Path
-from typing import List, Tuple, Optional
-from PyQt6.QtCore import QStandardPaths
-from PyQt6.QtGui import QPixmap, QIcon
+from typing import List, Tuple, Optional, TYPE_CHECKING
+
+from .config import ICONS_DIR
+
+if TYPE_CHECKING:
+    from PyQt6.QtGui import QIcon
+
+# Units used by format_file_size, indexed by power of 1024
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
 
 
 def setup_logging(debug_mode: bool = False) -> logging.Logger:
@@ -19,6 +26,8 @@ def setup_logging(debug_mode: bool = False) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    from PyQt6.QtCore import QStandardPaths
+    
     log_level = logging.DEBUG if debug_mode else logging.INFO
     
     # Create logs directory
@@ -38,14 +47,18 @@ def setup_logging(debug_mode: bool = False) -> logging.Logger:
     return logging.getLogger("pdf_reader")
 
 
-def get_application_icon() -> QIcon:
+@functools.lru_cache(maxsize=None)
+def get_application_icon() -> "QIcon":
     """
     Get the main application icon.
     
+    The result is cached; call ``get_application_icon.cache_clear()`` if the
+    icon files change at runtime.
+    
     Returns:
         QIcon instance for the application
     """
-    from .config import ICONS_DIR
+    from PyQt6.QtGui import QIcon
     
     icon_path = ICONS_DIR / "app_icon.png"
     if icon_path.exists():
@@ -55,17 +68,21 @@ def get_application_icon() -> QIcon:
     return QIcon()
 
 
-def get_toolbar_icon(icon_name: str) -> QIcon:
+@functools.lru_cache(maxsize=128)
+def get_toolbar_icon(icon_name: str) -> "QIcon":
     """
     Get a toolbar icon by name.
     
+    Results are cached per icon name; call ``get_toolbar_icon.cache_clear()``
+    after a theme change to pick up new icons.
+    
     Args:
         icon_name: Name of the icon (without extension)
         
     Returns:
         QIcon instance for the toolbar
     """
-    from .config import ICONS_DIR
+    from PyQt6.QtGui import QIcon
     
     # Try different formats
     for ext in ['.svg', '.png', '.ico']:
@@ -87,11 +104,8 @@ def validate_pdf_file(file_path: str) -> bool:
     Returns:
         True if the file exists and has a .pdf extension, False otherwise
     """
-    if not file_path:
-        return False
-        
-    path = Path(file_path)
-    return path.exists() and path.suffix.lower() == '.pdf'
+    # Check the extension first so non-PDF paths never hit the filesystem
+    return bool(file_path) and file_path.casefold().endswith('.pdf') and os.path.isfile(file_path)
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -104,18 +118,14 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 MB", "342 KB")
     """
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    size = float(size_bytes)
-    
-    while size >= 1024.0 and i < len(size_names) - 1:
-        size /= 1024.0
-        i += 1
+    # Each unit step is a factor of 1024 (2**10), so the bit length gives the unit index directly
+    i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_NAMES) - 1)
+    size = size_bytes / (1 << (i * 10))
     
-    return f"{size:.1f} {size_names[i]}"
+    return f"{size:.1f} {_SIZE_NAMES[i]}"
 
 
 def get_file_info(file_path: str) -> dict:
@@ -3,7 +3,7 @@
 import os
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QTextEdit, QFrame, QWidget, QApplication
+    QTextEdit, QFrame, QWidget, QApplication, QGraphicsOpacityEffect
 )
 from PyQt6.QtGui import QIcon, QPixmap, QFont
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPropertyAnimation, QEasingCurve
@@ -16,6 +16,7 @@ class UserFeedbackWidget(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._current_message_type = None
         self.setup_ui()
         self.hide()  # Hidden by default
         
@@ -23,14 +24,17 @@ class UserFeedbackWidget(QWidget):
         self.auto_hide_timer.timeout.connect(self.hide_animated)
         self.auto_hide_timer.setSingleShot(True)
         
-        # Animation for smooth show/hide
-        self.animation = QPropertyAnimation(self, b"maximumHeight")
+        # Fade animation for smooth show/hide; animating opacity is composited
+        # and avoids relayouting the window on every frame
+        self.opacity_effect = QGraphicsOpacityEffect(self)
+        self.setGraphicsEffect(self.opacity_effect)
+        self.animation = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.animation.setDuration(300)
         self.animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self.animation.finished.connect(self._on_animation_finished)
         
     def setup_ui(self):
         """Set up the feedback widget UI."""
-        self.setMaximumHeight(0)  # Start hidden
         self.setStyleSheet("""
             UserFeedbackWidget {
                 background-color: #e3f2fd;
@@ -120,10 +124,12 @@ class UserFeedbackWidget(QWidget):
         }
         self.icon_label.setText(icon_map.get(message_type, "ℹ️"))
         
-        # Set message type for styling
-        self.setProperty("messageType", message_type)
-        self.style().unpolish(self)
-        self.style().polish(self)
+        # Set message type for styling (re-polish only when the type changes)
+        if message_type != self._current_message_type:
+            self.setProperty("messageType", message_type)
+            self.style().unpolish(self)
+            self.style().polish(self)
+            self._current_message_type = message_type
         
         # Configure action button
         if action_text and action_data:
@@ -142,16 +148,20 @@ class UserFeedbackWidget(QWidget):
     def show_animated(self):
         """Show the widget with animation."""
         self.show()
-        self.animation.setStartValue(0)
-        self.animation.setEndValue(50)  # Adjust height as needed
+        self.animation.setStartValue(0.0)
+        self.animation.setEndValue(1.0)
         self.animation.start()
     
     def hide_animated(self):
         """Hide the widget with animation."""
-        self.animation.setStartValue(self.height())
-        self.animation.setEndValue(0)
-        self.animation.finished.connect(self.hide)
+        self.animation.setStartValue(self.opacity_effect.opacity())
+        self.animation.setEndValue(0.0)
         self.animation.start()
+    
+    def _on_animation_finished(self):
+        """Hide the widget once a fade-out (not a fade-in) completes."""
+        if self.animation.endValue() == 0.0:
+            self.hide()
         
     def on_action_clicked(self):
         """Handle action button click."""
@@ -163,6 +173,57 @@ class UserFeedbackWidget(QWidget):
 class ErrorDialog(QDialog):
     """Enhanced error dialog with detailed information and helpful suggestions."""
     
+    _DETAILS_STYLE = """
+        QFrame {
+            background-color: #f8f9fa;
+            border: 1px solid #dee2e6;
+            border-radius: 6px;
+            padding: 12px;
+        }
+    """
+    
+    _SUGGESTION_STYLE = """
+        QFrame {
+            background-color: #e8f4fd;
+            border: 1px solid #bee5eb;
+            border-radius: 6px;
+            padding: 12px;
+        }
+    """
+    
+    _COPY_STYLE = """
+        QPushButton {
+            background-color: #6c757d;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 4px;
+            font-weight: 500;
+        }
+        QPushButton:hover {
+            background-color: #5a6268;
+        }
+    """
+    
+    _OK_STYLE = """
+        QPushButton {
+            background-color: #0d6efd;
+            color: white;
+            border: none;
+            padding: 8px 24px;
+            border-radius: 4px;
+            font-weight: 500;
+            min-width: 80px;
+        }
+        QPushButton:hover {
+            background-color: #0b5ed7;
+        }
+    """
+    
+    # Built on first use since they require a running QApplication
+    _MESSAGE_FONT = None
+    _ERROR_PIXMAP = None
+    
     def __init__(self, parent=None, title="Error", message="", details="", suggestion=""):
         super().__init__(parent)
         self.setWindowTitle(title)
@@ -172,6 +233,24 @@ class ErrorDialog(QDialog):
         
         self.setup_ui(message, details, suggestion)
         
+    @classmethod
+    def _get_message_font(cls):
+        """Get the shared font used for the main message."""
+        if cls._MESSAGE_FONT is None:
+            font = QFont()
+            font.setPointSize(12)
+            font.setWeight(QFont.Weight.Medium)
+            cls._MESSAGE_FONT = font
+        return cls._MESSAGE_FONT
+    
+    def _get_error_pixmap(self):
+        """Get the shared critical-error icon pixmap."""
+        if ErrorDialog._ERROR_PIXMAP is None:
+            ErrorDialog._ERROR_PIXMAP = self.style().standardIcon(
+                self.style().StandardPixmap.SP_MessageBoxCritical
+            ).pixmap(48, 48)
+        return ErrorDialog._ERROR_PIXMAP
+        
     def setup_ui(self, message, details, suggestion):
         """Set up the error dialog UI."""
         layout = QVBoxLayout(self)
@@ -183,18 +262,13 @@ class ErrorDialog(QDialog):
         
         # Error icon
         icon_label = QLabel()
-        icon_label.setPixmap(self.style().standardIcon(
-            self.style().StandardPixmap.SP_MessageBoxCritical
-        ).pixmap(48, 48))
+        icon_label.setPixmap(self._get_error_pixmap())
         header_layout.addWidget(icon_label)
         
         # Message
         message_label = QLabel(message)
         message_label.setWordWrap(True)
-        font = QFont()
-        font.setPointSize(12)
-        font.setWeight(QFont.Weight.Medium)
-        message_label.setFont(font)
+        message_label.setFont(self._get_message_font())
         header_layout.addWidget(message_label, 1)
         
         layout.addLayout(header_layout)
@@ -203,14 +277,7 @@ class ErrorDialog(QDialog):
         if details:
             details_frame = QFrame()
             details_frame.setFrameStyle(QFrame.Shape.Box)
-            details_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #f8f9fa;
-                    border: 1px solid #dee2e6;
-                    border-radius: 6px;
-                    padding: 12px;
-                }
-            """)
+            details_frame.setStyleSheet(self._DETAILS_STYLE)
             
             details_layout = QVBoxLayout(details_frame)
             
@@ -228,14 +295,7 @@ class ErrorDialog(QDialog):
         # Suggestion section
         if suggestion:
             suggestion_frame = QFrame()
-            suggestion_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #e8f4fd;
-                    border: 1px solid #bee5eb;
-                    border-radius: 6px;
-                    padding: 12px;
-                }
-            """)
+            suggestion_frame.setStyleSheet(self._SUGGESTION_STYLE)
             
             suggestion_layout = QVBoxLayout(suggestion_frame)
             
@@ -258,39 +318,14 @@ class ErrorDialog(QDialog):
         if details:
             copy_button = QPushButton("Copy Details")
             copy_button.clicked.connect(lambda: self.copy_to_clipboard(details))
-            copy_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #6c757d;
-                    color: white;
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    font-weight: 500;
-                }
-                QPushButton:hover {
-                    background-color: #5a6268;
-                }
-            """)
+            copy_button.setStyleSheet(self._COPY_STYLE)
             button_layout.addWidget(copy_button)
         
         # OK button
         ok_button = QPushButton("OK")
         ok_button.clicked.connect(self.accept)
         ok_button.setDefault(True)
-        ok_button.setStyleSheet("""
-            QPushButton {
-                background-color: #0d6efd;
-                color: white;
-                border: none;
-                padding: 8px 24px;
-                border-radius: 4px;
-                font-weight: 500;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #0b5ed7;
-            }
-        """)
+        ok_button.setStyleSheet(self._OK_STYLE)
         button_layout.addWidget(ok_button)
         
         layout.addLayout(button_layout)
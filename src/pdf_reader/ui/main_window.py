@@ -1,40 +1,85 @@
 """Main window and application UI components."""
 
 import os
+import logging
+import operator
+from collections import OrderedDict
+from functools import partial
 from PyQt6.QtWidgets import (
     QMainWindow, QTabWidget, QFileDialog,
-    QToolBar, QLabel, QLineEdit, QListWidget, QListWidgetItem,
+    QToolBar, QLabel, QLineEdit, QListView,
     QDockWidget, QInputDialog, QMessageBox, QMenu, QStatusBar,
-    QProgressBar, QFrame, QHBoxLayout, QWidget, QVBoxLayout
+    QProgressBar, QFrame, QHBoxLayout, QWidget, QVBoxLayout, QTreeView
+)
+from PyQt6.QtGui import (
+    QAction, QActionGroup, QPixmap, QMovie, QStandardItemModel, QStandardItem,
+    QIntValidator
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, QObject, QRunnable, QThreadPool, QSignalBlocker, pyqtSignal, QSize,
+    QAbstractListModel, QModelIndex
 )
-from PyQt6.QtGui import QIcon, QAction, QActionGroup, QPixmap, QMovie
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize
 
 from ..core.models import ViewMode, Bookmark, AnnotationType, Annotation
-from ..core.config import config
+from ..core.config import config, MAX_RECENT_FILES
+from ..core.page_cache import PageCache, document_key
+from ..core.utils import get_toolbar_icon
 from .pdf_viewer import PDFViewer
 from .error_dialog import UserFeedbackWidget, show_error_dialog
 
+logger = logging.getLogger(__name__)
+
+class LoaderSignals(QObject):
+    """Signals of a DocumentLoader, which as a QRunnable cannot have its own."""
+    loading_finished = pyqtSignal(str, object)  # file path, document key or None
+
 
-class LoadingThread(QThread):
-    """Background thread for loading PDF files."""
-    progress_updated = pyqtSignal(int)
-    loading_finished = pyqtSignal(bool, str)  # success, message
+class DocumentLoader(QRunnable):
+    """Compute a document's page cache key on the thread pool before it is opened.
+
+    PyMuPDF is not thread-safe, so opening and parsing stay on the GUI thread;
+    only the file hash, which reads a bounded head and tail, is done here.
+    """
     
     def __init__(self, file_path):
         super().__init__()
         self.file_path = file_path
+        self.signals = LoaderSignals()
     
     def run(self):
-        try:
-            # Simulate loading progress for better UX
-            for i in range(0, 101, 10):
-                self.progress_updated.emit(i)
-                self.msleep(50)  # Small delay to show progress
-            
-            self.loading_finished.emit(True, "Document loaded successfully")
-        except Exception as e:
-            self.loading_finished.emit(False, f"Error loading document: {str(e)}")
+        self.signals.loading_finished.emit(self.file_path, document_key(self.file_path))
+
+
+class BookmarkListModel(QAbstractListModel):
+    """List model exposing a document's bookmarks to the bookmarks panel."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._bookmarks = []
+        self._titles = []  # Display strings, formatted once per reset
+    
+    def set_bookmarks(self, bookmarks):
+        """Replace the listed bookmarks with a single model reset."""
+        bookmarks = list(bookmarks)
+        titles = [bookmark.display_title() for bookmark in bookmarks]
+        if titles == self._titles and all(map(operator.is_, bookmarks, self._bookmarks)):
+            return  # Unchanged; keep the view's selection and scroll position
+        self.beginResetModel()
+        self._bookmarks = bookmarks
+        self._titles = titles
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._bookmarks)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._titles[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return self._bookmarks[index.row()]
+        return None
 
 
 class MainWindow(QMainWindow):
@@ -42,9 +87,26 @@ class MainWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
+        
+        # Timer for coalescing resize events into a single layout update
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(80)
+        self._resize_timer.timeout.connect(self._apply_resize)
+        self._layout_size_class = None  # Size category the adaptive layout was last applied for
+        # Panels the user, or the last session, asked for; the adaptive layout shows no others
+        dock_state = config.get('dock_state', {})
+        self._toc_requested = dock_state.get('toc_visible', False)
+        self._bookmarks_requested = dock_state.get('bookmarks_visible', False)
+        
         self.setWindowTitle("PDF Reader")
         self.setGeometry(100, 100, 1200, 800)
 
+        self._current_viewer = None
+        self._open_viewers = {}  # file_path -> PDFViewer of each open tab
+        self._pending_loads = {}  # file_path -> DocumentLoader of a document not yet open
+        # Rendered pages persisted across sessions, shared by all viewers
+        self.page_cache = PageCache(config.page_cache_file())
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
@@ -84,19 +146,38 @@ class MainWindow(QMainWindow):
         
         self.setCentralWidget(self.tab_widget)
 
-        self.recent_files = []
+        # file_path -> basename, most recent first, so the menu never re-parses paths
+        self.recent_files = OrderedDict()
         self.loading_thread = None
         
-        # Timer for saving reading progress
+        # Timer for committing and saving reading progress
         self.progress_save_timer = QTimer()
         self.progress_save_timer.timeout.connect(self.save_current_progress)
         self.progress_save_timer.setSingleShot(True)
         
+        # Timer for handling viewer page changes from the event loop
+        self._page_change_timer = QTimer(self)
+        self._page_change_timer.setSingleShot(True)
+        self._page_change_timer.setInterval(0)
+        self._page_change_timer.timeout.connect(self._apply_page_change)
+        
+        # Timer for coalescing configuration writes into one save
+        self._config_save_timer = QTimer(self)
+        self._config_save_timer.setSingleShot(True)
+        self._config_save_timer.setInterval(500)
+        self._config_save_timer.timeout.connect(config.save)
+        
         # Timer for auto-hiding status messages
         self.status_timer = QTimer()
         self.status_timer.timeout.connect(self.clear_status_message)
         self.status_timer.setSingleShot(True)
         
+        # Timer for searching once typing in the search box pauses
+        self._search_debounce = QTimer(self)
+        self._search_debounce.setSingleShot(True)
+        self._search_debounce.setInterval(250)
+        self._search_debounce.timeout.connect(self.perform_search)
+        
         self.create_status_bar()
         self.create_menus_and_toolbar()
         self.create_dock_widgets()
@@ -127,11 +208,11 @@ class MainWindow(QMainWindow):
         self.addAction(self.create_shortcut("Ctrl+G", self.go_to_page_dialog, "Go to page"))
         
         # View modes
-        self.addAction(self.create_shortcut("1", lambda: self.change_view_mode(ViewMode.SINGLE_PAGE), "Single page view"))
-        self.addAction(self.create_shortcut("2", lambda: self.change_view_mode(ViewMode.FIT_PAGE), "Fit page view"))
-        self.addAction(self.create_shortcut("3", lambda: self.change_view_mode(ViewMode.FIT_WIDTH), "Fit width view"))
-        self.addAction(self.create_shortcut("4", lambda: self.change_view_mode(ViewMode.DOUBLE_PAGE), "Double page view"))
-        self.addAction(self.create_shortcut("5", lambda: self.change_view_mode(ViewMode.CONTINUOUS_SCROLL), "Continuous scroll view"))
+        self.addAction(self.create_shortcut("1", self._on_view_mode_action, "Single page view", ViewMode.SINGLE_PAGE))
+        self.addAction(self.create_shortcut("2", self._on_view_mode_action, "Fit page view", ViewMode.FIT_PAGE))
+        self.addAction(self.create_shortcut("3", self._on_view_mode_action, "Fit width view", ViewMode.FIT_WIDTH))
+        self.addAction(self.create_shortcut("4", self._on_view_mode_action, "Double page view", ViewMode.DOUBLE_PAGE))
+        self.addAction(self.create_shortcut("5", self._on_view_mode_action, "Continuous scroll view", ViewMode.CONTINUOUS_SCROLL))
         
         # Zoom
         self.addAction(self.create_shortcut("Ctrl+=", self.zoom_in, "Zoom in"))
@@ -140,14 +221,14 @@ class MainWindow(QMainWindow):
         
         # Search
         self.addAction(self.create_shortcut("Ctrl+F", self.focus_search, "Focus search box"))
-        self.addAction(self.create_shortcut("F3", lambda: self.navigate_search(True), "Find next"))
-        self.addAction(self.create_shortcut("Shift+F3", lambda: self.navigate_search(False), "Find previous"))
+        self.addAction(self.create_shortcut("F3", self.find_next, "Find next"))
+        self.addAction(self.create_shortcut("Shift+F3", self.find_previous, "Find previous"))
         self.addAction(self.create_shortcut("Escape", self.clear_search, "Clear search"))
         
         # Annotations
-        self.addAction(self.create_shortcut("Ctrl+H", lambda: self.toggle_annotation(AnnotationType.HIGHLIGHT), "Highlight text"))
-        self.addAction(self.create_shortcut("Ctrl+U", lambda: self.toggle_annotation(AnnotationType.UNDERLINE), "Underline text"))
-        self.addAction(self.create_shortcut("Ctrl+T", lambda: self.toggle_annotation(AnnotationType.TEXT), "Add text note"))
+        self.addAction(self.create_shortcut("Ctrl+H", self._on_annotation_action, "Highlight text", AnnotationType.HIGHLIGHT))
+        self.addAction(self.create_shortcut("Ctrl+U", self._on_annotation_action, "Underline text", AnnotationType.UNDERLINE))
+        self.addAction(self.create_shortcut("Ctrl+T", self._on_annotation_action, "Add text note", AnnotationType.TEXT))
         
         # Bookmarks
         self.addAction(self.create_shortcut("Ctrl+B", self.add_bookmark, "Add bookmark"))
@@ -160,10 +241,12 @@ class MainWindow(QMainWindow):
         # Help
         self.addAction(self.create_shortcut("F1", self.show_keyboard_shortcuts, "Show keyboard shortcuts"))
 
-    def create_shortcut(self, key_sequence, slot, description):
-        """Create a keyboard shortcut action."""
+    def create_shortcut(self, key_sequence, slot, description, data=None):
+        """Create a keyboard shortcut action, optionally carrying data for its slot."""
         action = QAction(description, self)
         action.setShortcut(key_sequence)
+        if data is not None:
+            action.setData(data)
         action.triggered.connect(slot)
         return action
 
@@ -298,11 +381,11 @@ class MainWindow(QMainWindow):
         """Clear the temporary status message."""
         self.operation_status_label.setText("")
 
-    def show_loading_progress(self, visible=True):
-        """Show or hide loading progress indicator."""
+    def show_loading_progress(self, visible=True, busy=False):
+        """Show or hide loading progress indicator; a busy indicator has no fixed range."""
         self.progress_bar.setVisible(visible)
         if visible:
-            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setRange(0, 0 if busy else 100)
             self.progress_bar.setValue(0)
 
     def update_document_status(self, document_name=None, current_page=None, total_pages=None, zoom_factor=None):
@@ -326,7 +409,7 @@ class MainWindow(QMainWindow):
         # File Menu
         file_menu = self.menuBar().addMenu("&File")
         
-        open_action = QAction(QIcon.fromTheme("document-open"), "&Open...\tCtrl+O", self)
+        open_action = QAction(get_toolbar_icon("document-open"), "&Open...\tCtrl+O", self)
         open_action.setToolTip("Open a PDF document (Ctrl+O)")
         open_action.setStatusTip("Open a PDF document from your computer")
         open_action.triggered.connect(self.open_file)
@@ -335,7 +418,19 @@ class MainWindow(QMainWindow):
         file_menu.addSeparator()
         
         self.recent_files_menu = file_menu.addMenu("&Recent Files")
-        self.recent_files_menu.setIcon(QIcon.fromTheme("document-open-recent"))
+        self.recent_files_menu.setIcon(get_toolbar_icon("document-open-recent"))
+        # Labels include reading progress, so they are refreshed each time the menu opens
+        self.recent_files_menu.aboutToShow.connect(self.update_recent_files_menu)
+        
+        # Fixed pool of entries, relabelled in place when the list changes
+        self._recent_file_actions = []
+        self._recent_menu_entries = ()  # (path, label) pairs currently shown
+        for _ in range(MAX_RECENT_FILES):
+            action = QAction(self)
+            action.setVisible(False)
+            action.triggered.connect(self.open_recent_file)
+            self.recent_files_menu.addAction(action)
+            self._recent_file_actions.append(action)
         
         clear_recent_action = QAction("Clear Recent Files", self)
         clear_recent_action.triggered.connect(self.clear_recent_files)
@@ -354,7 +449,7 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)        # View Menu
         view_mode_menu = self.menuBar().addMenu("&View")
-        view_mode_menu.setIcon(QIcon.fromTheme("view-preview"))
+        view_mode_menu.setIcon(get_toolbar_icon("view-preview"))
         
         # View Mode submenu
         view_modes_submenu = view_mode_menu.addMenu("View &Modes")
@@ -365,9 +460,8 @@ class MainWindow(QMainWindow):
 
         self.single_page_action.setToolTip("Single page view (Press 1)")
         self.single_page_action.setStatusTip("Display one page at a time")
-        self.single_page_action.triggered.connect(
-            lambda: self.change_view_mode(ViewMode.SINGLE_PAGE)
-        )
+        self.single_page_action.setData(ViewMode.SINGLE_PAGE)
+        self.single_page_action.triggered.connect(self._on_view_mode_action)
         view_modes_submenu.addAction(self.single_page_action)
         self.view_mode_group.addAction(self.single_page_action)
 
@@ -375,9 +469,8 @@ class MainWindow(QMainWindow):
 
         self.fit_page_action.setToolTip("Fit page to window (Press 2)")
         self.fit_page_action.setStatusTip("Fit entire page within the window")
-        self.fit_page_action.triggered.connect(
-            lambda: self.change_view_mode(ViewMode.FIT_PAGE)
-        )
+        self.fit_page_action.setData(ViewMode.FIT_PAGE)
+        self.fit_page_action.triggered.connect(self._on_view_mode_action)
         view_modes_submenu.addAction(self.fit_page_action)
         self.view_mode_group.addAction(self.fit_page_action)
 
@@ -385,9 +478,8 @@ class MainWindow(QMainWindow):
 
         self.fit_width_action.setToolTip("Fit page width to window (Press 3)")
         self.fit_width_action.setStatusTip("Fit page width to window for optimal reading")
-        self.fit_width_action.triggered.connect(
-            lambda: self.change_view_mode(ViewMode.FIT_WIDTH)
-        )
+        self.fit_width_action.setData(ViewMode.FIT_WIDTH)
+        self.fit_width_action.triggered.connect(self._on_view_mode_action)
         view_modes_submenu.addAction(self.fit_width_action)
         self.view_mode_group.addAction(self.fit_width_action)
 
@@ -395,9 +487,8 @@ class MainWindow(QMainWindow):
 
         self.double_page_action.setToolTip("Double page view (Press 4)")
         self.double_page_action.setStatusTip("Display two pages side by side")
-        self.double_page_action.triggered.connect(
-            lambda: self.change_view_mode(ViewMode.DOUBLE_PAGE)
-        )
+        self.double_page_action.setData(ViewMode.DOUBLE_PAGE)
+        self.double_page_action.triggered.connect(self._on_view_mode_action)
         view_modes_submenu.addAction(self.double_page_action)
         self.view_mode_group.addAction(self.double_page_action)
 
@@ -405,13 +496,15 @@ class MainWindow(QMainWindow):
 
         self.continuous_scroll_action.setToolTip("Continuous scroll view (Press 5)")
         self.continuous_scroll_action.setStatusTip("Scroll through all pages continuously")
-        self.continuous_scroll_action.triggered.connect(
-            lambda: self.change_view_mode(ViewMode.CONTINUOUS_SCROLL)
-        )
+        self.continuous_scroll_action.setData(ViewMode.CONTINUOUS_SCROLL)
+        self.continuous_scroll_action.triggered.connect(self._on_view_mode_action)
         view_modes_submenu.addAction(self.continuous_scroll_action)
         self.view_mode_group.addAction(self.continuous_scroll_action)
 
         self.single_page_action.setChecked(True)
+        self._view_actions = {
+            action.data(): action for action in self.view_mode_group.actions()
+        }
         
         view_mode_menu.addSeparator()
         
@@ -436,180 +529,222 @@ class MainWindow(QMainWindow):
         
         view_mode_menu.addSeparator()
         
-        # Navigation submenu
-        navigation_submenu = view_mode_menu.addMenu("&Navigation")
+        # Submenus that nothing else refers to are filled in the first time they open
+        self._add_lazy_menu(view_mode_menu, "&Navigation", self._populate_navigation_menu)
+        
+        view_mode_menu.addSeparator()
+        
+        # Search submenu
+        self._add_lazy_menu(view_mode_menu, "&Search", self._populate_search_menu)
+        
+        # Bookmarks Menu
+        bookmarks_menu = self._add_lazy_menu(self.menuBar(), "&Bookmarks", self._populate_bookmarks_menu)
+        bookmarks_menu.setIcon(get_toolbar_icon("bookmark"))
+
+        # Annotation tool actions are created now: the annotations dock and the
+        # active-tool sync use them before the Annotations menu is ever opened
+        highlight_menu_action = QAction(get_toolbar_icon("marker"), "&Highlight Text\tCtrl+H", self)
+
+        highlight_menu_action.setToolTip("Highlight selected text (Ctrl+H)")
+        highlight_menu_action.setCheckable(True)
+        highlight_menu_action.setData(AnnotationType.HIGHLIGHT)
+        highlight_menu_action.triggered.connect(self._on_annotation_action)
+        self.highlight_action = highlight_menu_action
+        
+        underline_menu_action = QAction(get_toolbar_icon("format-text-underline"), "&Underline Text\tCtrl+U", self)
+
+        underline_menu_action.setToolTip("Underline selected text (Ctrl+U)")
+        underline_menu_action.setCheckable(True)
+        underline_menu_action.setData(AnnotationType.UNDERLINE)
+        underline_menu_action.triggered.connect(self._on_annotation_action)
+        self.underline_action = underline_menu_action
+        
+        text_note_menu_action = QAction(get_toolbar_icon("text-field"), "Add &Text Note\tCtrl+T", self)
+
+        text_note_menu_action.setToolTip("Add text annotation (Ctrl+T)")
+        text_note_menu_action.setCheckable(True)
+        text_note_menu_action.setData(AnnotationType.TEXT)
+        text_note_menu_action.triggered.connect(self._on_annotation_action)
+        self.text_note_action = text_note_menu_action
+        # At most one tool is active; the group unchecks the previous one itself
+        self.annotation_tool_group = QActionGroup(self)
+        self.annotation_tool_group.setExclusionPolicy(QActionGroup.ExclusionPolicy.ExclusiveOptional)
+        for action in (highlight_menu_action, underline_menu_action, text_note_menu_action):
+            self.annotation_tool_group.addAction(action)
+        self._annotation_action_by_type = {
+            action.data(): action for action in self.annotation_tool_group.actions()
+        }
+
+        # Annotations Menu
+        annotations_menu = self._add_lazy_menu(self.menuBar(), "&Annotations", self._populate_annotations_menu)
+        annotations_menu.setIcon(get_toolbar_icon("text-field"))
+        
+        # Layout submenu in View menu - add adaptive layout controls
+        view_mode_menu.addSeparator()
+        self._add_lazy_menu(view_mode_menu, "&Layout", self._populate_layout_menu)
+        
+        # Help Menu
+        help_menu = self._add_lazy_menu(self.menuBar(), "&Help", self._populate_help_menu)
+        help_menu.setIcon(get_toolbar_icon("help-about"))
         
+          # Create improved toolbar
+        self.create_toolbar()
+
+    def _add_lazy_menu(self, parent, title, populate):
+        """Add a menu whose actions are created by populate(menu) when it first opens."""
+        menu = parent.addMenu(title)
+
+        def build():
+            menu.aboutToShow.disconnect(build)
+            populate(menu)
+
+        menu.aboutToShow.connect(build)
+        return menu
+
+    def _populate_navigation_menu(self, menu):
+        """Fill the View > Navigation submenu."""
         go_to_page_action = QAction("&Go to Page...\tCtrl+G", self)
         go_to_page_action.setToolTip("Go to specific page (Ctrl+G)")
         go_to_page_action.triggered.connect(self.go_to_page_dialog)
-        navigation_submenu.addAction(go_to_page_action)
+        menu.addAction(go_to_page_action)
         
-        navigation_submenu.addSeparator()
+        menu.addSeparator()
         
         first_page_action = QAction("&First Page\tHome", self)
         first_page_action.setToolTip("Go to first page (Home)")
         first_page_action.triggered.connect(self.first_page)
-        navigation_submenu.addAction(first_page_action)
+        menu.addAction(first_page_action)
         
         last_page_action = QAction("&Last Page\tEnd", self)
         last_page_action.setToolTip("Go to last page (End)")
         last_page_action.triggered.connect(self.last_page)
-        navigation_submenu.addAction(last_page_action)
-        
-        view_mode_menu.addSeparator()
-        
-        # Search submenu
-        search_submenu = view_mode_menu.addMenu("&Search")
-        
+        menu.addAction(last_page_action)
+
+    def _populate_search_menu(self, menu):
+        """Fill the View > Search submenu."""
         find_action = QAction("&Find...\tCtrl+F", self)
         find_action.setToolTip("Find text in document (Ctrl+F)")
         find_action.triggered.connect(self.focus_search)
-        search_submenu.addAction(find_action)
+        menu.addAction(find_action)
         
         find_next_action = QAction("Find &Next\tF3", self)
         find_next_action.setToolTip("Find next occurrence (F3)")
-        find_next_action.triggered.connect(lambda: self.navigate_search(True))
-        search_submenu.addAction(find_next_action)
+        find_next_action.triggered.connect(self.find_next)
+        menu.addAction(find_next_action)
         
         find_previous_action = QAction("Find &Previous\tShift+F3", self)
         find_previous_action.setToolTip("Find previous occurrence (Shift+F3)")
-        find_previous_action.triggered.connect(lambda: self.navigate_search(False))
-        search_submenu.addAction(find_previous_action)# Bookmarks Menu
-        bookmarks_menu = self.menuBar().addMenu("&Bookmarks")
-        bookmarks_menu.setIcon(QIcon.fromTheme("bookmark"))
-        
-        self.add_bookmark_action = QAction(QIcon.fromTheme("bookmark-new"), "&Add Bookmark\tCtrl+B", self)
+        find_previous_action.triggered.connect(self.find_previous)
+        menu.addAction(find_previous_action)
 
-        self.add_bookmark_action.setToolTip("Add bookmark for current page (Ctrl+B)")
-        self.add_bookmark_action.setStatusTip("Create a bookmark for the current page")
-        self.add_bookmark_action.triggered.connect(self.add_bookmark)
-        bookmarks_menu.addAction(self.add_bookmark_action)
-        
-        self.remove_bookmark_action = QAction(QIcon.fromTheme("bookmark-remove"), "&Remove Bookmark\tCtrl+Shift+B", self)
-
-        self.remove_bookmark_action.setToolTip("Remove bookmark from current page (Ctrl+Shift+B)")
-        self.remove_bookmark_action.setStatusTip("Remove bookmark from the current page")
-        self.remove_bookmark_action.triggered.connect(self.remove_current_bookmark)
-        bookmarks_menu.addAction(self.remove_bookmark_action)
-        
-        bookmarks_menu.addSeparator()
-        
-        manage_bookmarks_action = QAction("&Manage Bookmarks...", self)
-        manage_bookmarks_action.setToolTip("Open bookmark management panel")
-        manage_bookmarks_action.triggered.connect(lambda: self.bookmarks_dock.setVisible(True))
-        bookmarks_menu.addAction(manage_bookmarks_action)
-
-        # Annotations Menu
-        annotations_menu = self.menuBar().addMenu("&Annotations")
-        annotations_menu.setIcon(QIcon.fromTheme("text-field"))
-        
-        # Annotation tools submenu
-        annotation_tools_submenu = annotations_menu.addMenu("Annotation &Tools")
-        
-        highlight_menu_action = QAction(QIcon.fromTheme("marker"), "&Highlight Text\tCtrl+H", self)
-
-        highlight_menu_action.setToolTip("Highlight selected text (Ctrl+H)")
-        highlight_menu_action.triggered.connect(lambda: self.toggle_annotation(AnnotationType.HIGHLIGHT))
-        annotation_tools_submenu.addAction(highlight_menu_action)
-        
-        underline_menu_action = QAction(QIcon.fromTheme("format-text-underline"), "&Underline Text\tCtrl+U", self)
-
-        underline_menu_action.setToolTip("Underline selected text (Ctrl+U)")
-        underline_menu_action.triggered.connect(lambda: self.toggle_annotation(AnnotationType.UNDERLINE))
-        annotation_tools_submenu.addAction(underline_menu_action)
-        
-        text_note_menu_action = QAction(QIcon.fromTheme("text-field"), "Add &Text Note\tCtrl+T", self)
-
-        text_note_menu_action.setToolTip("Add text annotation (Ctrl+T)")
-        text_note_menu_action.triggered.connect(lambda: self.toggle_annotation(AnnotationType.TEXT))
-        annotation_tools_submenu.addAction(text_note_menu_action)
-        
-        annotations_menu.addSeparator()
-        
-        clear_page_annotations_action = QAction(QIcon.fromTheme("edit-clear"), "Clear &Page Annotations", self)
-
-        clear_page_annotations_action.setToolTip("Clear all annotations on current page (Ctrl+Alt+C)")
-        clear_page_annotations_action.setStatusTip("Remove all annotations from the current page")
-        clear_page_annotations_action.triggered.connect(self.clear_current_page_annotations)
-        annotations_menu.addAction(clear_page_annotations_action)
-        
-        clear_all_annotations_action = QAction(QIcon.fromTheme("edit-clear-all"), "Clear &All Annotations", self)
-
-        clear_all_annotations_action.setToolTip("Clear all annotations in document (Ctrl+Alt+Shift+C)")
-        clear_all_annotations_action.setStatusTip("Remove all annotations from the entire document")
-        clear_all_annotations_action.triggered.connect(self.clear_all_annotations)
-        annotations_menu.addAction(clear_all_annotations_action)
-        annotations_menu.addSeparator()
-        
-        annotation_help_action = QAction("💡 Tip: Right-click annotations to delete individual ones", self)
-        annotation_help_action.setEnabled(False)
-        annotations_menu.addAction(annotation_help_action)
-        
-        # Layout submenu in View menu - add adaptive layout controls
-        view_mode_menu.addSeparator()
-        layout_submenu = view_mode_menu.addMenu("&Layout")
-        
+    def _populate_layout_menu(self, menu):
+        """Fill the View > Layout submenu."""
         # Adaptive layout toggle
         adaptive_layout_action = QAction("&Adaptive Layout", self)
         adaptive_layout_action.setCheckable(True)
-        adaptive_layout_action.setChecked(True)
+        adaptive_layout_action.setChecked(getattr(self, '_adaptive_layout_enabled', True))
         adaptive_layout_action.setToolTip("Enable adaptive layout that adjusts to window size")
         adaptive_layout_action.setStatusTip("Automatically rearrange interface based on window size")
         adaptive_layout_action.triggered.connect(self.toggle_adaptive_layout)
-        layout_submenu.addAction(adaptive_layout_action)
+        menu.addAction(adaptive_layout_action)
         
-        layout_submenu.addSeparator()
+        menu.addSeparator()
         
         # Manual layout modes
         force_compact_action = QAction("Force &Compact Mode", self)
         force_compact_action.setToolTip("Force compact layout (hides panels for maximum content space)")
         force_compact_action.setStatusTip("Override window size and force compact layout")
         force_compact_action.triggered.connect(self.force_compact_layout)
-        layout_submenu.addAction(force_compact_action)
+        menu.addAction(force_compact_action)
         
         force_full_action = QAction("Force &Full Mode", self)
         force_full_action.setToolTip("Force full layout (shows all panels)")
         force_full_action.setStatusTip("Override window size and force full layout with all panels")
         force_full_action.triggered.connect(self.force_full_layout)
-        layout_submenu.addAction(force_full_action)
+        menu.addAction(force_full_action)
         
-        layout_submenu.addSeparator()
+        menu.addSeparator()
         
         layout_info_action = QAction("Show Layout &Info", self)
         layout_info_action.setToolTip("Display current layout information")
         layout_info_action.triggered.connect(self.show_layout_info)
-        layout_submenu.addAction(layout_info_action)
+        menu.addAction(layout_info_action)
+
+    def _populate_bookmarks_menu(self, menu):
+        """Fill the Bookmarks menu."""
+        add_bookmark_action = QAction(get_toolbar_icon("bookmark-new"), "&Add Bookmark\tCtrl+B", self)
+
+        add_bookmark_action.setToolTip("Add bookmark for current page (Ctrl+B)")
+        add_bookmark_action.setStatusTip("Create a bookmark for the current page")
+        add_bookmark_action.triggered.connect(self.add_bookmark)
+        menu.addAction(add_bookmark_action)
         
-        # Help Menu
-        help_menu = self.menuBar().addMenu("&Help")
-        help_menu.setIcon(QIcon.fromTheme("help-about"))
+        remove_bookmark_action = QAction(get_toolbar_icon("bookmark-remove"), "&Remove Bookmark\tCtrl+Shift+B", self)
+
+        remove_bookmark_action.setToolTip("Remove bookmark from current page (Ctrl+Shift+B)")
+        remove_bookmark_action.setStatusTip("Remove bookmark from the current page")
+        remove_bookmark_action.triggered.connect(self.remove_current_bookmark)
+        menu.addAction(remove_bookmark_action)
+        
+        menu.addSeparator()
         
-        keyboard_shortcuts_action = QAction(QIcon.fromTheme("preferences-desktop-keyboard"), "&Keyboard Shortcuts\tF1", self)
+        manage_bookmarks_action = QAction("&Manage Bookmarks...", self)
+        manage_bookmarks_action.setToolTip("Open bookmark management panel")
+        manage_bookmarks_action.triggered.connect(self.show_bookmarks_panel)
+        menu.addAction(manage_bookmarks_action)
+
+    def _populate_annotations_menu(self, menu):
+        """Fill the Annotations menu around the tool actions created with the window."""
+        annotation_tools_submenu = menu.addMenu("Annotation &Tools")
+        annotation_tools_submenu.addActions(self.annotation_tool_group.actions())
+        
+        menu.addSeparator()
+        
+        clear_page_annotations_action = QAction(get_toolbar_icon("edit-clear"), "Clear &Page Annotations", self)
+
+        clear_page_annotations_action.setToolTip("Clear all annotations on current page (Ctrl+Alt+C)")
+        clear_page_annotations_action.setStatusTip("Remove all annotations from the current page")
+        clear_page_annotations_action.triggered.connect(self.clear_current_page_annotations)
+        menu.addAction(clear_page_annotations_action)
+        
+        clear_all_annotations_action = QAction(get_toolbar_icon("edit-clear-all"), "Clear &All Annotations", self)
+
+        clear_all_annotations_action.setToolTip("Clear all annotations in document (Ctrl+Alt+Shift+C)")
+        clear_all_annotations_action.setStatusTip("Remove all annotations from the entire document")
+        clear_all_annotations_action.triggered.connect(self.clear_all_annotations)
+        menu.addAction(clear_all_annotations_action)
+        menu.addSeparator()
+        
+        annotation_help_action = QAction("💡 Tip: Right-click annotations to delete individual ones", self)
+        annotation_help_action.setEnabled(False)
+        menu.addAction(annotation_help_action)
+
+    def _populate_help_menu(self, menu):
+        """Fill the Help menu."""
+        keyboard_shortcuts_action = QAction(get_toolbar_icon("preferences-desktop-keyboard"), "&Keyboard Shortcuts\tF1", self)
 
         keyboard_shortcuts_action.setToolTip("Show keyboard shortcuts (F1)")
         keyboard_shortcuts_action.triggered.connect(self.show_keyboard_shortcuts)
-        help_menu.addAction(keyboard_shortcuts_action)
+        menu.addAction(keyboard_shortcuts_action)
         
-        user_guide_action = QAction(QIcon.fromTheme("help-contents"), "&User Guide", self)
+        user_guide_action = QAction(get_toolbar_icon("help-contents"), "&User Guide", self)
         user_guide_action.setToolTip("Open user guide")
         user_guide_action.triggered.connect(self.show_user_guide)
-        help_menu.addAction(user_guide_action)
+        menu.addAction(user_guide_action)
         
-        help_menu.addSeparator()
+        menu.addSeparator()
         
-        report_issue_action = QAction(QIcon.fromTheme("dialog-warning"), "&Report Issue", self)
+        report_issue_action = QAction(get_toolbar_icon("dialog-warning"), "&Report Issue", self)
         report_issue_action.setToolTip("Report a bug or issue")
         report_issue_action.triggered.connect(self.report_issue)
-        help_menu.addAction(report_issue_action)
+        menu.addAction(report_issue_action)
         
-        help_menu.addSeparator()
+        menu.addSeparator()
         
-        about_action = QAction(QIcon.fromTheme("help-about"), "&About PDF Reader", self)
+        about_action = QAction(get_toolbar_icon("help-about"), "&About PDF Reader", self)
         about_action.setToolTip("About this application")
         about_action.triggered.connect(self.show_about)
-        help_menu.addAction(about_action)
-          # Create improved toolbar
-        self.create_toolbar()
+        menu.addAction(about_action)
 
     def create_toolbar(self):
         """Create organized toolbars with improved responsiveness."""
@@ -622,21 +757,21 @@ class MainWindow(QMainWindow):
         self.addToolBar(toolbar)
         
         # File operations
-        open_action = QAction(QIcon.fromTheme("document-open"), "Open", self)
+        open_action = QAction(get_toolbar_icon("document-open"), "Open", self)
 
         open_action.setToolTip("Open a PDF document (Ctrl+O)")
         open_action.triggered.connect(self.open_file)
         toolbar.addAction(open_action)
         
         # Navigation
-        self.prev_page_action = QAction(QIcon.fromTheme("go-previous"), "Previous", self)
+        self.prev_page_action = QAction(get_toolbar_icon("go-previous"), "Previous", self)
 
         self.prev_page_action.setToolTip("Previous page (Left arrow or Page Up)")
         self.prev_page_action.triggered.connect(self.prev_page)
         self.prev_page_action.setEnabled(False)
         toolbar.addAction(self.prev_page_action)
 
-        self.next_page_action = QAction(QIcon.fromTheme("go-next"), "Next", self)
+        self.next_page_action = QAction(get_toolbar_icon("go-next"), "Next", self)
 
         self.next_page_action.setToolTip("Next page (Right arrow or Page Down)")
         self.next_page_action.triggered.connect(self.next_page)
@@ -647,6 +782,9 @@ class MainWindow(QMainWindow):
         self.page_num_input.setFixedWidth(50)
         self.page_num_input.setToolTip("Page number")
         self.page_num_input.setPlaceholderText("1")
+        # returnPressed only fires for acceptable input, so the slot never sees bad text
+        self.page_validator = QIntValidator(1, 999999, self)
+        self.page_num_input.setValidator(self.page_validator)
         self.page_num_input.returnPressed.connect(self.go_to_page_from_input)
         toolbar.addWidget(self.page_num_input)
         
@@ -655,14 +793,14 @@ class MainWindow(QMainWindow):
         toolbar.addWidget(self.total_pages_label)
 
         # Zoom controls
-        self.zoom_out_action = QAction(QIcon.fromTheme("zoom-out"), "Zoom Out", self)
+        self.zoom_out_action = QAction(get_toolbar_icon("zoom-out"), "Zoom Out", self)
 
         self.zoom_out_action.setToolTip("Zoom out (Ctrl+-)")
         self.zoom_out_action.triggered.connect(self.zoom_out)
         self.zoom_out_action.setEnabled(False)
         toolbar.addAction(self.zoom_out_action)
 
-        self.zoom_in_action = QAction(QIcon.fromTheme("zoom-in"), "Zoom In", self)
+        self.zoom_in_action = QAction(get_toolbar_icon("zoom-in"), "Zoom In", self)
 
         self.zoom_in_action.setToolTip("Zoom in (Ctrl++)")
         self.zoom_in_action.triggered.connect(self.zoom_in)
@@ -672,7 +810,7 @@ class MainWindow(QMainWindow):
         toolbar.addSeparator()
         
         # Bookmarks
-        self.add_bookmark_toolbar_action = QAction(QIcon.fromTheme("bookmark-new"), "Bookmark", self)
+        self.add_bookmark_toolbar_action = QAction(get_toolbar_icon("bookmark-new"), "Bookmark", self)
 
         self.add_bookmark_toolbar_action.setToolTip("Add bookmark for current page (Ctrl+B)")
         self.add_bookmark_toolbar_action.triggered.connect(self.add_bookmark)
@@ -684,26 +822,28 @@ class MainWindow(QMainWindow):
         self.search_input.setPlaceholderText("Find...")
         self.search_input.setToolTip("Search text")
         self.search_input.returnPressed.connect(self.perform_search)
+        # textEdited ignores programmatic clears, which reset the results themselves
+        self.search_input.textEdited.connect(self._search_debounce.start)
         toolbar.addWidget(self.search_input)
 
-        self.search_button = QAction(QIcon.fromTheme("edit-find"), "Search", self)
+        self.search_button = QAction(get_toolbar_icon("edit-find"), "Search", self)
         self.search_button.setToolTip("Search")
         self.search_button.triggered.connect(self.perform_search)
         self.search_button.setEnabled(False)
         toolbar.addAction(self.search_button)
         
         # Search navigation
-        self.search_prev_action = QAction(QIcon.fromTheme("go-up"), "Previous Result", self)
+        self.search_prev_action = QAction(get_toolbar_icon("go-up"), "Previous Result", self)
 
         self.search_prev_action.setToolTip("Previous search result (Shift+F3)")
-        self.search_prev_action.triggered.connect(lambda: self.navigate_search(False))
+        self.search_prev_action.triggered.connect(self.find_previous)
         self.search_prev_action.setEnabled(False)
         toolbar.addAction(self.search_prev_action)
 
-        self.search_next_action = QAction(QIcon.fromTheme("go-down"), "Next Result", self)
+        self.search_next_action = QAction(get_toolbar_icon("go-down"), "Next Result", self)
 
         self.search_next_action.setToolTip("Next search result (F3)")
-        self.search_next_action.triggered.connect(lambda: self.navigate_search(True))
+        self.search_next_action.triggered.connect(self.find_next)
         self.search_next_action.setEnabled(False)
         toolbar.addAction(self.search_next_action)
         
@@ -711,6 +851,16 @@ class MainWindow(QMainWindow):
         self.search_result_label = QLabel("0 results")
         self.search_result_label.setStyleSheet("font-size: 10px; margin: 2px;")
         toolbar.addWidget(self.search_result_label)        
+        
+        # Actions that are only enabled while a document is open
+        self._document_actions = (
+            self.prev_page_action,
+            self.next_page_action,
+            self.zoom_in_action,
+            self.zoom_out_action,
+            self.add_bookmark_toolbar_action,
+            self.search_button,
+        )
         # No longer create annotation toolbar - moved to dock
         # self.create_annotation_toolbar()
 
@@ -718,38 +868,42 @@ class MainWindow(QMainWindow):
         """Create dock widgets for table of contents and bookmarks."""
         panels_menu = self.menuBar().addMenu("&Panels")
 
-        self.toc_dock = QDockWidget("Table of Contents", self)
-        self.toc_list_widget = QListWidget()
-        self.toc_list_widget.itemClicked.connect(self.toc_navigate)
-        self.toc_dock.setWidget(self.toc_list_widget)
-        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.toc_dock)
-        self.toc_dock.setVisible(False)
-
-        self.bookmarks_dock = QDockWidget("Bookmarks", self)
-        self.bookmarks_list_widget = QListWidget()
-        self.bookmarks_list_widget.itemClicked.connect(self.bookmark_navigate)
-        self.bookmarks_list_widget.itemDoubleClicked.connect(self.bookmark_navigate)
-        self.bookmarks_list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.bookmarks_list_widget.customContextMenuRequested.connect(self.show_bookmark_context_menu)
-        self.bookmarks_dock.setWidget(self.bookmarks_list_widget)
-        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.bookmarks_dock)
-        self.bookmarks_dock.setVisible(False)
-
-        toggle_toc_action = QAction("Toggle Table of Contents\tF10", self)
-        toggle_toc_action.setCheckable(True)
-        toggle_toc_action.setChecked(False)
-        toggle_toc_action.setToolTip("Toggle Table of Contents panel (F10)")
-        toggle_toc_action.triggered.connect(self.toc_dock.setVisible)
-        self.toc_dock.visibilityChanged.connect(toggle_toc_action.setChecked)
-        panels_menu.addAction(toggle_toc_action)
-
-        toggle_bookmarks_action = QAction("Toggle Bookmarks\tF9", self)
-        toggle_bookmarks_action.setCheckable(True)
-        toggle_bookmarks_action.setChecked(False)
-        toggle_bookmarks_action.setToolTip("Toggle Bookmarks panel (F9)")
-        toggle_bookmarks_action.triggered.connect(self.bookmarks_dock.setVisible)
-        self.bookmarks_dock.visibilityChanged.connect(toggle_bookmarks_action.setChecked)
-        panels_menu.addAction(toggle_bookmarks_action)
+        # The TOC and bookmarks docks start hidden, so they are only built
+        # the first time they are shown, and only refreshed while visible.
+        # Each viewer's outline model is built once and kept until its tab closes.
+        self._empty_toc_model = QStandardItemModel(self)
+        self._toc_loading_model = QStandardItemModel(self)
+        loading_item = QStandardItem("Loading…")
+        loading_item.setEnabled(False)
+        self._toc_loading_model.appendRow(loading_item)
+        # Outlines are built on the next event loop pass so tab switches paint first
+        self._toc_load_timer = QTimer(self)
+        self._toc_load_timer.setSingleShot(True)
+        self._toc_load_timer.timeout.connect(self._load_pending_toc)
+        self._toc_models = {}
+        self.toc_model = self._empty_toc_model
+        self.toc_dock = None
+        self.toc_tree_view = None
+        # Set when a refresh was skipped while the panel was hidden
+        self._toc_dirty = True
+        self._bookmarks_dirty = True
+        self.bookmarks_model = BookmarkListModel(self)
+        self.bookmarks_dock = None
+        self.bookmarks_list_view = None
+
+        self.toggle_toc_action = QAction("Toggle Table of Contents\tF10", self)
+        self.toggle_toc_action.setCheckable(True)
+        self.toggle_toc_action.setChecked(False)
+        self.toggle_toc_action.setToolTip("Toggle Table of Contents panel (F10)")
+        self.toggle_toc_action.triggered.connect(self._request_toc)
+        panels_menu.addAction(self.toggle_toc_action)
+
+        self.toggle_bookmarks_action = QAction("Toggle Bookmarks\tF9", self)
+        self.toggle_bookmarks_action.setCheckable(True)
+        self.toggle_bookmarks_action.setChecked(False)
+        self.toggle_bookmarks_action.setToolTip("Toggle Bookmarks panel (F9)")
+        self.toggle_bookmarks_action.triggered.connect(self._request_bookmarks)
+        panels_menu.addAction(self.toggle_bookmarks_action)
 
         # Create annotation dock widget
         self.create_annotation_dock()
@@ -762,6 +916,82 @@ class MainWindow(QMainWindow):
         self.annotations_dock.visibilityChanged.connect(toggle_annotations_action.setChecked)
         panels_menu.addAction(toggle_annotations_action)
 
+    def _ensure_toc_dock(self):
+        """Create the table of contents dock on first use and return it."""
+        if self.toc_dock is None:
+            self.toc_dock = QDockWidget("Table of Contents", self)
+            self.toc_tree_view = QTreeView()
+            self.toc_tree_view.setModel(self.toc_model)
+            self.toc_tree_view.setHeaderHidden(True)
+            self.toc_tree_view.setUniformRowHeights(True)
+            self.toc_tree_view.setEditTriggers(QTreeView.EditTrigger.NoEditTriggers)
+            self.toc_tree_view.clicked.connect(self.toc_navigate)
+            self.toc_dock.setWidget(self.toc_tree_view)
+            self.toc_dock.setVisible(False)
+            self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.toc_dock)
+            self.toc_dock.visibilityChanged.connect(self.toggle_toc_action.setChecked)
+            self.toc_dock.visibilityChanged.connect(self._on_toc_visibility_changed)
+        return self.toc_dock
+
+    def _ensure_bookmarks_dock(self):
+        """Create the bookmarks dock on first use and return it."""
+        if self.bookmarks_dock is None:
+            self.bookmarks_dock = QDockWidget("Bookmarks", self)
+            self.bookmarks_list_view = QListView()
+            self.bookmarks_list_view.setModel(self.bookmarks_model)
+            self.bookmarks_list_view.setUniformItemSizes(True)
+            self.bookmarks_list_view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+            self.bookmarks_list_view.clicked.connect(self.bookmark_navigate)
+            self.bookmarks_list_view.doubleClicked.connect(self.bookmark_navigate)
+            self.bookmarks_list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+            self.bookmarks_list_view.customContextMenuRequested.connect(self.show_bookmark_context_menu)
+            self.bookmarks_dock.setWidget(self.bookmarks_list_view)
+            self.bookmarks_dock.setVisible(False)
+            self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.bookmarks_dock)
+            self.bookmarks_dock.visibilityChanged.connect(self.toggle_bookmarks_action.setChecked)
+            self.bookmarks_dock.visibilityChanged.connect(self._on_bookmarks_visibility_changed)
+        return self.bookmarks_dock
+
+    def _on_toc_visibility_changed(self, visible):
+        """Catch up on tab switches that happened while the TOC was hidden."""
+        if visible and self._toc_dirty:
+            self.update_toc()
+
+    def _on_bookmarks_visibility_changed(self, visible):
+        """Catch up on changes that happened while the bookmarks were hidden."""
+        if visible and self._bookmarks_dirty:
+            self.update_bookmarks()
+
+    def _show_toc(self, checked):
+        """Show or hide the table of contents dock, creating it when first shown."""
+        if checked:
+            self._ensure_toc_dock().setVisible(True)
+            if self._toc_dirty:
+                self.update_toc()
+        elif self.toc_dock is not None:
+            self.toc_dock.setVisible(False)
+
+    def _show_bookmarks(self, checked):
+        """Show or hide the bookmarks dock, creating it when first shown."""
+        if checked:
+            self._ensure_bookmarks_dock().setVisible(True)
+            if self._bookmarks_dirty:
+                self.update_bookmarks()
+        elif self.bookmarks_dock is not None:
+            self.bookmarks_dock.setVisible(False)
+
+    def _request_toc(self, checked):
+        """Show or hide the table of contents as the user asked; the adaptive layout follows."""
+        self._toc_requested = checked
+        self._layout_size_class = None  # The next resize reapplies the layout with this choice
+        self._show_toc(checked)
+
+    def _request_bookmarks(self, checked):
+        """Show or hide the bookmarks panel as the user asked; the adaptive layout follows."""
+        self._bookmarks_requested = checked
+        self._layout_size_class = None  # The next resize reapplies the layout with this choice
+        self._show_bookmarks(checked)
+
     def create_annotation_dock(self):
         """Create annotation dock widget instead of toolbar."""
         self.annotations_dock = QDockWidget("Annotations", self)
@@ -774,7 +1004,7 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(5, 5, 5, 5)
         
         # Annotation mode toggle
-        annotation_mode_action = QAction(QIcon.fromTheme("edit-entry"), "Toggle Annotation Mode", self)
+        annotation_mode_action = QAction(get_toolbar_icon("edit-entry"), "Toggle Annotation Mode", self)
         annotation_mode_action.setCheckable(True)
         annotation_mode_action.setToolTip("Toggle annotation mode")
         annotation_mode_action.triggered.connect(self.toggle_annotation_mode)
@@ -794,17 +1024,17 @@ class MainWindow(QMainWindow):
         # Annotation type buttons
         highlight_btn = QPushButton("🖍 Highlight")
         highlight_btn.setToolTip("Highlight text")
-        highlight_btn.clicked.connect(lambda: self.toggle_annotation(AnnotationType.HIGHLIGHT))
+        highlight_btn.clicked.connect(self.highlight_action.trigger)
         layout.addWidget(highlight_btn)
         
         underline_btn = QPushButton("📏 Underline")
         underline_btn.setToolTip("Underline text")
-        underline_btn.clicked.connect(lambda: self.toggle_annotation(AnnotationType.UNDERLINE))
+        underline_btn.clicked.connect(self.underline_action.trigger)
         layout.addWidget(underline_btn)
         
         text_btn = QPushButton("💬 Text Note")
         text_btn.setToolTip("Add text annotation")
-        text_btn.clicked.connect(lambda: self.toggle_annotation(AnnotationType.TEXT))
+        text_btn.clicked.connect(self.text_note_action.trigger)
         layout.addWidget(text_btn)
         
         # Separator
@@ -833,6 +1063,7 @@ class MainWindow(QMainWindow):
 
     def perform_search(self):
         """Perform search with the input text."""
+        self._search_debounce.stop()
         viewer = self.current_viewer()
         if not viewer or not viewer.doc:
             self.search_result_label.setText("0 results")
@@ -847,18 +1078,33 @@ class MainWindow(QMainWindow):
                 self.search_next_action.setEnabled(False)
                 self.search_prev_action.setEnabled(False)
                 return
-            count = viewer.search_text(text)
-            self.search_result_label.setText(f"{count} results")
-            self.search_next_action.setEnabled(count > 0)
-            self.search_prev_action.setEnabled(count > 0)
-            if count > 0:
-                viewer.navigate_search(forward=True)
+            # Results arrive through update_search_results as pages are searched
+            viewer.start_search(text)
         except Exception as e:
             print(f"Error performing search: {e}")
             self.search_result_label.setText("0 results")
             self.search_next_action.setEnabled(False)
             self.search_prev_action.setEnabled(False)
 
+    def find_next(self):
+        """Go to the next search result."""
+        self.navigate_search(True)
+
+    def find_previous(self):
+        """Go to the previous search result."""
+        self.navigate_search(False)
+
+    def update_search_results(self, count, finished):
+        """Show search results as they are found, jumping to the first one."""
+        viewer = self.current_viewer()
+        if viewer is None or self.sender() is not viewer:
+            return
+        self.search_result_label.setText(f"{count} results" if finished else f"{count} results…")
+        self.search_next_action.setEnabled(count > 0)
+        self.search_prev_action.setEnabled(count > 0)
+        if count > 0 and viewer.current_search_index < 0:
+            viewer.navigate_search(forward=True)
+
     def navigate_search(self, forward=True):
         """Navigate to the next or previous search result."""
         viewer = self.current_viewer()
@@ -881,13 +1127,15 @@ class MainWindow(QMainWindow):
             viewer = self.current_viewer()
             if viewer:
                 viewer.active_annotation_type = None
-            # Note: buttons don't have setChecked, visual feedback handled differently
+            # Note: buttons don't have setChecked, the tool menu actions carry the state
+            self._sync_annotation_actions()
 
     def toggle_annotation(self, ann_type):
         """Toggle annotation mode for the specified type."""
         viewer = self.current_viewer()
         if not viewer or not viewer.doc:
             # No document loaded, can't annotate
+            self._sync_annotation_actions()
             return
             
         if viewer.active_annotation_type == ann_type:
@@ -895,36 +1143,61 @@ class MainWindow(QMainWindow):
             viewer.active_annotation_type = None
         else:            # Setting this annotation type
             viewer.active_annotation_type = ann_type
+        self._sync_annotation_actions()
+
+    def _sync_annotation_actions(self):
+        """Check the tool action matching the active viewer's annotation type."""
+        viewer = self.current_viewer()
+        active_type = viewer.active_annotation_type if viewer else None
+        if active_type is not None:
+            self._annotation_action_by_type[active_type].setChecked(True)
+        else:
+            checked_action = self.annotation_tool_group.checkedAction()
+            if checked_action is not None:
+                checked_action.setChecked(False)
     
+    def _on_annotation_action(self):
+        """Toggle the annotation type stored in the triggering action's data."""
+        action = self.sender()
+        if action:
+            self.toggle_annotation(action.data())
+
+    def _set_annotation_mode_checked(self, checked: bool):
+        """Keep the annotation mode button and action in step without re-triggering them."""
+        for control in (self.annotation_mode_button, self.annotation_mode_action):
+            blocker = QSignalBlocker(control)
+            control.setChecked(checked)
+            blocker.unblock()
+
     def toggle_annotation_mode(self):
         """Toggle annotation mode for the current viewer."""
         viewer = self.current_viewer()
         if not viewer or not viewer.doc:
-            self.annotation_mode_button.setChecked(False)
+            self._set_annotation_mode_checked(False)
             self._update_annotation_ui_state(False)
             return
             
         mode_enabled = viewer.toggle_annotation_mode()
-        self.annotation_mode_button.setChecked(mode_enabled)
+        self._set_annotation_mode_checked(mode_enabled)
+        # Also clears the active annotation type when the mode is turned off
         self._update_annotation_ui_state(mode_enabled)
-        
-        if not mode_enabled:
-            viewer.active_annotation_type = None
-            # Note: buttons don't have setChecked, visual feedback handled differently
             
         if mode_enabled:
             self.search_input.clear()
-            viewer.search_text("")
-            self.search_result_label.setText("0 results")
-            self.search_next_action.setEnabled(False)
-            self.search_prev_action.setEnabled(False)
-            self.search_prev_action.setEnabled(False)
+            # Reports the empty result through update_search_results
+            viewer.start_search("")
 
     def change_view_mode(self, mode: ViewMode):
         """Change the view mode of the current PDF viewer."""
-        current_viewer = self.tab_widget.currentWidget()
-        if isinstance(current_viewer, PDFViewer):
-            current_viewer.set_view_mode(mode)
+        viewer = self.current_viewer()
+        if viewer:
+            viewer.set_view_mode(mode)
+
+    def _on_view_mode_action(self):
+        """Switch to the view mode stored in the triggering action's data."""
+        action = self.sender()
+        if action:
+            self.change_view_mode(action.data())
 
     def open_file(self):
         """Open a PDF file dialog and load the selected file with improved error handling."""
@@ -942,28 +1215,7 @@ class MainWindow(QMainWindow):
             if file_path:
                 # Save the directory for next time
                 config.set('files.last_directory', os.path.dirname(file_path))
-                
-                # Show loading feedback
-                self.show_feedback("Loading document...", "info", timeout=0)
-                
-                # Attempt to add the tab
-                success = self.add_pdf_tab(file_path)
-                
-                if success:
-                    self.add_to_recent_files(file_path)
-                    self.show_feedback(
-                        f"Successfully opened {os.path.basename(file_path)}", 
-                        "success", 
-                        timeout=3000
-                    )
-                else:
-                    self.show_feedback(
-                        "Failed to open document", 
-                        "error",
-                        "Try Again",
-                        "open_file",
-                        timeout=10000
-                    )
+                self.queue_document_load(file_path)
         except Exception as e:            show_error_dialog(
                 self,
                 "Error Opening File",
@@ -971,8 +1223,57 @@ class MainWindow(QMainWindow):
                 str(e)
             )
 
-    def add_pdf_tab(self, file_path):
-        """Add a new PDF tab to the tab widget with enhanced error handling."""
+    def queue_document_load(self, file_path):
+        """Show loading feedback now and open the document once its cache key is known.
+
+        The key is hashed on the thread pool, so the dialog closes and the busy
+        indicator paints while the UI thread stays responsive.
+        """
+        if file_path in self._open_viewers:
+            self._load_queued_document(file_path)  # Only switches to its tab
+            return
+        if file_path in self._pending_loads:
+            return  # Already on its way
+        self.show_feedback("Loading document...", "info", timeout=0)
+        self.show_loading_progress(True, busy=True)
+        loader = DocumentLoader(file_path)
+        loader.signals.loading_finished.connect(self._load_queued_document)
+        self._pending_loads[file_path] = loader
+        QThreadPool.globalInstance().start(loader)
+
+    def _load_queued_document(self, file_path, doc_key=None):
+        """Open a document queued by queue_document_load and report the outcome."""
+        # Parsing and layout happen here, on the UI thread
+        self.show_loading_progress(True, busy=True)
+        try:
+            success = self.add_pdf_tab(file_path, doc_key)
+        finally:
+            # Still pending while it opens, since opening can process other loads' events;
+            # the indicator stays busy until the last queued document is open
+            self._pending_loads.pop(file_path, None)
+            if not self._pending_loads:
+                self.show_loading_progress(False)
+        if success:
+            self.add_to_recent_files(file_path)
+            self.show_feedback(
+                f"Successfully opened {os.path.basename(file_path)}", 
+                "success", 
+                timeout=3000
+            )
+        else:
+            self.show_feedback(
+                "Failed to open document", 
+                "error",
+                "Try Again",
+                "open_file",
+                timeout=10000
+            )
+
+    def add_pdf_tab(self, file_path, doc_key=None):
+        """Add a new PDF tab to the tab widget with enhanced error handling.
+
+        doc_key is the file's page cache key, if it has already been computed.
+        """
         try:
             # Validate file path
             if not os.path.exists(file_path):
@@ -985,70 +1286,44 @@ class MainWindow(QMainWindow):
                 return False
             
             # Check if file is already open
-            for i in range(self.tab_widget.count()):
-                viewer = self.tab_widget.widget(i)
-                if isinstance(viewer, PDFViewer) and viewer.file_path == file_path:
-                    self.tab_widget.setCurrentIndex(i)
-                    self.show_feedback(
-                        f"{os.path.basename(file_path)} is already open", 
-                        "info", 
-                        timeout=2000
-                    )
-                    return True
+            open_viewer = self._open_viewers.get(file_path)
+            if open_viewer is not None:
+                self.tab_widget.setCurrentWidget(open_viewer)
+                self.show_feedback(
+                    f"{os.path.basename(file_path)} is already open", 
+                    "info", 
+                    timeout=2000
+                )
+                return True
             
             # Create viewer and load PDF
-            viewer = PDFViewer()
-            success = viewer.load_pdf(file_path)
+            viewer = PDFViewer(page_cache=self.page_cache)
+            success = viewer.load_pdf(file_path, doc_key)
             
             if not success:
                 viewer.deleteLater()
                 return False
             
             # Setup connections
-            viewer.view_mode_changed.connect(self.update_view_menu_state)
-            viewer.current_page_changed_in_continuous_scroll.connect(
-                self.update_page_info_from_signal
-            )
-            viewer.current_page_changed.connect(self.update_page_info_from_signal)
-            viewer.current_page_changed_in_continuous_scroll.connect(
-                lambda: self.schedule_progress_save()
-            )
-            viewer.current_page_changed.connect(
-                lambda: self.schedule_progress_save()
-            )
-            viewer.zoom_changed.connect(self.update_zoom_info)
-            viewer.bookmarks_changed.connect(self.update_bookmarks)
+            # Unique connections make a repeated connect fail instead of stacking slots
+            for signal, slot in self._viewer_connections(viewer):
+                signal.connect(slot, Qt.ConnectionType.UniqueConnection)
 
             # Add tab with truncated filename for display
-            display_name = os.path.basename(file_path)
+            display_name = viewer.file_name
             if len(display_name) > 30:
                 display_name = display_name[:27] + "..."
             
+            # The new tab always becomes current, so on_tab_changed refreshes the
+            # status bar, page info, panels and view menu for it
+            self._open_viewers[file_path] = viewer
             tab_index = self.tab_widget.addTab(viewer, display_name)
             self.tab_widget.setCurrentIndex(tab_index)
             self.tab_widget.setTabToolTip(tab_index, file_path)  # Show full path on hover
             
-            # Update UI state
-            self.update_document_status(
-                os.path.basename(file_path),
-                viewer.current_page,
-                viewer.doc.page_count if viewer.doc else 0,
-                viewer.zoom_factor
-            )
-            
-            # Force an immediate update of the status bar with real-time information
-            self.update_page_info()
-            self.update_toc()
-            self.update_bookmarks()
-            self.update_view_menu_state()
-            
             # Enable toolbar actions
-            self.prev_page_action.setEnabled(True)
-            self.next_page_action.setEnabled(True)
-            self.zoom_in_action.setEnabled(True)
-            self.zoom_out_action.setEnabled(True)
-            self.add_bookmark_toolbar_action.setEnabled(True)
-            self.search_button.setEnabled(True)
+            for action in self._document_actions:
+                action.setEnabled(True)
             
             # Restore last read page if available
             if viewer.doc:
@@ -1059,7 +1334,7 @@ class MainWindow(QMainWindow):
                     # Save initial progress for new documents
                     if last_page < 0:
                         config.update_document_progress(file_path, viewer.current_page, viewer.doc.page_count)
-                        config.save()
+                        self.schedule_config_save()
             return True
             
         except Exception as e:
@@ -1074,14 +1349,58 @@ class MainWindow(QMainWindow):
     def close_tab(self, index):
         """Close a tab and clean up resources."""
         widget = self.tab_widget.widget(index)
+        if isinstance(widget, PDFViewer) and widget.file_path and widget.doc:
+            # Persist the final page of the closing document
+            config.record_page(widget.file_path, widget.current_page, widget.doc.page_count)
+            self.save_current_progress()
+        # Detach the viewer from the tab widget before scheduling its deletion
+        self.tab_widget.removeTab(index)
+        self._cache_current_viewer()
+        if isinstance(widget, PDFViewer):
+            if self._open_viewers.get(widget.file_path) is widget:
+                del self._open_viewers[widget.file_path]
+            for signal, slot in self._viewer_connections(widget):
+                try:
+                    signal.disconnect(slot)
+                except TypeError:
+                    pass  # Already disconnected
+            widget.cleanup()
+            toc_model = self._toc_models.pop(widget, None)
+            if toc_model is not None:
+                if toc_model is self.toc_model:
+                    self._set_toc_model(self._empty_toc_model)
+                toc_model.deleteLater()
         if widget:
+            widget.hide()
+            widget.setParent(None)
             widget.deleteLater()
-        self.tab_widget.removeTab(index)
         if self.tab_widget.count() == 0:
             self.total_pages_label.setText("/ N/A")
             self.page_num_input.clear()
-            self.toc_list_widget.clear()
-            self.bookmarks_list_widget.clear()
+            self._set_toc_model(self._empty_toc_model)
+            self.bookmarks_model.set_bookmarks([])
+
+    def _viewer_connections(self, viewer):
+        """Signal/slot pairs connected when a viewer gets a tab and removed when it closes."""
+        # current_page_changed also fires for continuous scroll page changes,
+        # so the continuous-only signal is not connected to the same slots
+        return (
+            (viewer.view_mode_changed, self.update_view_menu_state),
+            (viewer.current_page_changed, self.update_page_info_from_signal),
+            (viewer.zoom_changed, self.update_zoom_info),
+            (viewer.bookmarks_changed, self.update_bookmarks),
+            (viewer.search_progress, self.update_search_results),
+        )
+
+    def close_all_tabs(self):
+        """Close all tabs, last to first, without repainting between removals."""
+        self.tab_widget.setUpdatesEnabled(False)
+        try:
+            # Removing from the end avoids shifting and relayouting the remaining tabs
+            for index in range(self.tab_widget.count() - 1, -1, -1):
+                self.close_tab(index)
+        finally:
+            self.tab_widget.setUpdatesEnabled(True)
 
     def close_current_tab(self):
         """Close the currently active tab."""
@@ -1091,7 +1410,12 @@ class MainWindow(QMainWindow):
 
     def current_viewer(self) -> PDFViewer | None:
         """Get the currently active PDF viewer."""
-        return self.tab_widget.currentWidget()
+        return self._current_viewer
+
+    def _cache_current_viewer(self):
+        """Remember the active tab's viewer so lookups avoid a Qt round-trip."""
+        widget = self.tab_widget.currentWidget()
+        self._current_viewer = widget if isinstance(widget, PDFViewer) else None
 
     def next_page(self):
         """Navigate to the next page in the current viewer."""
@@ -1132,53 +1456,112 @@ class MainWindow(QMainWindow):
         """Navigate to the page number entered in the input field."""
         viewer = self.current_viewer()
         if viewer and viewer.doc:
-            try:
-                page_num = int(self.page_num_input.text()) - 1
-                if 0 <= page_num < viewer.doc.page_count:
-                    viewer.jump_to_page(page_num)
-                    self.update_page_info()
-                else:
-                    self.page_num_input.setText(str(viewer.current_page + 1))
-            except ValueError:
+            # The validator follows the locale, so it accepts grouped numbers like "1,234"
+            page_num, ok = self.page_validator.locale().toInt(self.page_num_input.text())
+            page_num -= 1
+            self.page_num_input.setModified(False)
+            if not ok:
+                self.page_num_input.setText(str(viewer.current_page + 1))
+                return
+            if 0 <= page_num < viewer.page_count:
+                viewer.jump_to_page(page_num)
+                self.update_page_info()
+            else:
                 self.page_num_input.setText(str(viewer.current_page + 1))
 
     def update_page_info(self):
         """Update the page information display."""
         viewer = self.current_viewer()
         if viewer and viewer.doc:
+            page_count = viewer.page_count
             current_display_page = viewer.current_page
             page_text = str(current_display_page + 1)
             if (
                 viewer.view_mode == ViewMode.DOUBLE_PAGE
-                and current_display_page + 1 < viewer.doc.page_count
+                and current_display_page + 1 < page_count
             ):
                 page_text = f"{current_display_page + 1}-{current_display_page + 2}"
 
-            self.page_num_input.setText(page_text)
-            self.total_pages_label.setText(f"/ {viewer.doc.page_count}")
+            if self.page_validator.top() != page_count:
+                self.page_validator.setTop(page_count)
+            # QLineEdit.setText resets the cursor and emits textChanged even for equal text,
+            # and must not overwrite a page number the user is still typing
+            editing = self.page_num_input.hasFocus() and self.page_num_input.isModified()
+            if self.page_num_input.text() != page_text and not editing:
+                self.page_num_input.setText(page_text)
+            self.total_pages_label.setText(f"/ {page_count}")
         else:
             self.page_num_input.clear()
             self.total_pages_label.setText("/ N/A")
 
     def update_toc(self):
         """Update the table of contents display."""
-        self.toc_list_widget.clear()
+        if self.toc_dock is None or self.toc_dock.isHidden():
+            self._toc_dirty = True
+            return  # Refreshed when the panel is shown
+        self._toc_dirty = False
         viewer = self.current_viewer()
-        if viewer:
-            toc = viewer.get_toc()
-            for entry in toc:
-                level, title, page = entry
-                item = QListWidgetItem("  " * (level - 1) + title)
-                item.setData(Qt.ItemDataRole.UserRole, page - 1)
-                self.toc_list_widget.addItem(item)
-
-    def toc_navigate(self, item):
+        if viewer is None:
+            self._set_toc_model(self._empty_toc_model)
+            return
+        # A document's outline never changes, so tab switches reuse its model
+        model = self._toc_models.get(viewer)
+        if model is None:
+            self._set_toc_model(self._toc_loading_model)
+            self._toc_load_timer.start(0)
+            return
+        self._set_toc_model(model)
+
+    def _load_pending_toc(self):
+        """Build the outline of whichever viewer is active once the UI has settled."""
+        viewer = self.current_viewer()
+        if viewer is None or viewer in self._toc_models:
+            return
+        if self.toc_dock is None or self.toc_dock.isHidden():
+            self._toc_dirty = True
+            return  # Loaded again when the panel is shown
+        self._toc_models[viewer] = self._build_toc_model(viewer.get_toc())
+        self.update_toc()
+
+    def _build_toc_model(self, toc):
+        """Build an outline model from a PyMuPDF table of contents."""
+        model = QStandardItemModel(self)
+        # Build the outline detached from the model, then insert it in one batch
+        top_level_items = []
+        parents = []  # parents[i] is the most recent item at level i + 1
+        for level, title, page in toc:
+            item = QStandardItem(title)
+            item.setData(page - 1, Qt.ItemDataRole.UserRole)
+            del parents[level - 1:]
+            if parents:
+                parents[-1].appendRow(item)
+            else:
+                top_level_items.append(item)
+            parents.append(item)
+        if top_level_items:
+            model.invisibleRootItem().appendRows(top_level_items)
+        return model
+
+    def _set_toc_model(self, model):
+        """Show the given outline model in the table of contents panel."""
+        if model is self.toc_model:
+            return
+        self.toc_model = model
+        view = self.toc_tree_view
+        if view is not None:
+            # setModel() replaces the selection model without deleting the old one
+            old_selection_model = view.selectionModel()
+            view.setModel(model)
+            if old_selection_model is not None:
+                old_selection_model.deleteLater()
+
+    def toc_navigate(self, index):
         """Navigate to the page selected in the table of contents."""
         viewer = self.current_viewer()
-        if viewer and item:
-            page_num = item.data(Qt.ItemDataRole.UserRole)
+        if viewer and index.isValid():
+            page_num = index.data(Qt.ItemDataRole.UserRole)
+            # The page change signal refreshes the toolbar, so it is not done here as well
             viewer.jump_to_page(page_num)
-            self.update_page_info()
 
     def add_bookmark(self):
         """Add a bookmark for the current page."""
@@ -1189,35 +1572,35 @@ class MainWindow(QMainWindow):
                 success = viewer.add_bookmark(title=title)
                 if success:
                     self.update_bookmarks()
+                    self.show_status_message("Bookmark added", 2000)
                 else:
-                    QMessageBox.warning(self, "Warning", "Bookmark already exists for this page.")
+                    self.show_status_message("Bookmark already exists for this page", 3000)
 
     def remove_current_bookmark(self):
         """Remove the bookmark for the current page."""
         viewer = self.current_viewer()
         if viewer and viewer.doc:
-            success = viewer.remove_bookmark(viewer.current_page)
-            if success:
-                self.update_bookmarks()
+            # bookmarks_changed refreshes the panel
+            if viewer.remove_bookmark(viewer.current_page):
+                self.show_status_message("Bookmark removed", 2000)
             else:
-                QMessageBox.warning(self, "Warning", "No bookmark exists for this page.")
+                self.show_status_message("No bookmark exists for this page", 3000)
 
     def update_bookmarks(self):
         """Update the bookmarks display."""
-        self.bookmarks_list_widget.clear()
+        if self.bookmarks_dock is None or self.bookmarks_dock.isHidden():
+            self._bookmarks_dirty = True
+            return  # Refreshed when the panel is shown
+        self._bookmarks_dirty = False
         viewer = self.current_viewer()
-        if viewer:
-            bookmarks = viewer.get_bookmarks()
-            for bookmark in bookmarks:
-                item = QListWidgetItem(f"{bookmark.title} (Page {bookmark.page_number + 1})")
-                item.setData(Qt.ItemDataRole.UserRole, bookmark)
-                self.bookmarks_list_widget.addItem(item)
+        # One model reset; the view repaints once and creates no per-row items
+        self.bookmarks_model.set_bookmarks(viewer.get_bookmarks() if viewer else [])
 
-    def bookmark_navigate(self, item):
+    def bookmark_navigate(self, index):
         """Navigate to the selected bookmark."""
         viewer = self.current_viewer()
-        if viewer and item:
-            bookmark = item.data(Qt.ItemDataRole.UserRole)
+        if viewer and index.isValid():
+            bookmark = index.data(Qt.ItemDataRole.UserRole)
             viewer.jump_to_bookmark(bookmark)
             self.update_page_info()
 
@@ -1225,34 +1608,46 @@ class MainWindow(QMainWindow):
         """Show context menu for bookmarks."""
         menu = QMenu()
         delete_action = menu.addAction("Delete Bookmark")
-        action = menu.exec(self.bookmarks_list_widget.mapToGlobal(position))
+        action = menu.exec(self.bookmarks_list_view.mapToGlobal(position))
         if action == delete_action:
-            item = self.bookmarks_list_widget.itemAt(position)
-            if item:
-                bookmark = item.data(Qt.ItemDataRole.UserRole)
+            index = self.bookmarks_list_view.indexAt(position)
+            if index.isValid():
+                bookmark = index.data(Qt.ItemDataRole.UserRole)
                 viewer = self.current_viewer()
-                if viewer:
-                    viewer.remove_bookmark(bookmark.page_number)
-                    self.update_bookmarks()
+                if viewer and viewer.remove_bookmark(bookmark.page_number):
+                    self.show_status_message("Bookmark removed", 2000)
 
     def clear_current_page_annotations(self):
         """Clear all annotations on the current page."""
         viewer = self.current_viewer()
         if viewer and viewer.doc:
-            viewer.annotations = [ann for ann in viewer.annotations if ann.page != viewer.current_page]
-            viewer._redraw_page(viewer.current_page)
+            removed = viewer.clear_page_annotations(viewer.current_page)
+            if removed:
+                viewer._redraw_page(viewer.current_page)
+            self.show_status_message(f"Cleared {removed} annotation(s) on this page", 2000)
 
     def clear_all_annotations(self):
         """Clear all annotations in the document."""
         viewer = self.current_viewer()
         if viewer and viewer.doc:
-            reply = QMessageBox.question(
-                self, "Confirm", "Are you sure you want to clear all annotations?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            # Window-modal rather than exec(), so the event loop keeps running while the user decides
+            box = QMessageBox(
+                QMessageBox.Icon.Question, "Confirm",
+                "Are you sure you want to clear all annotations?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self
             )
-            if reply == QMessageBox.StandardButton.Yes:
-                viewer.annotations = []
-                viewer._redraw_all_pages()
+            box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            box.finished.connect(partial(self._on_clear_all_annotations_finished, box, viewer))
+            box.open()
+
+    def _on_clear_all_annotations_finished(self, box, viewer, _result):
+        """Clear the viewer's annotations if the user confirmed and the tab is still open."""
+        if box.standardButton(box.clickedButton()) != QMessageBox.StandardButton.Yes:
+            return
+        if self._open_viewers.get(viewer.file_path) is not viewer or not viewer.doc:
+            return  # Closed while the question was showing
+        # Only pages that had annotations need repainting
+        viewer._redraw_pages(viewer.clear_annotations())
 
     def clear_recent_files(self):
         """Clear the recent files list."""
@@ -1269,31 +1664,26 @@ class MainWindow(QMainWindow):
 
     def add_to_recent_files(self, file_path):
         """Add a file to the recent files list."""
-        # Update both the local list and config
-        if file_path in self.recent_files:
-            self.recent_files.remove(file_path)
-        self.recent_files.insert(0, file_path)
-        self.recent_files = self.recent_files[:10]
+        if next(iter(self.recent_files), None) == file_path:
+            return  # Already the most recent file, nothing to reorder or save
+        # Update both the local list and config; moving to the front is O(1)
+        self.recent_files[file_path] = os.path.basename(file_path)
+        self.recent_files.move_to_end(file_path, last=False)
+        while len(self.recent_files) > MAX_RECENT_FILES:
+            self.recent_files.popitem()
         # Also add to config
         config.add_recent_file(file_path)
-        config.save()
-        
-        self.update_recent_files_menu()
+        self.schedule_config_save()
 
     def update_recent_files_menu(self):
         """Update the recent files menu with progress information."""
-        self.recent_files_menu.clear()
-        recent_docs = config.get_recent_documents()
-        
-        for file_path in self.recent_files:
-            filename = os.path.basename(file_path)
-            
+        entries = []
+        for file_path, filename in self.recent_files.items():
+            # Documents open in a tab are known to exist, so only the others are checked on disk
+            if file_path not in self._open_viewers and not os.path.exists(file_path):
+                continue  # Moved or deleted since it was opened
             # Try to find progress information
-            doc_info = None
-            for doc in recent_docs:
-                if doc.get('file_path') == file_path:
-                    doc_info = doc
-                    break
+            doc_info = config.get_recent_document(file_path)
             
             if doc_info:
                 # Show filename with page information
@@ -1302,11 +1692,28 @@ class MainWindow(QMainWindow):
                 action_text = f"{filename} (Page {last_page}/{total_pages})"
             else:
                 action_text = filename
-            
-            action = QAction(action_text, self)
-            action.setData(file_path)
-            action.triggered.connect(self.open_recent_file)
-            self.recent_files_menu.addAction(action)
+            entries.append((file_path, action_text))
+        
+        # Opening the menu again without any change leaves the actions alone
+        entries = tuple(entries)
+        if entries == self._recent_menu_entries:
+            return
+        self._recent_menu_entries = entries
+        
+        # Relabel the whole pool before the menu lays itself out again
+        menu = self.recent_files_menu
+        menu.setUpdatesEnabled(False)
+        try:
+            for index, action in enumerate(self._recent_file_actions):
+                if index < len(entries):
+                    file_path, action_text = entries[index]
+                    action.setText(action_text)
+                    action.setData(file_path)
+                    action.setVisible(True)
+                else:
+                    action.setVisible(False)
+        finally:
+            menu.setUpdatesEnabled(True)
 
     def open_recent_file(self):
         """Open a file from the recent files menu."""
@@ -1314,61 +1721,75 @@ class MainWindow(QMainWindow):
         if action:
             file_path = action.data()
             if os.path.exists(file_path):
-                self.add_pdf_tab(file_path)
+                self.queue_document_load(file_path)
             else:
                 QMessageBox.warning(self, "Warning", f"File not found: {file_path}")
-                self.recent_files.remove(file_path)
-                self.update_recent_files_menu()
+                self.recent_files.pop(file_path, None)
+                # Forget it on disk too, so it does not come back next launch
+                config.remove_recent_file(file_path)
+                self.schedule_config_save()
 
     def load_recent_files(self):
         """Load recent files from configuration."""
-        self.recent_files = config.get_recent_files()
-        self.update_recent_files_menu()
+        self.recent_files = OrderedDict(
+            (path, os.path.basename(path))
+            for path in config.get_recent_files()[:MAX_RECENT_FILES]
+        )
+
+    def schedule_config_save(self):
+        """Save the configuration shortly, folding nearby changes into one write."""
+        self._config_save_timer.start()
 
     def save_current_progress(self):
-        """Save current reading progress to configuration."""
-        viewer = self.current_viewer()
-        if viewer and viewer.file_path and viewer.doc:
-            current_page = viewer.current_page
-            total_pages = viewer.doc.page_count
-            print(f"Saving progress: {os.path.basename(viewer.file_path)} - Page {current_page + 1}/{total_pages}")
-            config.update_document_progress(viewer.file_path, current_page, total_pages)
-            config.save()
+        """Commit recorded reading progress and save it to configuration."""
+        if config.commit_progress():
+            logger.debug("Saving reading progress")
+            self.schedule_config_save()
 
     def schedule_progress_save(self):
-        """Schedule a progress save after a delay to avoid too frequent saves."""
-        # Only print if timer wasn't already active
+        """Record the current page and schedule a coalesced progress save."""
+        viewer = self.current_viewer()
+        if viewer and viewer.file_path and viewer.doc:
+            # Cheap in-memory update; history and disk are updated by the timer
+            config.record_page(viewer.file_path, viewer.current_page, viewer.page_count)
+        # A running timer is left alone so saves happen at most every 30 seconds
         if not self.progress_save_timer.isActive():
-            print(f"Scheduling progress save in 2 seconds...")
-        self.progress_save_timer.start(2000) # Save after 2 seconds of inactivity
+            logger.debug("Scheduling progress save in 30 seconds")
+            self.progress_save_timer.start(30000)  # Commit at most every 30 seconds while reading
 
     def update_view_menu_state(self):
         """Update the view mode menu based on the current viewer."""
         viewer = self.current_viewer()
-        if viewer:
-            mode = viewer.view_mode
-            self.single_page_action.setChecked(mode == ViewMode.SINGLE_PAGE)
-            self.fit_page_action.setChecked(mode == ViewMode.FIT_PAGE)
-            self.fit_width_action.setChecked(mode == ViewMode.FIT_WIDTH)
-            self.double_page_action.setChecked(mode == ViewMode.DOUBLE_PAGE)
-            self.continuous_scroll_action.setChecked(mode == ViewMode.CONTINUOUS_SCROLL)
-        else:
-            self.single_page_action.setChecked(True)
-            self.fit_page_action.setChecked(False)
-            self.fit_width_action.setChecked(False)
-            self.double_page_action.setChecked(False)
-            self.continuous_scroll_action.setChecked(False)
+        mode = viewer.view_mode if viewer else ViewMode.SINGLE_PAGE
+        # The action group is exclusive, so checking one unchecks the rest
+        action = self._view_actions.get(mode)
+        if action and not action.isChecked():
+            # The group unchecks the previous mode from the new action's signals, so
+            # only the previous action can be kept quiet while mirroring the viewer
+            previous = self.view_mode_group.checkedAction()
+            if previous is None:
+                action.setChecked(True)
+            else:
+                blocker = QSignalBlocker(previous)
+                action.setChecked(True)
+                blocker.unblock()
 
     def update_page_info_from_signal(self, page_num):
-        """Update page info from continuous scroll signal."""
+        """Queue a page info refresh so scrolling is not held up by status updates."""
+        # Restarting the zero-interval timer also folds several changes into one refresh
+        self._page_change_timer.start()
+
+    def _apply_page_change(self):
+        """Update page info and schedule a progress save after viewer page changes."""
         self.update_page_info()
+        self.schedule_progress_save()
         # Also update status bar with current document info
         viewer = self.current_viewer()
         if viewer and viewer.doc:
             self.update_document_status(
                 None,  # Don't change document name
                 viewer.current_page,
-                viewer.doc.page_count,
+                viewer.page_count,
                 None  # Don't change zoom here
             )
 
@@ -1383,15 +1804,19 @@ class MainWindow(QMainWindow):
 
     def on_tab_changed(self, index):
         """Handle tab change events."""
+        self._cache_current_viewer()
+        # Save pending progress from the previous document on file switch
+        self.save_current_progress()
         self.update_page_info()
         self.update_toc()
         self.update_bookmarks()
         self.update_view_menu_state()
+        self._sync_annotation_actions()
         
         # Update status bar for the new tab
         viewer = self.current_viewer()
         if viewer and viewer.doc:
-            document_name = os.path.basename(viewer.file_path) if viewer.file_path else "Unknown Document"
+            document_name = viewer.file_name or "Unknown Document"
             self.update_document_status(
                 document_name,
                 viewer.current_page,
@@ -1588,15 +2013,17 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'search_prev_action'):
             self.search_prev_action.setEnabled(False)
 
+    def show_bookmarks_panel(self):
+        """Show the bookmarks panel."""
+        self._request_bookmarks(True)
+
     def toggle_bookmarks_panel(self):
         """Toggle the bookmarks panel visibility."""
-        if hasattr(self, 'bookmarks_dock'):
-            self.bookmarks_dock.setVisible(not self.bookmarks_dock.isVisible())
+        self._request_bookmarks(self.bookmarks_dock is None or not self.bookmarks_dock.isVisible())
 
     def toggle_toc_panel(self):
         """Toggle the table of contents panel visibility."""
-        if hasattr(self, 'toc_dock'):
-            self.toc_dock.setVisible(not self.toc_dock.isVisible())
+        self._request_toc(self.toc_dock is None or not self.toc_dock.isVisible())
 
     def reopen_last_closed(self):
         """Reopen the last closed document."""
@@ -1648,18 +2075,8 @@ class MainWindow(QMainWindow):
         has_document = viewer is not None and viewer.doc is not None
         
         # Update action states
-        actions_requiring_document = [
-            self.prev_page_action,
-            self.next_page_action,
-            self.zoom_in_action,
-            self.zoom_out_action,
-            self.add_bookmark_toolbar_action,
-            self.search_button
-        ]
-        
-        for action in actions_requiring_document:
-            if hasattr(self, action.objectName()) or action:
-                action.setEnabled(has_document)
+        for action in self._document_actions:
+            action.setEnabled(has_document)
         
         # Update page input
         if hasattr(self, 'page_num_input'):
@@ -1671,7 +2088,7 @@ class MainWindow(QMainWindow):
         
         # Update status bar
         if has_document:
-            doc_name = os.path.basename(viewer.file_path) if viewer.file_path else "Untitled"
+            doc_name = viewer.file_name or "Untitled"
             self.update_document_status(
                 doc_name,
                 viewer.current_page,
@@ -1693,13 +2110,17 @@ class MainWindow(QMainWindow):
     def resizeEvent(self, event):
         """Handle window resize events to rearrange widgets dynamically."""
         super().resizeEvent(event)
-        
+        # Restarting the timer collapses a drag-resize into one trailing update
+        self._resize_timer.start()
+
+    def _apply_resize(self):
+        """Rearrange widgets for the current window size."""
         # Check if adaptive layout is enabled
         if not getattr(self, '_adaptive_layout_enabled', True):
             return
         
         # Get the new window size
-        new_size = event.size()
+        new_size = self.size()
         window_width = new_size.width()
         window_height = new_size.height()
         
@@ -1718,6 +2139,13 @@ class MainWindow(QMainWindow):
         is_medium_height = SMALL_HEIGHT_THRESHOLD <= window_height < MEDIUM_HEIGHT_THRESHOLD
         is_large_height = window_height >= MEDIUM_HEIGHT_THRESHOLD
         
+        # Resizes within the same size category need no relayout; user panel
+        # changes clear the memo so the next resize always reapplies it
+        size_class = (is_small_width, is_medium_width, is_small_height, is_medium_height)
+        if size_class == self._layout_size_class:
+            return
+        self._layout_size_class = size_class
+        
         # Manage dock widget visibility and positions based on window size
         self._rearrange_dock_widgets(is_small_width, is_medium_width, is_large_width,
                                    is_small_height, is_medium_height, is_large_height)
@@ -1741,30 +2169,26 @@ class MainWindow(QMainWindow):
         
         # For very small windows, hide all dock widgets to maximize content area
         if is_small_width and is_small_height:
-            if hasattr(self, 'toc_dock'):
-                self.toc_dock.setVisible(False)
-            if hasattr(self, 'bookmarks_dock'):
-                self.bookmarks_dock.setVisible(False)
+            self._show_toc(False)
+            self._show_bookmarks(False)
             if hasattr(self, 'annotations_dock'):
                 self.annotations_dock.setVisible(False)
         
         # For small width but adequate height, show only annotations dock at bottom
         elif is_small_width and not is_small_height:
-            if hasattr(self, 'toc_dock'):
-                self.toc_dock.setVisible(False)
-            if hasattr(self, 'bookmarks_dock'):
-                self.bookmarks_dock.setVisible(False)
+            self._show_toc(False)
+            self._show_bookmarks(False)
             if hasattr(self, 'annotations_dock'):
                 self.annotations_dock.setVisible(True)
                 # Move annotations dock to bottom for narrow windows
                 self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.annotations_dock)
         
-        # For medium width windows, show bookmarks and annotations
+        # For medium width windows, show bookmarks (if asked for) and annotations.
+        # The TOC and bookmarks docks are only built once someone asks for them.
         elif is_medium_width:
-            if hasattr(self, 'toc_dock'):
-                self.toc_dock.setVisible(False)  # TOC takes up too much space
-            if hasattr(self, 'bookmarks_dock'):
-                self.bookmarks_dock.setVisible(True)
+            self._show_toc(False)  # TOC takes up too much space
+            self._show_bookmarks(self._bookmarks_requested)
+            if self.bookmarks_dock is not None:
                 # Keep bookmarks on the left
                 self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.bookmarks_dock)
             if hasattr(self, 'annotations_dock'):
@@ -1776,14 +2200,13 @@ class MainWindow(QMainWindow):
                     # For medium width and adequate height, put annotations at bottom
                     self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.annotations_dock)
         
-        # For large windows, show all dock widgets optimally positioned
+        # For large windows, show the requested dock widgets optimally positioned
         elif is_large_width:
-            # Show all dock widgets
-            if hasattr(self, 'toc_dock'):
-                self.toc_dock.setVisible(True)
+            self._show_toc(self._toc_requested)
+            if self.toc_dock is not None:
                 self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.toc_dock)
-            if hasattr(self, 'bookmarks_dock'):
-                self.bookmarks_dock.setVisible(True)
+            self._show_bookmarks(self._bookmarks_requested)
+            if self.bookmarks_dock is not None:
                 self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.bookmarks_dock)
             if hasattr(self, 'annotations_dock'):
                 self.annotations_dock.setVisible(True)
@@ -1795,9 +2218,11 @@ class MainWindow(QMainWindow):
                     self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.annotations_dock)
             
             # Stack TOC and bookmarks together on the left if both are visible
-            if hasattr(self, 'toc_dock') and hasattr(self, 'bookmarks_dock'):
-                if self.toc_dock.isVisible() and self.bookmarks_dock.isVisible():
-                    self.tabifyDockWidget(self.toc_dock, self.bookmarks_dock)
+            if (
+                self.toc_dock is not None and self.toc_dock.isVisible()
+                and self.bookmarks_dock is not None and self.bookmarks_dock.isVisible()
+            ):
+                self.tabifyDockWidget(self.toc_dock, self.bookmarks_dock)
 
     def _adjust_toolbar_layout(self, is_small_width, is_small_height):
         """Adjust toolbar layout for different window sizes."""
@@ -1894,16 +2319,13 @@ class MainWindow(QMainWindow):
         # Save window state before closing
         self.save_window_state()
         
-        # Save any open documents' reading progress
-        for i in range(self.tab_widget.count()):
-            viewer = self.tab_widget.widget(i)
-            if hasattr(viewer, 'file_path') and viewer.file_path:
-                # Save current page and zoom level using the correct method
-                config.update_document_progress(
-                    viewer.file_path,
-                    viewer.current_page,
-                    viewer.doc.page_count if viewer.doc else 0
-                )
+        # Close all documents; close_tab saves each document's reading progress
+        self.close_all_tabs()
+        self.save_current_progress()
+        # The final config.save() below replaces any write these timers would make
+        self.progress_save_timer.stop()
+        self._config_save_timer.stop()
+        self.page_cache.close()
         
         # Save the configuration
         config.save()
@@ -1914,11 +2336,11 @@ class MainWindow(QMainWindow):
     def save_dock_state(self):
         """Save current dock widget state to configuration."""
         dock_state = {
-            'toc_visible': self.toc_dock.isVisible() if hasattr(self, 'toc_dock') else False,
-            'bookmarks_visible': self.bookmarks_dock.isVisible() if hasattr(self, 'bookmarks_dock') else False,
+            'toc_visible': self.toc_dock.isVisible() if self.toc_dock is not None else False,
+            'bookmarks_visible': self.bookmarks_dock.isVisible() if self.bookmarks_dock is not None else False,
             'annotations_visible': self.annotations_dock.isVisible() if hasattr(self, 'annotations_dock') else False,
-            'toc_area': int(self.dockWidgetArea(self.toc_dock)) if hasattr(self, 'toc_dock') and self.toc_dock.isVisible() else 1,
-            'bookmarks_area': int(self.dockWidgetArea(self.bookmarks_dock)) if hasattr(self, 'bookmarks_dock') and self.bookmarks_dock.isVisible() else 1,
+            'toc_area': int(self.dockWidgetArea(self.toc_dock)) if self.toc_dock is not None and self.toc_dock.isVisible() else 1,
+            'bookmarks_area': int(self.dockWidgetArea(self.bookmarks_dock)) if self.bookmarks_dock is not None and self.bookmarks_dock.isVisible() else 1,
             'annotations_area': int(self.dockWidgetArea(self.annotations_dock)) if hasattr(self, 'annotations_dock') and self.annotations_dock.isVisible() else 1,
         }
         config.set('dock_state', dock_state)
@@ -1927,13 +2349,13 @@ class MainWindow(QMainWindow):
         """Restore dock widget state from configuration."""
         dock_state = config.get('dock_state', {})
         
-        if hasattr(self, 'toc_dock'):
-            self.toc_dock.setVisible(dock_state.get('toc_visible', False))
+        self._request_toc(dock_state.get('toc_visible', False))
+        if self.toc_dock is not None:
             area = Qt.DockWidgetArea(dock_state.get('toc_area', 1))
             self.addDockWidget(area, self.toc_dock)
             
-        if hasattr(self, 'bookmarks_dock'):
-            self.bookmarks_dock.setVisible(dock_state.get('bookmarks_visible', False))
+        self._request_bookmarks(dock_state.get('bookmarks_visible', False))
+        if self.bookmarks_dock is not None:
             area = Qt.DockWidgetArea(dock_state.get('bookmarks_area', 1))
             self.addDockWidget(area, self.bookmarks_dock)
             
@@ -1951,11 +2373,9 @@ class MainWindow(QMainWindow):
         
         if self._adaptive_layout_enabled:
             self.show_status_message("Adaptive layout enabled", 3000)
-            # Force a resize event to apply current layout
-            from PyQt6.QtGui import QResizeEvent
-            current_size = self.size()
-            resize_event = QResizeEvent(current_size, current_size)
-            self.resizeEvent(resize_event)
+            # Apply the layout for the current size right away
+            self._layout_size_class = None
+            self._apply_resize()
         else:
             self.show_status_message("Adaptive layout disabled", 3000)
             # Restore saved dock state
@@ -1964,6 +2384,7 @@ class MainWindow(QMainWindow):
     def force_compact_layout(self):
         """Force compact layout regardless of window size."""
         self._rearrange_dock_widgets(True, False, False, True, False, False)
+        self._layout_size_class = None  # The next resize restores the adaptive layout
         self._adjust_toolbar_layout(True, True)
         self._update_tab_styling(True)
         self.show_status_message("Compact layout applied", 3000)
@@ -1971,6 +2392,7 @@ class MainWindow(QMainWindow):
     def force_full_layout(self):
         """Force full layout regardless of window size."""
         self._rearrange_dock_widgets(False, False, True, False, False, True)
+        self._layout_size_class = None  # The next resize restores the adaptive layout
         self._adjust_toolbar_layout(False, False)
         self._update_tab_styling(False)
         self.show_status_message("Full layout applied", 3000)
@@ -1980,13 +2402,13 @@ class MainWindow(QMainWindow):
         size = self.size()
         dock_info = {}
         
-        if hasattr(self, 'toc_dock'):
+        if self.toc_dock is not None:
             dock_info['toc'] = {
                 'visible': self.toc_dock.isVisible(),
                 'area': int(self.dockWidgetArea(self.toc_dock)) if self.toc_dock.isVisible() else None
             }
         
-        if hasattr(self, 'bookmarks_dock'):
+        if self.bookmarks_dock is not None:
             dock_info['bookmarks'] = {
                 'visible': self.bookmarks_dock.isVisible(),
                 'area': int(self.dockWidgetArea(self.bookmarks_dock)) if self.bookmarks_dock.isVisible() else None
@@ -1,15 +1,41 @@
 """PDF viewer widget component."""
 
 import os
+import time
+import logging
+import bisect
+import itertools
+from typing import Optional
+from collections import OrderedDict, defaultdict
 import fitz  # PyMuPDF
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QScrollArea, QLabel, QStackedWidget,
     QSpacerItem, QSizePolicy, QApplication, QInputDialog, QMessageBox, QLineEdit
 )
 from PyQt6.QtGui import QPixmap, QPainter, QImage, QPen, QColor, QFont
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QPoint, QRect
+from PyQt6.QtCore import (
+    Qt, QSize, pyqtSignal, QPoint, QRect, QTimer, QObject, QRunnable, QThreadPool
+)
 
 from ..core.models import ViewMode, Bookmark, AnnotationType, Annotation
+from ..core.page_cache import document_key, encode_page_samples, decode_page_samples
+
+logger = logging.getLogger(__name__)
+
+# View modes whose zoom is derived from the viewport size
+_FIT_MODES = (ViewMode.FIT_PAGE, ViewMode.FIT_WIDTH)
+
+# Memory budget for rasterized pages kept per viewer for revisits, resizes and tab switches
+_PAGE_PIXMAP_CACHE_BYTES = 96 * 1024 * 1024
+
+# Pages searched per event loop turn, so long documents stay responsive while searching
+_SEARCH_PAGES_PER_BATCH = 20
+
+# Only pages this slow to render are persisted; cheaper ones render faster than they decompress
+_PERSIST_MIN_RENDER_SECONDS = 0.05
+
+# Rendered pages waiting to be persisted, newest kept, so fast scrolling cannot pile up samples
+_MAX_UNSAVED_PAGES = 8
 
 
 class TextSelection:
@@ -28,6 +54,27 @@ class SearchResult:
         self.rect = rect
 
 
+class EncoderSignals(QObject):
+    """Signals for the page encoder."""
+    pages_encoded = pyqtSignal(list)  # (doc_key, page, zoom, data) entries
+
+
+class PageEncoder(QRunnable):
+    """Compress rendered page samples for the persistent page cache on the thread pool."""
+
+    def __init__(self, doc_key, pages):
+        super().__init__()
+        self.doc_key = doc_key
+        self.pages = pages  # ((page, zoom), (width, height, stride, samples)) pairs
+        self.signals = EncoderSignals()
+
+    def run(self):
+        self.signals.pages_encoded.emit([
+            (self.doc_key, page, zoom, encode_page_samples(*samples))
+            for (page, zoom), samples in self.pages
+        ])
+
+
 class PDFViewer(QWidget):
     """Main PDF viewing widget with support for multiple view modes."""
     
@@ -36,11 +83,17 @@ class PDFViewer(QWidget):
     current_page_changed = pyqtSignal(int)  # General page change signal
     zoom_changed = pyqtSignal(float)  # Signal for zoom factor changes
     bookmarks_changed = pyqtSignal()
+    search_progress = pyqtSignal(int, bool)  # Results found so far, whether the search finished
     
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, page_cache=None):
         super().__init__()
         self.doc = None
+        self.page_cache = page_cache  # Optional PageCache persisting rendered pages across sessions
+        self._document_key = None
+        self._unsaved_pages = OrderedDict()  # Page cache key -> samples not yet written to page_cache
         self.file_path = None
+        self.file_name = None  # Cached basename of file_path
+        self.page_count = 0  # Cached doc.page_count, 0 without a document
         self.current_page = 0
         self.zoom_factor = 1.0
         self._last_auto_zoom_level = 1.0
@@ -48,15 +101,19 @@ class PDFViewer(QWidget):
 
         self._page_widgets = []
         self._page_geometries = []
+        self._page_tops = []  # Top of each page in the continuous layout, in page order
         self._continuous_render_zoom = 1.0
+        self._page_pixmap_cache = OrderedDict()  # (page, zoom) -> pixmap, least recent first
+        self._page_bounds = []  # Page rectangles by index, filled in on first use
+        self._page_pixmap_cache_bytes = 0
         self._ignore_scroll_page_updates = False  # Flag to temporarily disable automatic page updates
         self._debug_mode = False  # Set to False to disable debug prints
         
-        self._bookmarks = []
+        self._bookmarks = {}  # page index -> Bookmark, kept in page order
         
         self.active_annotation_type = None
         self.annotation_start_point = None
-        self.annotations = []
+        self.annotations_by_page = defaultdict(list)  # page index -> annotations
         self.is_annotating = False
         self.annotation_mode_enabled = False
         self._current_annotation_page = 0
@@ -104,6 +161,29 @@ class PDFViewer(QWidget):
         
         self.scroll_area.verticalScrollBar().valueChanged.connect(self._update_visible_pages)
         self.scroll_area.viewport().installEventFilter(self)
+
+        # Apply viewport resizes once, after the user stops dragging
+        self._viewport_resize_timer = QTimer(self)
+        self._viewport_resize_timer.setSingleShot(True)
+        self._viewport_resize_timer.setInterval(80)
+        self._viewport_resize_timer.timeout.connect(self._apply_viewport_resize)
+        self._fitted_viewport_size = None  # (view mode, viewport size) of the last fit render
+        # Neighbouring pages are rasterized into the page cache once the UI is idle
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(150)
+        self._prefetch_timer.timeout.connect(self._prefetch_neighbor_pages)
+        # Expensive pages are handed to the encoder once rendering settles, in every view mode
+        self._store_timer = QTimer(self)
+        self._store_timer.setSingleShot(True)
+        self._store_timer.setInterval(500)
+        self._store_timer.timeout.connect(self._store_rendered_pages)
+        self._prefetch_zoom = 1.0
+        self._prefetch_direction = 1  # Direction of the last page flip
+        self._last_rendered_page = None
+        self._search_timer = QTimer(self)
+        self._search_timer.timeout.connect(self._search_next_batch)
+        self._search_page = 0  # Next page to search
         self.single_double_canvas.installEventFilter(self)
 
     def extract_page_text(self, page_idx):
@@ -113,7 +193,7 @@ class PDFViewer(QWidget):
         try:
             page = self.doc.load_page(page_idx)
             text = page.get_text("text")
-            print(f"Extracted text from page {page_idx + 1}: {text[:100] + '...' if len(text) > 100 else text}")
+            logger.debug("Extracted text from page %d: %.100s", page_idx + 1, text)
             return text.strip()
         except Exception as e:
             print(f"Error extracting text from page {page_idx + 1}: {e}")
@@ -122,11 +202,21 @@ class PDFViewer(QWidget):
     def eventFilter(self, source, event):
         """Handle viewport resize events, annotation, and text selection interactions."""
         if source == self.scroll_area.viewport() and event.type() == event.Type.Resize:
-            self._update_visible_pages()
+            new_size, old_size = event.size(), event.oldSize()
+            if new_size == old_size:
+                return True  # Spurious resize, nothing to re-layout or re-render
+            # Continuous pages keep the zoom they were laid out with, so only a
+            # taller viewport can bring new pages into view
+            if self.view_mode == ViewMode.FIT_PAGE or (
+                self.view_mode == ViewMode.FIT_WIDTH and new_size.width() != old_size.width()
+            ) or (
+                self.view_mode == ViewMode.CONTINUOUS_SCROLL and new_size.height() > old_size.height()
+            ):
+                self._viewport_resize_timer.start()
             return True
 
         if not self.doc:
-            print("No document loaded")
+            logger.debug("No document loaded")
             return super().eventFilter(source, event)
 
         zoom = self._continuous_render_zoom if self.view_mode == ViewMode.CONTINUOUS_SCROLL else self.zoom_factor
@@ -140,7 +230,7 @@ class PDFViewer(QWidget):
                         self.annotation_start_point = self._get_pdf_position(source, event.position().toPoint())
                         page_idx = self._page_labels_continuous.index(source) if source in self._page_labels_continuous else self.current_page
                         self._current_annotation_page = page_idx
-                        print(f"Annotation started on page {page_idx + 1}")
+                        logger.debug("Annotation started on page %d", page_idx + 1)
                     except Exception as e:
                         print(f"Error starting annotation: {e}")
                     return True
@@ -153,14 +243,14 @@ class PDFViewer(QWidget):
                     if self.active_annotation_type == AnnotationType.TEXT:
                         text, ok = QInputDialog.getText(self, "Text Annotation", "Enter annotation text:")
                         if ok and text:
-                            self.annotations.append(Annotation(
+                            self.add_annotation(Annotation(
                                 AnnotationType.TEXT,
                                 self._current_annotation_page,
                                 self.annotation_start_point,
                                 text=text
                             ))
                     else:
-                        self.annotations.append(Annotation(
+                        self.add_annotation(Annotation(
                             self.active_annotation_type,
                             self._current_annotation_page,
                             self.annotation_start_point,
@@ -169,7 +259,7 @@ class PDFViewer(QWidget):
                     self.is_annotating = False
                     self.annotation_start_point = None
                     self._redraw_page(self._current_annotation_page)
-                    print(f"Annotation added on page {self._current_annotation_page + 1}")
+                    logger.debug("Annotation added on page %d", self._current_annotation_page + 1)
                 except Exception as e:
                     print(f"Error adding annotation: {e}")
                 return True
@@ -188,9 +278,9 @@ class PDFViewer(QWidget):
                     if self.text_selection_start:
                         self.current_selection = None
                         self._current_selection_page = self._get_page_index(source)
-                        print(f"Text selection started at page {self._current_selection_page + 1}, pos {self.text_selection_start}")
+                        logger.debug("Text selection started at page %d, pos %s", self._current_selection_page + 1, self.text_selection_start)
                     else:
-                        print("Text selection start position invalid")
+                        logger.debug("Text selection start position invalid")
                 except Exception as e:
                     print(f"Error starting text selection: {e}")
                 return True
@@ -205,10 +295,10 @@ class PDFViewer(QWidget):
                             pos,
                             text
                         )
-                        print(f"Text selection updated: {text[:50] + '...' if len(text) > 50 else text}")
+                        logger.debug("Text selection updated: %.50s", text)
                         self._redraw_visible_pages()
                     else:
-                        print("Text selection move position invalid")
+                        logger.debug("Text selection move position invalid")
                 except Exception as e:
                     print(f"Error updating text selection: {e}")
                 return True
@@ -223,10 +313,10 @@ class PDFViewer(QWidget):
                             pos,
                             text
                         )
-                        print(f"Text selection ended: {text[:50] + '...' if len(text) > 50 else text}")
+                        logger.debug("Text selection ended: %.50s", text)
                         self._redraw_visible_pages()
                     else:
-                        print("Text selection end position invalid")
+                        logger.debug("Text selection end position invalid")
                     self.is_selecting_text = False
                     self.text_selection_start = None
                 except Exception as e:
@@ -241,7 +331,7 @@ class PDFViewer(QWidget):
             if event.modifiers() == Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_C:
                 if self.current_selection and self.current_selection.text:
                     QApplication.clipboard().setText(self.current_selection.text)
-                    print(f"Copied text: {self.current_selection.text[:50] + '...' if len(self.current_selection.text) > 50 else self.current_selection.text}")
+                    logger.debug("Copied text: %.50s", self.current_selection.text)
         except Exception as e:
             print(f"Error copying text: {e}")
         super().keyPressEvent(event)
@@ -254,19 +344,19 @@ class PDFViewer(QWidget):
                 label = source
                 pixmap = label.pixmap()
                 if not pixmap or pixmap.isNull():
-                    print("No valid pixmap for mouse mapping")
+                    logger.debug("No valid pixmap for mouse mapping")
                     return None
                 label_size = label.size()
                 pixmap_size = pixmap.size()
                 offset_x = (label_size.width() - pixmap_size.width()) // 2
                 offset_y = (label_size.height() - pixmap_size.height()) // 2
                 if not (offset_x <= pos.x() < offset_x + pixmap_size.width() and offset_y <= pos.y() < offset_y + pixmap_size.height()):
-                    print(f"Mouse position outside pixmap: pos=({pos.x()}, {pos.y()}), pixmap=({pixmap_size.width()}, {pixmap_size.height()})")
+                    logger.debug("Mouse position outside pixmap: pos=%s, pixmap=%s", pos, pixmap_size)
                     return None
                 logical_x = (pos.x() - offset_x) / zoom
                 logical_y = (pos.y() - offset_y) / zoom
                 return QPoint(int(logical_x), int(logical_y))
-            print(f"Invalid source for mouse mapping: {source}")
+            logger.debug("Invalid source for mouse mapping: %s", source)
             return None
         except Exception as e:
             print(f"Error mapping mouse position: {e}")
@@ -279,7 +369,7 @@ class PDFViewer(QWidget):
                 return self.current_page
             elif source in self._page_widgets:
                 return self._page_widgets.index(source)
-            print("Using default page index")
+            logger.debug("Using default page index")
             return self.current_page
         except Exception as e:
             print(f"Error getting page index: {e}")
@@ -288,7 +378,7 @@ class PDFViewer(QWidget):
     def _extract_text(self, page_idx, start, end):
         """Extract text from a rectangular area on a page."""
         if not self.doc or page_idx < 0 or page_idx >= self.doc.page_count:
-            print(f"Invalid page index {page_idx}")
+            logger.debug("Invalid page index %d", page_idx)
             return ""
         try:
             page = self.doc.load_page(page_idx)
@@ -299,50 +389,67 @@ class PDFViewer(QWidget):
                 max(start.y(), end.y())
             )
             text = page.get_text("text", clip=rect)
-            print(f"Extracted text: {text[:50] + '...' if len(text) > 50 else text}")
+            logger.debug("Extracted text: %.50s", text)
             return text.strip()
         except Exception as e:
             print(f"Error extracting text: {e}")
             return ""
 
-    def search_text(self, text):
-        """Search for text in the PDF and store results."""
+    def start_search(self, text):
+        """Search for text a batch of pages at a time; search_progress reports the results."""
+        self._search_timer.stop()
         self.search_text_str = text
         self.search_results = []
         self.current_search_index = -1
+        self._search_page = 0
         if not self.doc or not text:
             self._redraw_visible_pages()
-            print("Search text empty or no document loaded")
-            return 0
+            self.search_progress.emit(0, True)
+            return
+        self._search_timer.start()
 
+    def _search_next_batch(self):
+        """Search the next batch of pages and highlight any new matches on screen."""
+        end = min(self._search_page + _SEARCH_PAGES_PER_BATCH, self.doc.page_count)
+        matched_pages = set()
         try:
-            for page_idx in range(self.doc.page_count):
-                page = self.doc.load_page(page_idx)
-                results = page.search_for(text, quads=True)
-                for quad in results:
+            for page_idx in range(self._search_page, end):
+                for quad in self.doc.load_page(page_idx).search_for(self.search_text_str, quads=True):
                     # Convert Quad to Rect for consistent rendering
-                    rect = fitz.Rect(quad.ul, quad.lr)
-                    print(f"Converted Quad to Rect on page {page_idx + 1}: {rect}")
-                    self.search_results.append(SearchResult(page_idx, rect))
+                    self.search_results.append(SearchResult(page_idx, fitz.Rect(quad.ul, quad.lr)))
+                    matched_pages.add(page_idx)
         except Exception as e:
             print(f"Error searching text: {e}")
-            return 0
+            end = self.doc.page_count
+        self._search_page = end
+        finished = end >= self.doc.page_count
+        if finished:
+            self._search_timer.stop()
+        if matched_pages:
+            self._redraw_pages(matched_pages)
+        self.search_progress.emit(len(self.search_results), finished)
 
-        self._redraw_visible_pages()
-        print(f"Search found {len(self.search_results)} results for '{text}'")
+    def search_text(self, text):
+        """Search the whole document for text before returning the number of results."""
+        self.start_search(text)
+        while self._search_timer.isActive():
+            self._search_next_batch()
         return len(self.search_results)
 
     def navigate_search(self, forward=True):
         """Navigate to the next or previous search result."""
         if not self.search_results:
-            print("No search results to navigate")
+            logger.debug("No search results to navigate")
             return
         try:
             self.current_search_index = (self.current_search_index + (1 if forward else -1)) % len(self.search_results)
             result = self.search_results[self.current_search_index]
             self.jump_to_page(result.page)
             self._redraw_visible_pages()
-            print(f"Navigated to search result {self.current_search_index + 1}/{len(self.search_results)} on page {result.page + 1}")
+            logger.debug(
+                "Navigated to search result %d/%d on page %d",
+                self.current_search_index + 1, len(self.search_results), result.page + 1
+            )
         except Exception as e:
             print(f"Error navigating search: {e}")
 
@@ -360,9 +467,13 @@ class PDFViewer(QWidget):
         except Exception as e:
             print(f"Error redrawing visible pages: {e}")
 
-    def load_pdf(self, file_path):
-        """Load a PDF file for viewing with comprehensive error handling."""
+    def load_pdf(self, file_path, doc_key=None):
+        """Load a PDF file for viewing with comprehensive error handling.
+
+        doc_key is the file's page cache key, if the caller has already computed it.
+        """
         self.file_path = file_path
+        self.file_name = os.path.basename(file_path) if file_path else None
         
         # Validate file path
         if not file_path or not os.path.exists(file_path):
@@ -385,8 +496,11 @@ class PDFViewer(QWidget):
             pass  # File size check failed, continue anyway
         
         try:
+            self._release_document()
             # Attempt to open the PDF
             self.doc = fitz.open(file_path)
+            if self.page_cache:
+                self._document_key = doc_key or document_key(file_path)
             
             # Validate PDF content
             if self.doc.page_count == 0:
@@ -400,16 +514,19 @@ class PDFViewer(QWidget):
                     return False
             
             # Initialize page structures
-            self._page_labels_continuous = [None] * self.doc.page_count
+            self.page_count = self.doc.page_count
+            self._page_labels_continuous = [None] * self.page_count
+            self._page_bounds = [None] * self.page_count
+            self.current_page = 0
+            self._last_rendered_page = None
             self._setup_annotation_event_filters()
             
             # Set default view mode
             self.set_view_mode(ViewMode.SINGLE_PAGE, force_setup=True)
             
-            # Test text extraction on first page for search functionality
-            text = self.extract_page_text(0)
-            if self._debug_mode:
-                print(f"Sample text from page 1: {text[:100] + '...' if len(text) > 100 else text}")
+            # Check text extraction on the first page only when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                self.extract_page_text(0)
             
             # Emit success signal
             self.current_page_changed.emit(self.current_page)
@@ -482,6 +599,23 @@ class PDFViewer(QWidget):
         # Show message box for critical errors
         QMessageBox.critical(self, title, message)
     
+    def cleanup(self):
+        """Release the document and cached page data before the viewer is deleted."""
+        try:
+            self.scroll_area.viewport().removeEventFilter(self)
+            self.single_double_canvas.removeEventFilter(self)
+            self.continuous_page_container.removeEventFilter(self)
+            self._clear_continuous_view()
+            self.search_results = []
+            self.current_selection = None
+            self.annotations_by_page.clear()
+            # The canvas still holds the last rendered page until the widget is destroyed
+            self.single_double_canvas.clear()
+            # Free MuPDF resources now instead of when the wrapper is collected
+            self._release_document()
+        except Exception as e:
+            print(f"Error cleaning up viewer: {e}")
+
     def _setup_annotation_event_filters(self):
         """Set up event filters for annotation handling."""
         try:
@@ -499,6 +633,7 @@ class PDFViewer(QWidget):
                     item.widget().deleteLater()
             self._page_widgets = []
             self._page_geometries = []
+            self._page_tops = []
         except Exception as e:
             print(f"Error clearing continuous view: {e}")
 
@@ -512,33 +647,24 @@ class PDFViewer(QWidget):
             return
 
         try:
-            viewport_rect = self.scroll_area.viewport().rect()
-            visible_pages = set()
-            current_y = self.continuous_page_layout.contentsMargins().top()
-
-            for i in range(self.doc.page_count):
-                page_height = self._page_geometries[i].height()
-                spacing = self.continuous_page_layout.spacing()
-                page_top = current_y
-                page_bottom = current_y + page_height
-
-                if (
-                    page_bottom
-                    >= self.scroll_area.verticalScrollBar().value() - viewport_rect.height()
-                    and page_top
-                    <= self.scroll_area.verticalScrollBar().value()
-                    + viewport_rect.height() * 2
-                ):
-                    visible_pages.add(i)
-
-                current_y += page_height + spacing
-
-            for i in sorted(list(visible_pages)):
+            viewport_height = self.scroll_area.viewport().height()
+            scroll_value = self.scroll_area.verticalScrollBar().value()
+            window_top = scroll_value - viewport_height
+            window_bottom = scroll_value + viewport_height * 2
+
+            # Page tops are sorted, so the pages overlapping the window are found by bisection
+            first = max(0, bisect.bisect_right(self._page_tops, window_top) - 1)
+            if self._page_tops[first] + self._page_geometries[first].height() < window_top:
+                first += 1
+            last = bisect.bisect_right(self._page_tops, window_bottom) - 1
+            visible_pages = range(first, last + 1)
+
+            for i in visible_pages:
                 if self._page_widgets[i] is None:
                     self._inflate_page(i)
 
-            for i in range(self.doc.page_count):
-                if i not in visible_pages and self._page_widgets[i] is not None:
+            for i, widget in enumerate(self._page_widgets):
+                if widget is not None and i not in visible_pages:
                     self._deflate_page(i)
 
             self._update_current_page_in_scroll_view()
@@ -560,13 +686,7 @@ class PDFViewer(QWidget):
             page_label.setFixedSize(size)
             page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             
-            page = self.doc.load_page(page_idx)
-            mat = fitz.Matrix(self._continuous_render_zoom, self._continuous_render_zoom)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            img = QImage(
-                pix.samples, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888
-            )
-            pixmap = QPixmap.fromImage(img)
+            pixmap = self._page_pixmap(page_idx, self._continuous_render_zoom)
             
             painter = QPainter(pixmap)
             self._draw_annotations(painter, page_idx, False, None)
@@ -624,15 +744,15 @@ class PDFViewer(QWidget):
                 self.scroll_area.verticalScrollBar().value()
                 + self.scroll_area.viewport().height() / 2
             )
-            current_y = self.continuous_page_layout.contentsMargins().top()
-            best_page_idx = 0
-
-            for i in range(self.doc.page_count):
-                page_height = self._page_geometries[i].height()
-                if current_y + page_height / 2 > viewport_center:
-                    break
-                best_page_idx = i
-                current_y += page_height + self.continuous_page_layout.spacing()
+            # The last page whose middle is above the viewport center
+            best_page_idx = bisect.bisect_right(self._page_tops, viewport_center) - 1
+            if (
+                best_page_idx >= 0
+                and self._page_tops[best_page_idx]
+                + self._page_geometries[best_page_idx].height() / 2 > viewport_center
+            ):
+                best_page_idx -= 1
+            best_page_idx = max(0, best_page_idx)
 
             if self.current_page != best_page_idx:
                 old_page = self.current_page
@@ -655,7 +775,7 @@ class PDFViewer(QWidget):
             QApplication.processEvents()
             vp_width = self.scroll_area.viewport().width()
             if vp_width > 20:
-                sample_page_rect = self.doc.load_page(self.current_page).bound()
+                sample_page_rect = self._page_bound(self.current_page)
                 if sample_page_rect.width > 0:
                     margins = self.continuous_page_layout.contentsMargins()
                     available_width = (
@@ -669,21 +789,30 @@ class PDFViewer(QWidget):
             # Emit zoom change signal
             self.zoom_changed.emit(self.zoom_factor)
 
-            for i in range(self.doc.page_count):
-                page_rect = self.doc.load_page(i).bound()
-                width = int(page_rect.width * self._continuous_render_zoom)
-                height = int(page_rect.height * self._continuous_render_zoom)
-                self._page_geometries.append(QSize(width, height))
-                self._page_widgets.append(None)
-
-                spacer = QSpacerItem(
-                    width, height, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
-                )
-                self.continuous_page_layout.addSpacerItem(spacer)            # Process events to ensure layout is updated before jumping to page
+            # Add one placeholder per page without repainting the container in between
+            self.continuous_page_container.setUpdatesEnabled(False)
+            try:
+                page_top = self.continuous_page_layout.contentsMargins().top()
+                spacing = self.continuous_page_layout.spacing()
+                for i in range(self.doc.page_count):
+                    page_rect = self._page_bound(i)
+                    width = int(page_rect.width * self._continuous_render_zoom)
+                    height = int(page_rect.height * self._continuous_render_zoom)
+                    self._page_geometries.append(QSize(width, height))
+                    self._page_tops.append(page_top)
+                    self._page_widgets.append(None)
+                    page_top += height + spacing
+
+                    spacer = QSpacerItem(
+                        width, height, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
+                    )
+                    self.continuous_page_layout.addSpacerItem(spacer)
+            finally:
+                self.continuous_page_container.setUpdatesEnabled(True)
+            # Process events to ensure layout is updated before jumping to page
             QApplication.processEvents()
 
             # Use a timer to delay the jump until the layout is fully processed
-            from PyQt6.QtCore import QTimer
             def delayed_jump():
                 self.jump_to_page(self.current_page)
             
@@ -691,6 +820,150 @@ class PDFViewer(QWidget):
         except Exception as e:
             print(f"Error setting up continuous view: {e}")
 
+    def _apply_viewport_resize(self):
+        """Update the view for the settled viewport size."""
+        if not self.doc:
+            return
+        if self.view_mode == ViewMode.CONTINUOUS_SCROLL:
+            self._update_visible_pages()
+            return
+        if self.view_mode not in _FIT_MODES:
+            return
+        # A resize that ends where it started needs no new rasterization
+        vp_size = self.scroll_area.viewport().size()
+        fitted = self._fitted_viewport_size
+        if fitted is not None and fitted[0] == self.view_mode and (
+            vp_size == fitted[1]
+            if self.view_mode == ViewMode.FIT_PAGE
+            else vp_size.width() == fitted[1].width()
+        ):
+            return
+        self.render_page_with_annotations()
+
+    def _release_document(self):
+        """Hand pending pages to the encoder and stop idle work, then close the document.
+
+        PyMuPDF is not thread-safe, so all rendering stays on the GUI thread;
+        the encoder only sees copied samples, so it may outlive the document.
+        """
+        self._prefetch_timer.stop()
+        self._search_timer.stop()
+        if self.doc is None:
+            return
+        self._store_rendered_pages()
+        self._clear_page_pixmap_cache()
+        # Per-page state refers to the old document's pages and widgets
+        self._page_bounds = []
+        self._page_labels_continuous = []
+        self._document_key = None
+        self.doc.close()
+        self.doc = None
+        self.page_count = 0
+
+    def _page_bound(self, page_idx):
+        """Get a page's rectangle without reloading the page after the first call."""
+        bound = self._page_bounds[page_idx]
+        if bound is None:
+            bound = self._page_bounds[page_idx] = self.doc.load_page(page_idx).bound()
+        return bound
+
+    def _page_pixmap(self, page_idx, zoom):
+        """Rasterize a page at the given zoom, reusing recently rendered pages.
+
+        Returns a copy, so callers can paint overlays without touching the cache.
+        """
+        key = (page_idx, round(zoom, 4))
+        pixmap = self._page_pixmap_cache.get(key)
+        if pixmap is None:
+            pixmap = self._load_stored_page(key)
+            if pixmap is None:
+                mat = fitz.Matrix(zoom, zoom)
+                started = time.perf_counter()
+                pix = self.doc.load_page(page_idx).get_pixmap(matrix=mat, alpha=False)
+                render_seconds = time.perf_counter() - started
+                samples = pix.samples
+                img = QImage(samples, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888)
+                pixmap = QPixmap.fromImage(img)
+                if self._document_key and render_seconds >= _PERSIST_MIN_RENDER_SECONDS:
+                    self._queue_unsaved_page(key, (pix.width, pix.height, pix.stride, samples))
+            self._page_pixmap_cache[key] = pixmap
+            self._page_pixmap_cache_bytes += self._pixmap_bytes(pixmap)
+            # Evict least recently used pages, but always keep the one just rendered
+            while self._page_pixmap_cache_bytes > _PAGE_PIXMAP_CACHE_BYTES and len(self._page_pixmap_cache) > 1:
+                _, evicted = self._page_pixmap_cache.popitem(last=False)
+                self._page_pixmap_cache_bytes -= self._pixmap_bytes(evicted)
+        else:
+            self._page_pixmap_cache.move_to_end(key)
+        return QPixmap(pixmap)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        """Approximate memory used by a pixmap."""
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def _clear_page_pixmap_cache(self):
+        """Drop all rasterized pages."""
+        self._page_pixmap_cache.clear()
+        self._page_pixmap_cache_bytes = 0
+
+    def _load_stored_page(self, key):
+        """Decode a page rendered in an earlier session, or return None."""
+        if not self._document_key:
+            return None
+        data = self.page_cache.get(self._document_key, *key)
+        if data is None:
+            return None
+        decoded = decode_page_samples(data)
+        if decoded is None:
+            return None  # Entries in any other format, such as images from older versions, are re-rendered
+        width, height, stride, samples = decoded
+        return QPixmap.fromImage(QImage(samples, width, height, stride, QImage.Format.Format_RGB888))
+
+    def _queue_unsaved_page(self, key, samples):
+        """Remember an expensive page's samples until the store timer persists them."""
+        self._unsaved_pages[key] = samples
+        self._unsaved_pages.move_to_end(key)
+        while len(self._unsaved_pages) > _MAX_UNSAVED_PAGES:
+            self._unsaved_pages.popitem(last=False)
+        self._store_timer.start()
+
+    def _store_rendered_pages(self):
+        """Hand pages waiting for the persistent page cache to an encoder on the thread pool.
+
+        Compression never runs on the GUI thread; the encoded pages come back through
+        a queued signal and are written by the page cache in one transaction.
+        """
+        self._store_timer.stop()
+        if not self._unsaved_pages:
+            return
+        encoder = PageEncoder(self._document_key, list(self._unsaved_pages.items()))
+        encoder.signals.pages_encoded.connect(self.page_cache.put_many)
+        self._unsaved_pages.clear()
+        QThreadPool.globalInstance().start(encoder)
+
+    def _schedule_prefetch(self, zoom):
+        """Queue rasterizing the pages the reader is likely to flip to next."""
+        if self._last_rendered_page is not None and self.current_page < self._last_rendered_page:
+            self._prefetch_direction = -1
+        elif self._last_rendered_page is not None and self.current_page > self._last_rendered_page:
+            self._prefetch_direction = 1
+        self._last_rendered_page = self.current_page
+        self._prefetch_zoom = zoom
+        self._prefetch_timer.start()
+
+    def _prefetch_neighbor_pages(self):
+        """Rasterize the next spread in the current reading direction into the page cache."""
+        if not self.doc or self.view_mode == ViewMode.CONTINUOUS_SCROLL:
+            return
+        step = 2 if self.view_mode == ViewMode.DOUBLE_PAGE else 1
+        first = self.current_page + step * self._prefetch_direction
+        try:
+            for page_idx in range(first, first + step):
+                if 0 <= page_idx < self.doc.page_count:
+                    self._page_pixmap(page_idx, self._prefetch_zoom)
+        except Exception as e:
+            print(f"Error prefetching pages: {e}")
+
     def render_page(self):
         """Render the current page(s) for single and double page modes."""
         if not self.doc:
@@ -704,8 +977,7 @@ class PDFViewer(QWidget):
                 return
 
             self.view_stack.setCurrentWidget(self.single_double_canvas)
-            page_left = self.doc.load_page(self.current_page)
-            page_rect_left = page_left.bound()
+            page_rect_left = self._page_bound(self.current_page)
             vp_width = self.scroll_area.viewport().width()
             vp_height = self.scroll_area.viewport().height()
             current_render_zoom = self.zoom_factor
@@ -713,14 +985,6 @@ class PDFViewer(QWidget):
             if self.view_mode == ViewMode.FIT_PAGE:
                 target_width = page_rect_left.width
                 target_height = page_rect_left.height
-                if (
-                    self.view_mode == ViewMode.DOUBLE_PAGE
-                    and self.current_page + 1 < self.doc.page_count
-                ):
-                    page_rect_right = self.doc.load_page(self.current_page + 1).bound()
-                    target_width = page_rect_left.width + page_rect_right.width
-                    target_height = max(page_rect_left.height, page_rect_right.height)
-
                 if (
                     vp_width > 0
                     and vp_height > 0
@@ -733,44 +997,30 @@ class PDFViewer(QWidget):
                 else:
                     current_render_zoom = 1.0
                 self._last_auto_zoom_level = current_render_zoom
+                self._fitted_viewport_size = (self.view_mode, QSize(vp_width, vp_height))
                 # Emit zoom signal if zoom factor changed
                 if abs(current_render_zoom - self.zoom_factor) > 0.001:
                     self.zoom_changed.emit(current_render_zoom)
             elif self.view_mode == ViewMode.FIT_WIDTH:
                 target_width = page_rect_left.width
-                if (
-                    self.view_mode == ViewMode.DOUBLE_PAGE
-                    and self.current_page + 1 < self.doc.page_count
-                ):
-                    page_rect_right = self.doc.load_page(self.current_page + 1).bound()
-                    target_width = page_rect_left.width + page_rect_right.width
-
                 if vp_width > 0 and target_width > 0:
                     current_render_zoom = vp_width / target_width
                 else:
                     current_render_zoom = 1.0
                 self._last_auto_zoom_level = current_render_zoom
+                self._fitted_viewport_size = (self.view_mode, QSize(vp_width, vp_height))
                 # Emit zoom signal if zoom factor changed
                 if abs(current_render_zoom - self.zoom_factor) > 0.001:
                     self.zoom_changed.emit(current_render_zoom)
                 
-            mat = fitz.Matrix(current_render_zoom, current_render_zoom)
-            pix_left = self.doc.load_page(self.current_page).get_pixmap(
-                matrix=mat, alpha=False
-            )
-            final_pixmap = QPixmap()
+            final_pixmap = self._page_pixmap(self.current_page, current_render_zoom)
             
             if (
                 self.view_mode == ViewMode.DOUBLE_PAGE
                 and self.current_page + 1 < self.doc.page_count
             ):
-                pix_right = self.doc.load_page(self.current_page + 1).get_pixmap(
-                    matrix=mat, alpha=False
-                )
-                img_left_q = QPixmap()
-                img_left_q.loadFromData(pix_left.tobytes("ppm"))
-                img_right_q = QPixmap()
-                img_right_q.loadFromData(pix_right.tobytes("ppm"))
+                img_left_q = final_pixmap
+                img_right_q = self._page_pixmap(self.current_page + 1, current_render_zoom)
                 final_pixmap = QPixmap(
                     img_left_q.width() + img_right_q.width(),
                     max(img_left_q.height(), img_right_q.height()),
@@ -780,11 +1030,10 @@ class PDFViewer(QWidget):
                 painter.drawPixmap(0, 0, img_left_q)
                 painter.drawPixmap(img_left_q.width(), 0, img_right_q)
                 painter.end()
-            else:
-                final_pixmap.loadFromData(pix_left.tobytes("ppm"))
                 
             self.single_double_canvas.setPixmap(final_pixmap)
             self.single_double_canvas.adjustSize()
+            self._schedule_prefetch(current_render_zoom)
         except Exception as e:
             print(f"Error rendering page: {e}")
     
@@ -844,7 +1093,7 @@ class PDFViewer(QWidget):
                 self.update()
                 QApplication.processEvents()
 
-            print(f"DEBUG: View mode switch complete, final page: {self.current_page}")
+            logger.debug("View mode switch complete, final page: %d", self.current_page)
             self.view_mode_changed.emit(self.view_mode)
         except Exception as e:
             print(f"Error setting view mode: {e}")
@@ -855,7 +1104,7 @@ class PDFViewer(QWidget):
             return
 
         try:
-            if self.view_mode in [ViewMode.FIT_PAGE, ViewMode.FIT_WIDTH]:
+            if self.view_mode in _FIT_MODES:
                 self.zoom_factor = self._last_auto_zoom_level
 
             self.zoom_factor *= 1.2
@@ -880,7 +1129,7 @@ class PDFViewer(QWidget):
             return
 
         try:
-            if self.view_mode in [ViewMode.FIT_PAGE, ViewMode.FIT_WIDTH]:
+            if self.view_mode in _FIT_MODES:
                 self.zoom_factor = self._last_auto_zoom_level
 
             self.zoom_factor /= 1.2
@@ -911,7 +1160,7 @@ class PDFViewer(QWidget):
             self.zoom_factor = DEFAULT_ZOOM_FACTOR
             
             # Switch out of automatic fit modes to manual zoom
-            if self.view_mode in [ViewMode.FIT_PAGE, ViewMode.FIT_WIDTH]:
+            if self.view_mode in _FIT_MODES:
                 self._set_view_mode_internal(ViewMode.SINGLE_PAGE)
             
             # Re-render based on current view mode
@@ -940,7 +1189,6 @@ class PDFViewer(QWidget):
                     self.current_page_changed_in_continuous_scroll.emit(self.current_page)
                 else:
                     self.render_page_with_annotations()
-                    self.current_page_changed.emit(self.current_page)
             elif (
                 self.view_mode == ViewMode.DOUBLE_PAGE
                 and self.current_page == self.doc.page_count - 2
@@ -948,7 +1196,6 @@ class PDFViewer(QWidget):
             ):
                 self.current_page += 1
                 self.render_page_with_annotations()
-                self.current_page_changed.emit(self.current_page)
             elif (
                 self.view_mode != ViewMode.DOUBLE_PAGE
                 and self.current_page < self.doc.page_count - 1
@@ -959,9 +1206,8 @@ class PDFViewer(QWidget):
                     self.current_page_changed_in_continuous_scroll.emit(self.current_page)
                 else:
                     self.render_page_with_annotations()
-                    self.current_page_changed.emit(self.current_page)
             
-            # Emit general page change signal if page actually changed
+            # Emitted once here for every branch, only if the page actually changed
             if old_page != self.current_page:
                 self.current_page_changed.emit(self.current_page)
                 
@@ -985,15 +1231,16 @@ class PDFViewer(QWidget):
                     self.render_page_with_annotations()
             
             # Emit general page change signal if page actually changed
-            if old_page != self.current_page:                self.current_page_changed.emit(self.current_page)
+            if old_page != self.current_page:
+                self.current_page_changed.emit(self.current_page)
                 
         except Exception as e:
             print(f"Error navigating to previous page: {e}")
 
     def _debug_print(self, message: str):
-        """Print debug message if debug mode is enabled."""
+        """Log a debug message if debug mode is enabled."""
         if self._debug_mode:
-            print(f"DEBUG: {message}")
+            logger.debug(message)
 
     def jump_to_page(self, page_num, force_scroll_continuous=True):
         """Jump to a specific page number."""
@@ -1010,12 +1257,10 @@ class PDFViewer(QWidget):
                 self._ignore_scroll_page_updates = True
                 self._debug_print("Setting _ignore_scroll_page_updates=True before scroll")
                 
-                target_y = self.continuous_page_layout.contentsMargins().top()
-                for i in range(page_num):
-                    target_y += (
-                        self._page_geometries[i].height()
-                        + self.continuous_page_layout.spacing()
-                    )
+                if page_num < len(self._page_tops):
+                    target_y = self._page_tops[page_num]
+                else:  # Placeholders not laid out yet
+                    target_y = self.continuous_page_layout.contentsMargins().top()
 
                 self._debug_print(f"Calculated target_y for page {page_num}: {target_y}")
                 self._debug_print(f"Current scroll position: {self.scroll_area.verticalScrollBar().value()}")
@@ -1030,7 +1275,6 @@ class PDFViewer(QWidget):
                 else:
                     # Layout not ready yet - use a multi-retry mechanism
                     self._debug_print("Scroll area not ready, scheduling retries")
-                    from PyQt6.QtCore import QTimer
                     retry_count = 0
                     max_retries = 5
                     
@@ -1051,7 +1295,6 @@ class PDFViewer(QWidget):
                     QTimer.singleShot(50, retry_scroll)
                 
                 # Clear the flag after a delay to allow scroll events to settle
-                from PyQt6.QtCore import QTimer
                 def clear_flag():
                     self._ignore_scroll_page_updates = False
                     self._debug_print("Cleared _ignore_scroll_page_updates flag")
@@ -1097,9 +1340,8 @@ class PDFViewer(QWidget):
             if not title:
                 title = f"Page {page_num + 1}"
                 
-            for bookmark in self._bookmarks:
-                if bookmark.page_number == page_num:
-                    return False
+            if page_num in self._bookmarks:
+                return False
                     
             from datetime import datetime
             bookmark = Bookmark(
@@ -1109,8 +1351,8 @@ class PDFViewer(QWidget):
                 created_at=datetime.now().isoformat()
             )
             
-            self._bookmarks.append(bookmark)
-            self._bookmarks.sort(key=lambda b: b.page_number)
+            self._bookmarks[page_num] = bookmark
+            self._bookmarks = dict(sorted(self._bookmarks.items()))
             
             self.bookmarks_changed.emit()
             return True
@@ -1118,23 +1360,17 @@ class PDFViewer(QWidget):
             print(f"Error adding bookmark: {e}")
             return False
     
-    def remove_bookmark(self, page_number: int) -> bool:
-        """Remove a bookmark for a page."""
-        try:
-            for i, bookmark in enumerate(self._bookmarks):
-                if bookmark.page_number == page_number:
-                    del self._bookmarks[i]
-                    self.bookmarks_changed.emit()
-                    return True
-            return False
-        except Exception as e:
-            print(f"Error removing bookmark: {e}")
-            return False
+    def remove_bookmark(self, page_number: int) -> Optional[Bookmark]:
+        """Remove the bookmark for a page and return it, or None if there was none."""
+        bookmark = self._bookmarks.pop(page_number, None)
+        if bookmark is not None:
+            self.bookmarks_changed.emit()
+        return bookmark
     
     def get_bookmarks(self) -> list[Bookmark]:
         """Get all bookmarks."""
         try:
-            return self._bookmarks.copy()
+            return list(self._bookmarks.values())
         except Exception as e:
             print(f"Error getting bookmarks: {e}")
             return []
@@ -1142,7 +1378,7 @@ class PDFViewer(QWidget):
     def has_bookmark(self, page_number: int) -> bool:
         """Check if a page has a bookmark."""
         try:
-            return any(b.page_number == page_number for b in self._bookmarks)
+            return page_number in self._bookmarks
         except Exception as e:
             print(f"Error checking bookmark: {e}")
             return False
@@ -1170,6 +1406,25 @@ class PDFViewer(QWidget):
         except Exception as e:
             print(f"Error redrawing all pages: {e}")
 
+    def _redraw_pages(self, page_indices):
+        """Redraw only the given pages that are currently on screen."""
+        if not self.doc:
+            return
+            
+        try:
+            if self.view_mode == ViewMode.CONTINUOUS_SCROLL:
+                for i in page_indices:
+                    if 0 <= i < len(self._page_widgets) and self._page_widgets[i] is not None:
+                        self._render_page_with_annotations(i)
+            else:
+                shown = {self.current_page}
+                if self.view_mode == ViewMode.DOUBLE_PAGE:
+                    shown.add(self.current_page + 1)
+                if not shown.isdisjoint(page_indices):
+                    self.render_page_with_annotations()
+        except Exception as e:
+            print(f"Error redrawing pages: {e}")
+
     def _redraw_page(self, page_idx, preview=False, preview_end=None):
         """Redraw a specific page."""
         if not self.doc or page_idx < 0 or page_idx >= self.doc.page_count:
@@ -1196,7 +1451,7 @@ class PDFViewer(QWidget):
             self._draw_annotations(painter, self.current_page, preview, preview_end)
             self._draw_text_operations(painter, self.current_page)
             if self.view_mode == ViewMode.DOUBLE_PAGE and self.current_page + 1 < self.doc.page_count:
-                offset_x = int(self.doc.load_page(self.current_page).bound().width * self.zoom_factor)
+                offset_x = int(self._page_bound(self.current_page).width * self.zoom_factor)
                 painter.translate(offset_x, 0)
                 self._draw_annotations(painter, self.current_page + 1, preview, preview_end)
                 self._draw_text_operations(painter, self.current_page + 1)
@@ -1211,11 +1466,7 @@ class PDFViewer(QWidget):
             return
             
         try:
-            page = self.doc.load_page(page_idx)
-            mat = fitz.Matrix(self._continuous_render_zoom, self._continuous_render_zoom)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(img)
+            pixmap = self._page_pixmap(page_idx, self._continuous_render_zoom)
             
             painter = QPainter(pixmap)
             self._draw_annotations(painter, page_idx, preview, preview_end)
@@ -1232,10 +1483,7 @@ class PDFViewer(QWidget):
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             current_zoom = self._continuous_render_zoom if self.view_mode == ViewMode.CONTINUOUS_SCROLL else self.zoom_factor
             
-            for ann in self.annotations:
-                if ann.page != page_idx:
-                    continue
-                    
+            for ann in self.annotations_by_page.get(page_idx, ()):
                 scaled_start = QPoint(
                     int(ann.start.x() * current_zoom),
                     int(ann.start.y() * current_zoom)
@@ -1301,7 +1549,7 @@ class PDFViewer(QWidget):
                         int(result.rect.height * current_zoom)
                     )
                     painter.drawRect(rect)
-                    print(f"Drawing yellow search result {i + 1} on page {page_idx + 1}: {rect}")
+                    logger.debug("Drawing yellow search result %d on page %d: %s", i + 1, page_idx + 1, rect)
 
             # Draw current search result with blue highlight
             if self.current_search_index >= 0 and self.current_search_index < len(self.search_results):
@@ -1316,7 +1564,7 @@ class PDFViewer(QWidget):
                         int(result.rect.height * current_zoom)
                     )
                     painter.drawRect(rect)
-                    print(f"Drawing blue search result {self.current_search_index + 1} on page {page_idx + 1}: {rect}")
+                    logger.debug("Drawing blue search result %d on page %d: %s", self.current_search_index + 1, page_idx + 1, rect)
 
             # Draw text selection with blue highlight
             if self.current_selection and self.current_selection.page == page_idx:
@@ -1329,7 +1577,7 @@ class PDFViewer(QWidget):
                     int((self.current_selection.end.y() - self.current_selection.start.y()) * current_zoom)
                 )
                 painter.drawRect(rect)
-                print(f"Drawing text selection on page {page_idx + 1}: {rect}")
+                logger.debug("Drawing text selection on page %d: %s", page_idx + 1, rect)
         except Exception as e:
             print(f"Error drawing text operations on page {page_idx + 1}: {e}")
 
@@ -1340,7 +1588,7 @@ class PDFViewer(QWidget):
             if source in (self.single_double_canvas, *self._page_widgets):
                 pixmap = source.pixmap()
                 if not pixmap or pixmap.isNull():
-                    print("No valid pixmap for PDF position")
+                    logger.debug("No valid pixmap for PDF position")
                     return widget_pos
                 label_size = source.size()
                 pixmap_size = pixmap.size()
@@ -1349,12 +1597,12 @@ class PDFViewer(QWidget):
                 adjusted_x = widget_pos.x() - offset_x
                 adjusted_y = widget_pos.y() - offset_y
                 if not (0 <= adjusted_x < pixmap_size.width() and 0 <= adjusted_y < pixmap_size.height()):
-                    print(f"Position outside pixmap: adjusted=({adjusted_x}, {adjusted_y}), pixmap=({pixmap_size.width()}, {pixmap_size.height()})")
+                    logger.debug("Position outside pixmap: adjusted=(%s, %s), pixmap=%s", adjusted_x, adjusted_y, pixmap_size)
                     return widget_pos
                 pdf_x = adjusted_x / current_zoom
                 pdf_y = adjusted_y / current_zoom
                 return QPoint(int(pdf_x), int(pdf_y))
-            print(f"Invalid source for PDF position: {source}")
+            logger.debug("Invalid source for PDF position: %s", source)
             return widget_pos
         except Exception as e:
             print(f"Error getting PDF position: {e}")
@@ -1371,30 +1619,28 @@ class PDFViewer(QWidget):
             
             pdf_pos = self._get_pdf_position(source, pos)
             
-            clicked_annotations = []
-            for i, ann in enumerate(self.annotations):
-                if ann.page == page_idx:
-                    if self._is_point_in_annotation(pdf_pos, ann):
-                        clicked_annotations.append((i, ann))
+            clicked_annotations = [
+                ann for ann in self.annotations_by_page.get(page_idx, ())
+                if self._is_point_in_annotation(pdf_pos, ann)
+            ]
             
             if clicked_annotations:
                 menu = QMenu(self)
-                if len(clicked_annotations) == 1:
-                    i, ann = clicked_annotations[0]
+                for ann in clicked_annotations:
                     action = menu.addAction(f"Delete {ann.type.name.lower()} annotation")
-                    action.triggered.connect(lambda checked: self._delete_annotation(i))
-                else:
-                    for i, ann in enumerate(clicked_annotations):
-                        action = menu.addAction(f"Delete {ann.type.name.lower()} annotation")
-                        action.triggered.connect(lambda checked, idx=i: self._delete_annotation(idx))
+                    action.triggered.connect(lambda checked, a=ann: self._delete_annotation(a))
+                if len(clicked_annotations) > 1:
                     menu.addSeparator()
                     delete_all_action = menu.addAction("Delete all annotations here")
                     delete_all_action.triggered.connect(
-                        lambda checked: self._delete_multiple_annotations([i for i, _ in clicked_annotations])
+                        lambda checked: self._delete_multiple_annotations(clicked_annotations)
                     )
                 
                 global_pos = source.mapToGlobal(pos)
                 menu.exec(global_pos)
+                # The menu is parented to the viewer, so release it and its
+                # connected actions instead of keeping one per right-click
+                menu.deleteLater()
         except Exception as e:
             print(f"Error handling annotation right-click: {e}")
     
@@ -1426,25 +1672,72 @@ class PDFViewer(QWidget):
             print(f"Error checking point in annotation: {e}")
             return False
     
-    def _delete_annotation(self, annotation_index):
+    @property
+    def annotations(self) -> list[Annotation]:
+        """All annotations in the document, ordered by page."""
+        return list(itertools.chain.from_iterable(
+            self.annotations_by_page[page] for page in sorted(self.annotations_by_page)
+        ))
+    
+    def add_annotation(self, annotation: Annotation):
+        """Store an annotation under its page."""
+        self.annotations_by_page[annotation.page].append(annotation)
+    
+    def clear_page_annotations(self, page_idx: int) -> int:
+        """Remove all annotations on a page and return how many were removed."""
+        return len(self.annotations_by_page.pop(page_idx, ()))
+    
+    def clear_annotations(self) -> list[int]:
+        """Remove all annotations in the document and return the pages that had any."""
+        pages = list(self.annotations_by_page)
+        self.annotations_by_page.clear()
+        return pages
+    
+    def _remove_annotation(self, annotation) -> bool:
+        """Remove one annotation from its page bucket."""
+        page_annotations = self.annotations_by_page.get(annotation.page)
+        if not page_annotations:
+            return False
+        for i, ann in enumerate(page_annotations):
+            if ann is annotation:
+                del page_annotations[i]
+                break
+        else:
+            return False
+        if not page_annotations:
+            del self.annotations_by_page[annotation.page]
+        return True
+    
+    def _delete_annotation(self, annotation):
         """Delete a specific annotation."""
         try:
-            if 0 <= annotation_index < len(self.annotations):
-                deleted_ann = self.annotations.pop(annotation_index)
-                self._redraw_page(deleted_ann.page)
-                print(f"Deleted {deleted_ann.type.name.lower()} annotation on page {deleted_ann.page + 1}")
+            if self._remove_annotation(annotation):
+                self._redraw_page(annotation.page)
+                logger.debug("Deleted %s annotation on page %d", annotation.type.name.lower(), annotation.page + 1)
         except Exception as e:
             print(f"Error deleting annotation: {e}")
     
-    def _delete_multiple_annotations(self, annotation_indices):
+    def _delete_multiple_annotations(self, annotations):
         """Delete multiple annotations."""
         try:
-            affected_pages = set()
-            for idx in sorted(annotation_indices, reverse=True):
-                if 0 <= idx < len(self.annotations):
-                    deleted_ann = self.annotations.pop(idx)
-                    affected_pages.add(deleted_ann.page)
-                    print(f"Deleted {deleted_ann.type.name.lower()} annotation on page {deleted_ann.page + 1}")
+            # One pass over each affected page bucket instead of one scan per annotation
+            doomed_by_page = defaultdict(set)
+            for ann in annotations:
+                doomed_by_page[ann.page].add(id(ann))
+            
+            affected_pages = []
+            for page_idx, doomed in doomed_by_page.items():
+                page_annotations = self.annotations_by_page.get(page_idx)
+                if not page_annotations:
+                    continue
+                count = len(page_annotations)
+                page_annotations[:] = [ann for ann in page_annotations if id(ann) not in doomed]
+                if len(page_annotations) == count:
+                    continue
+                if not page_annotations:
+                    del self.annotations_by_page[page_idx]
+                affected_pages.append(page_idx)
+                logger.debug("Deleted %d annotation(s) on page %d", count - len(page_annotations), page_idx + 1)
             
             for page_idx in affected_pages:
                 self._redraw_page(page_idx)
@@ -1478,7 +1771,7 @@ class PDFViewer(QWidget):
                 self.current_search_index = -1
                 self.search_text_str = ""
                 self._redraw_visible_pages()
-            print(f"Annotation mode {'enabled' if self.annotation_mode_enabled else 'disabled'}")
+            logger.debug("Annotation mode %s", "enabled" if self.annotation_mode_enabled else "disabled")
             return self.annotation_mode_enabled
         except Exception as e:
             print(f"Error toggling annotation mode: {e}")
@@ -182,7 +182,7 @@ def get_application_stylesheet():
             background: #eee8e0;
         }
           /* List Views */
-        QListView, QListWidget {
+        QListView, QListWidget, QTreeView {
             background-color: #fefcf9;
             border: 1px solid #e6ddd4;
             border-radius: 6px;
@@ -191,19 +191,19 @@ def get_application_stylesheet():
             outline: none;
         }
         
-        QListView::item, QListWidget::item {
+        QListView::item, QListWidget::item, QTreeView::item {
             padding: 8px 12px;
             border-bottom: 1px solid #f2ede6;
             color: #5d564d;
         }
         
-        QListView::item:selected, QListWidget::item:selected {
+        QListView::item:selected, QListWidget::item:selected, QTreeView::item:selected {
             background: #e8dcc9;
             color: #8b7355;
             border-color: #d4c3a7;
         }
         
-        QListView::item:hover, QListWidget::item:hover {
+        QListView::item:hover, QListWidget::item:hover, QTreeView::item:hover {
             background: #faf8f3;
         }
           /* Menu Bar and Menus */
@@ -2,8 +2,22 @@
 Unit tests for core models and functionality.
 """
 
+import importlib
+import os
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
+
 from src.pdf_reader.core.models import ViewMode
+from src.pdf_reader.core.page_cache import (
+    PageCache, decode_page_samples, document_key, encode_page_samples
+)
+from src.pdf_reader.core.utils import format_file_size, validate_pdf_file
+
+# The package re-exports the global ``config`` instance under the same name as
+# the module, so fetch the module itself explicitly.
+config_module = importlib.import_module("src.pdf_reader.core.config")
 
 
 class TestViewMode(unittest.TestCase):
@@ -27,5 +41,229 @@ class TestViewMode(unittest.TestCase):
         self.assertEqual(sorted(modes), sorted(expected_modes))
 
 
+class TestFormatFileSize(unittest.TestCase):
+    """Test cases for format_file_size."""
+    
+    def test_zero_and_bytes(self):
+        """Test sizes below one kilobyte."""
+        self.assertEqual(format_file_size(0), "0 B")
+        self.assertEqual(format_file_size(1023), "1023.0 B")
+    
+    def test_unit_boundaries(self):
+        """Test that each power of 1024 moves to the next unit."""
+        self.assertEqual(format_file_size(1024), "1.0 KB")
+        self.assertEqual(format_file_size(1536), "1.5 KB")
+        self.assertEqual(format_file_size(1024 ** 2), "1.0 MB")
+        self.assertEqual(format_file_size(1024 ** 3), "1.0 GB")
+        self.assertEqual(format_file_size(1024 ** 4), "1.0 TB")
+    
+    def test_largest_unit_is_capped(self):
+        """Test that sizes beyond terabytes stay in TB."""
+        self.assertEqual(format_file_size(1024 ** 5), "1024.0 TB")
+
+
+class TestValidatePdfFile(unittest.TestCase):
+    """Test cases for validate_pdf_file."""
+    
+    def test_validate_pdf_file(self):
+        """Test extension and existence checks."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, "doc.PDF")
+            txt_path = os.path.join(tmp_dir, "doc.txt")
+            for path in (pdf_path, txt_path):
+                with open(path, "wb") as f:
+                    f.write(b"%PDF-1.4")
+            
+            self.assertTrue(validate_pdf_file(pdf_path))
+            self.assertFalse(validate_pdf_file(txt_path))
+            self.assertFalse(validate_pdf_file(os.path.join(tmp_dir, "missing.pdf")))
+            self.assertFalse(validate_pdf_file(tmp_dir))
+            self.assertFalse(validate_pdf_file(""))
+
+
+class TestConfig(unittest.TestCase):
+    """Test cases for Config recent-file and document tracking."""
+    
+    def setUp(self):
+        """Point the config at an empty temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        config_dir = Path(self.tmp_dir.name)
+        patcher = mock.patch.multiple(
+            config_module,
+            CONFIG_DIR=config_dir,
+            CONFIG_FILE=config_dir / "config.json",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.config = config_module.Config()
+    
+    def test_add_recent_file_moves_to_front(self):
+        """Test that re-adding a file moves it to the front without duplicates."""
+        self.config.add_recent_file("a.pdf")
+        self.config.add_recent_file("b.pdf")
+        self.config.add_recent_file("a.pdf")
+        self.assertEqual(self.config.get_recent_files(), ["a.pdf", "b.pdf"])
+        
+        # Re-adding the most recent file leaves the stored list untouched
+        stored = self.config.get_recent_files()
+        self.config.add_recent_file("a.pdf")
+        self.assertIs(self.config.get_recent_files(), stored)
+    
+    def test_remove_recent_file(self):
+        """Test that removing a recent file keeps the others in order."""
+        for name in ["a.pdf", "b.pdf", "c.pdf"]:
+            self.config.add_recent_file(name)
+        self.config.remove_recent_file("b.pdf")
+        self.config.remove_recent_file("missing.pdf")
+        self.assertEqual(self.config.get_recent_files(), ["c.pdf", "a.pdf"])
+    
+    def test_add_recent_file_limit(self):
+        """Test that the recent files list is capped at max_recent."""
+        self.config.set('files.max_recent', 3)
+        for name in ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]:
+            self.config.add_recent_file(name)
+        self.assertEqual(self.config.get_recent_files(), ["d.pdf", "c.pdf", "b.pdf"])
+    
+    def test_recent_documents_order_and_removal(self):
+        """Test recent document ordering, update and removal."""
+        self.config.update_document_progress("a.pdf", 0, 10)
+        self.config.update_document_progress("b.pdf", 4, 10)
+        self.config.update_document_progress("a.pdf", 5, 10)
+        docs = self.config.get_recent_documents()
+        self.assertEqual([doc["file_path"] for doc in docs], ["a.pdf", "b.pdf"])
+        self.assertEqual(docs[0]["last_page"], 5)
+        self.assertIs(self.config.get_recent_document("a.pdf"), docs[0])
+        self.assertEqual(self.config.get_last_page("a.pdf"), 5)
+        
+        self.config.remove_document_from_history("a.pdf")
+        docs = self.config.get_recent_documents()
+        self.assertEqual([doc["file_path"] for doc in docs], ["b.pdf"])
+        self.assertIsNone(self.config.get_recent_document("a.pdf"))
+        self.assertEqual(self.config.get_last_page("a.pdf"), 0)
+    
+    def test_record_page_is_applied_on_commit(self):
+        """Test that recorded pages only reach the history on commit."""
+        self.config.update_document_progress("a.pdf", 0, 10)
+        self.config.record_page("a.pdf", 3, 10)
+        self.config.record_page("a.pdf", 4, 10)
+        self.assertEqual(self.config.get_last_page("a.pdf"), 0)
+        
+        self.assertTrue(self.config.commit_progress())
+        self.assertEqual(self.config.get_last_page("a.pdf"), 4)
+        self.assertEqual(self.config.get_recent_documents()[0]["last_page"], 4)
+        self.assertFalse(self.config.commit_progress())
+    
+    def test_save_and_load_round_trip(self):
+        """Test that saved recent files are restored by a new instance."""
+        self.config.add_recent_file("a.pdf")
+        self.config.add_recent_file("b.pdf")
+        self.config.update_document_progress("a.pdf", 4, 10)
+        self.config.save()
+        self.assertTrue(os.path.exists(config_module.CONFIG_FILE))
+        
+        reloaded = config_module.Config()
+        self.assertEqual(reloaded.get_recent_files(), ["b.pdf", "a.pdf"])
+        reloaded.add_recent_file("a.pdf")
+        self.assertEqual(reloaded.get_recent_files(), ["a.pdf", "b.pdf"])
+        docs = reloaded.get_recent_documents()
+        self.assertEqual(len(docs), 1)
+        self.assertEqual(docs[0]["progress_percent"], 40.0)
+
+    
+    def test_load_empty_config_file(self):
+        """Test that an empty config file falls back to defaults."""
+        config_module.CONFIG_FILE.write_bytes(b"")
+        reloaded = config_module.Config()
+        self.assertEqual(reloaded.get_recent_files(), [])
+        self.assertEqual(reloaded.get('window.width'), config_module.DEFAULT_WINDOW_WIDTH)
+
+
+
+class TestPageCache(unittest.TestCase):
+    """Test cases for the persistent page cache."""
+    
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = Path(self.tmp_dir.name) / "cache" / "pages.sqlite3"
+    
+    def test_round_trip_across_instances(self):
+        """Test that flushed pages survive reopening the cache."""
+        cache = PageCache(self.path)
+        cache.put("doc", 0, 1.5, b"image")
+        self.assertEqual(cache.get("doc", 0, 1.5), b"image")
+        self.assertIsNone(cache.get("doc", 0, 2.0))
+        cache.close()
+        
+        reopened = PageCache(self.path)
+        self.assertEqual(reopened.get("doc", 0, 1.5), b"image")
+        reopened.close()
+    
+    def test_prune_drops_least_recently_used(self):
+        """Test that reopening trims the cache to its budget, oldest first."""
+        cache = PageCache(self.path)
+        with mock.patch("src.pdf_reader.core.page_cache.time.time", side_effect=[1, 2, 3, 4]):
+            cache.put("doc", 0, 1.0, b"x" * 10)
+            cache.put("doc", 1, 1.0, b"x" * 10)
+            cache.put("doc", 2, 1.0, b"x" * 10)
+            cache.get("doc", 0, 1.0)
+        cache.close()
+        
+        pruned = PageCache(self.path, max_bytes=20)
+        self.assertIsNone(pruned.get("doc", 1, 1.0))
+        self.assertIsNotNone(pruned.get("doc", 0, 1.0))
+        self.assertIsNotNone(pruned.get("doc", 2, 1.0))
+        pruned.close()
+    
+    def test_prune_during_session(self):
+        """Test that a long session is trimmed to the budget without reopening."""
+        cache = PageCache(self.path, max_bytes=20)
+        with mock.patch("src.pdf_reader.core.page_cache._PRUNE_EVERY_WRITES", 3), \
+                mock.patch("src.pdf_reader.core.page_cache.time.time", side_effect=[1, 2, 3]):
+            for page in range(3):
+                cache.put("doc", page, 1.0, b"x" * 10)
+            cache.flush()
+        self.assertIsNone(cache.get("doc", 0, 1.0))
+        self.assertIsNotNone(cache.get("doc", 2, 1.0))
+        cache.close()
+    
+    def test_page_samples_round_trip(self):
+        """Test that stored samples decode unchanged and other data is rejected."""
+        samples = bytes(range(256)) * 6
+        data = encode_page_samples(16, 32, 48, samples)
+        self.assertEqual(decode_page_samples(data), (16, 32, 48, samples))
+        self.assertIsNone(decode_page_samples(b"\x89PNG\r\n\x1a\n" + bytes(16)))
+        self.assertIsNone(decode_page_samples(data[:-4]))
+        
+        cache = PageCache(self.path)
+        cache.put_many([("doc", 0, 1.0, data), ("doc", 1, 1.0, data)])
+        cache.close()
+        cache.put("doc", 2, 1.0, data)  # Ignored once closed
+        reopened = PageCache(self.path)
+        self.assertEqual(reopened.get("doc", 1, 1.0), data)
+        self.assertIsNone(reopened.get("doc", 2, 1.0))
+        reopened.close()
+    
+    def test_document_key(self):
+        """Test that the key follows file contents and mtime rather than the path."""
+        first = os.path.join(self.tmp_dir.name, "a.pdf")
+        second = os.path.join(self.tmp_dir.name, "b.pdf")
+        for path in (first, second):
+            with open(path, "wb") as f:
+                f.write(b"%PDF-1.4 same")
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertEqual(document_key(first), document_key(second))
+        
+        os.utime(second, ns=(2_000_000_000, 2_000_000_000))
+        self.assertNotEqual(document_key(first), document_key(second))
+        
+        with open(second, "ab") as f:
+            f.write(b" appended")
+        os.utime(second, ns=(1_000_000_000, 1_000_000_000))
+        self.assertNotEqual(document_key(first), document_key(second))
+        self.assertIsNone(document_key(os.path.join(self.tmp_dir.name, "missing.pdf")))
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,12 +4,21 @@ Integration tests for UI components.
 
 import unittest
 import sys
-from PyQt6.QtWidgets import QApplication
+import os
+import tempfile
+import importlib
+import fitz
+from pathlib import Path
+from unittest import mock
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtTest import QTest
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QPoint, QThreadPool, QLocale
 
 from src.pdf_reader.ui.main_window import MainWindow
-from src.pdf_reader.core.models import ViewMode
+from src.pdf_reader.core.models import ViewMode, Annotation, AnnotationType
+from src.pdf_reader.core.page_cache import document_key
+
+config_module = importlib.import_module("src.pdf_reader.core.config")
 
 
 class TestMainWindow(unittest.TestCase):
@@ -25,12 +34,34 @@ class TestMainWindow(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        # Keep config writes out of the user's home directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        config_dir = Path(self.tmp_dir.name)
+        patcher = mock.patch.multiple(
+            config_module,
+            CONFIG_DIR=config_dir,
+            CONFIG_FILE=config_dir / "config.json",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.main_window = MainWindow()
     
     def tearDown(self):
         """Clean up after tests."""
         self.main_window.close()
     
+    def create_pdf(self, name, page_count=3):
+        """Create a small PDF in a temporary directory and return its path."""
+        path = os.path.join(self.tmp_dir.name, name)
+        doc = fitz.open()
+        for i in range(page_count):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {i + 1}")
+        doc.save(path)
+        doc.close()
+        return path
+    
     def test_window_initialization(self):
         """Test that the main window initializes correctly."""
         self.assertIsNotNone(self.main_window)
@@ -46,6 +77,32 @@ class TestMainWindow(unittest.TestCase):
         for menu in expected_menus:
             self.assertIn(menu, menu_titles)
     
+    def test_help_menu_built_on_first_show(self):
+        """Test that lazily built menus are filled once, when first opened."""
+        help_menu = next(
+            action.menu() for action in self.main_window.menuBar().actions()
+            if action.text() == "&Help"
+        )
+        self.assertEqual(help_menu.actions(), [])
+        help_menu.aboutToShow.emit()
+        help_menu.aboutToShow.emit()
+        titles = [action.text() for action in help_menu.actions() if not action.isSeparator()]
+        self.assertEqual(len(titles), 4)
+        self.assertIn("&About PDF Reader", titles)
+    
+    def test_annotations_menu_built_on_first_show(self):
+        """Test that the Annotations menu is filled on first show around the existing tools."""
+        annotations_menu = next(
+            action.menu() for action in self.main_window.menuBar().actions()
+            if action.text() == "&Annotations"
+        )
+        self.assertEqual(annotations_menu.actions(), [])
+        self.assertTrue(self.main_window.highlight_action.isCheckable())
+        
+        annotations_menu.aboutToShow.emit()
+        tools_menu = annotations_menu.actions()[0].menu()
+        self.assertEqual(tools_menu.actions(), self.main_window.annotation_tool_group.actions())
+    
     def test_view_mode_actions(self):
         """Test that view mode actions are properly set up."""
         self.assertTrue(self.main_window.single_page_action.isCheckable())
@@ -56,6 +113,563 @@ class TestMainWindow(unittest.TestCase):
         
         # Default should be single page
         self.assertTrue(self.main_window.single_page_action.isChecked())
+    
+    def test_view_menu_follows_active_viewer(self):
+        """Test that the checked view mode action tracks the active tab."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        self.main_window.current_viewer().set_view_mode(ViewMode.FIT_WIDTH)
+        self.assertTrue(self.main_window.fit_width_action.isChecked())
+        
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("b.pdf")))
+        self.assertTrue(self.main_window.single_page_action.isChecked())
+        toggles = []
+        for action in self.main_window.view_mode_group.actions():
+            action.toggled.connect(toggles.append)
+        self.main_window.tab_widget.setCurrentIndex(0)
+        # Only the newly checked mode reports the change
+        self.assertEqual(toggles, [True])
+        self.assertTrue(self.main_window.fit_width_action.isChecked())
+        checked = [a for a in self.main_window.view_mode_group.actions() if a.isChecked()]
+        self.assertEqual(checked, [self.main_window.fit_width_action])
+
+    
+    def test_resize_relayout_coalesced(self):
+        """Test that adaptive relayout runs once per size category."""
+        with mock.patch.object(self.main_window, "_rearrange_dock_widgets") as rearrange:
+            for width in (1300, 1350, 1400):
+                self.main_window.resize(width, 900)
+                self.main_window._resize_timer.timeout.emit()
+            self.assertEqual(rearrange.call_count, 1)
+            
+            self.main_window.resize(700, 900)
+            self.main_window._resize_timer.timeout.emit()
+            self.assertEqual(rearrange.call_count, 2)
+            
+            # After the user changes a panel, a resize within the category relayouts too
+            self.main_window.toggle_bookmarks_panel()
+            self.main_window.resize(720, 900)
+            self.main_window._resize_timer.timeout.emit()
+            self.assertEqual(rearrange.call_count, 3)
+            self.main_window.resize(740, 900)
+            self.main_window._resize_timer.timeout.emit()
+            self.assertEqual(rearrange.call_count, 3)
+    
+    def test_adaptive_layout_keeps_panels_unbuilt(self):
+        """Test that showing a large window does not build panels nobody asked for."""
+        self.main_window.resize(1300, 900)
+        self.main_window.show()
+        QTest.qWait(150)  # Past the resize debounce
+        self.assertIsNotNone(self.main_window._layout_size_class)
+        self.assertIsNone(self.main_window.toc_dock)
+        self.assertIsNone(self.main_window.bookmarks_dock)
+        
+        # A panel the user opened is kept by the layout
+        self.main_window.toggle_toc_panel()
+        self.main_window.resize(900, 900)
+        self.main_window._resize_timer.timeout.emit()
+        self.assertFalse(self.main_window.toc_dock.isVisible())
+        self.main_window.resize(1300, 900)
+        self.main_window._resize_timer.timeout.emit()
+        self.assertTrue(self.main_window.toc_dock.isVisible())
+        self.assertIsNone(self.main_window.bookmarks_dock)
+    
+    def test_close_all_tabs(self):
+        """Test that all open document tabs are closed."""
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf(name)))
+        self.assertEqual(self.main_window.tab_widget.count(), 3)
+        
+        self.main_window.close_all_tabs()
+        self.assertEqual(self.main_window.tab_widget.count(), 0)
+        self.assertTrue(self.main_window.tab_widget.updatesEnabled())
+    
+    def test_open_file_loads_after_returning(self):
+        """Test that open_file returns before the document is loaded."""
+        path = self.create_pdf("a.pdf")
+        with mock.patch(
+            "src.pdf_reader.ui.main_window.QFileDialog.getOpenFileName",
+            return_value=(path, ""),
+        ):
+            self.main_window.open_file()
+        self.assertEqual(self.main_window.tab_widget.count(), 0)
+        self.assertTrue(self.main_window.progress_bar.isVisibleTo(self.main_window))
+        
+        # The file is hashed on the thread pool, then opened from the event loop;
+        # the indicator stays up until the last queued document is open
+        other = self.create_pdf("b.pdf")
+        self.main_window.queue_document_load(other)
+        with mock.patch.object(
+            self.main_window, "show_loading_progress", wraps=self.main_window.show_loading_progress
+        ) as show_progress:
+            QThreadPool.globalInstance().waitForDone()
+            QApplication.processEvents()
+        self.assertEqual(show_progress.call_args_list.count(mock.call(False)), 1)
+        self.assertEqual(self.main_window.tab_widget.count(), 2)
+        self.assertFalse(self.main_window.progress_bar.isVisibleTo(self.main_window))
+        self.assertCountEqual(list(self.main_window.recent_files)[:2], [other, path])
+        for file_path, viewer in self.main_window._open_viewers.items():
+            self.assertEqual(viewer._document_key, document_key(file_path))
+        
+        # An open document is switched to without being queued again
+        self.main_window.queue_document_load(path)
+        self.assertEqual(self.main_window._pending_loads, {})
+        self.assertEqual(self.main_window.current_viewer().file_path, path)
+        
+        # The recent file and first progress entry are written together, later
+        self.assertTrue(self.main_window._config_save_timer.isActive())
+        self.assertFalse(config_module.CONFIG_FILE.exists())
+        QTest.qWait(600)
+        self.assertIn(path, config_module.CONFIG_FILE.read_text())
+    
+    def test_progress_save_joins_pending_config_write(self):
+        """Test that committing reading progress schedules the shared config write."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        self.main_window.current_viewer().next_page()
+        QApplication.processEvents()
+        self.main_window._config_save_timer.stop()
+        
+        with mock.patch.object(config_module.config, "save") as save:
+            self.main_window.save_current_progress()
+            save.assert_not_called()
+        self.assertTrue(self.main_window._config_save_timer.isActive())
+    
+    def test_tab_switch_and_close_save_progress(self):
+        """Test that progress committed on tab switches and closes is written to disk."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("b.pdf")))
+        self.main_window.current_viewer().next_page()
+        QApplication.processEvents()
+        self.main_window._config_save_timer.stop()
+        self.main_window.tab_widget.setCurrentIndex(0)
+        self.assertTrue(self.main_window._config_save_timer.isActive())
+        
+        self.main_window.current_viewer().next_page()
+        QApplication.processEvents()
+        self.main_window._config_save_timer.stop()
+        self.main_window.close_tab(0)
+        self.assertTrue(self.main_window._config_save_timer.isActive())
+    
+    def test_recent_files_menu(self):
+        """Test that recently opened files are listed first, without duplicates."""
+        first = self.create_pdf("first.pdf")
+        second = self.create_pdf("second.pdf")
+        for path in (second, first, second, first):
+            self.main_window.add_to_recent_files(path)
+        self.main_window.recent_files_menu.aboutToShow.emit()
+        
+        actions = [
+            action for action in self.main_window._recent_file_actions
+            if action.isVisible()
+        ]
+        self.assertEqual([action.data() for action in actions[:2]], [first, second])
+        self.assertNotIn(first, [action.data() for action in actions[2:]])
+        self.assertTrue(actions[0].text().startswith("first.pdf"))
+        
+        # Files that no longer exist are left out of the menu
+        os.remove(first)
+        self.main_window.recent_files_menu.aboutToShow.emit()
+        visible = [a.data() for a in self.main_window._recent_file_actions if a.isVisible()]
+        self.assertNotIn(first, visible)
+        self.assertIn(second, visible)
+        
+        # Open documents are listed without another trip to the disk
+        self.assertTrue(self.main_window.add_pdf_tab(second))
+        with mock.patch('os.path.exists', return_value=False) as exists:
+            self.main_window.update_recent_files_menu()
+        self.assertNotIn(mock.call(second), exists.call_args_list)
+    
+    def test_panels_created_on_first_show(self):
+        """Test that the TOC and bookmarks docks are built only when shown."""
+        self.assertIsNone(self.main_window.toc_dock)
+        self.assertIsNone(self.main_window.bookmarks_dock)
+        
+        self.main_window.toggle_toc_panel()
+        self.assertIsNotNone(self.main_window.toc_dock)
+        self.assertIs(self.main_window.toc_tree_view.model(), self.main_window.toc_model)
+        self.assertIsNone(self.main_window.bookmarks_dock)
+        
+        self.main_window.toggle_bookmarks_panel()
+        self.assertIs(self.main_window.bookmarks_list_view.model(), self.main_window.bookmarks_model)
+    
+    def test_page_input_validation(self):
+        """Test that the page input only accepts pages of the current document."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=3)))
+        self.assertEqual(self.main_window.page_validator.top(), 3)
+        
+        page_input = self.main_window.page_num_input
+        page_input.clear()
+        QTest.keyClicks(page_input, "x2")
+        self.assertEqual(page_input.text(), "2")
+        QTest.keyClick(page_input, Qt.Key.Key_Return)
+        self.assertEqual(self.main_window.current_viewer().current_page, 1)
+        
+        # Repeated signals for the page already shown leave the input alone
+        edits = []
+        page_input.textChanged.connect(edits.append)
+        self.main_window.update_page_info_from_signal(1)
+        self.assertEqual(edits, [])
+        
+        # A page number being typed is not overwritten by page changes
+        page_input.clear()
+        QTest.keyClicks(page_input, "3")
+        with mock.patch.object(page_input, 'hasFocus', return_value=True):
+            self.main_window.current_viewer().prev_page()
+            self.main_window.update_page_info()
+        self.assertEqual(page_input.text(), "3")
+    
+    def test_page_input_accepts_grouped_numbers(self):
+        """Test that a page number typed with a group separator is understood."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("long.pdf", page_count=1300)))
+        self.main_window.page_validator.setLocale(QLocale(QLocale.Language.English, QLocale.Country.UnitedStates))
+        page_input = self.main_window.page_num_input
+        page_input.clear()
+        QTest.keyClicks(page_input, "1,234")
+        self.assertEqual(page_input.text(), "1,234")
+        QTest.keyClick(page_input, Qt.Key.Key_Return)
+        self.assertEqual(self.main_window.current_viewer().current_page, 1233)
+    
+    def test_page_changes_update_toolbar_from_event_loop(self):
+        """Test that a burst of page changes refreshes the page input once, afterwards."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=3)))
+        viewer = self.main_window.current_viewer()
+        QApplication.processEvents()
+        page_input = self.main_window.page_num_input
+        edits = []
+        page_input.textChanged.connect(edits.append)
+        changes = []
+        viewer.current_page_changed.connect(changes.append)
+        
+        viewer.next_page()
+        viewer.next_page()
+        self.assertEqual(changes, [1, 2])  # One emission per page turn
+        self.assertEqual(edits, [])
+        QApplication.processEvents()
+        self.assertEqual(edits, ["3"])
+    
+    def test_bookmarks_model(self):
+        """Test that the bookmarks panel model follows the viewer's bookmarks."""
+        self.main_window.toggle_bookmarks_panel()
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        viewer = self.main_window.current_viewer()
+        self.assertTrue(viewer.add_bookmark(title="Intro", page_number=1))
+        
+        model = self.main_window.bookmarks_model
+        self.assertEqual(model.rowCount(), 1)
+        index = model.index(0)
+        self.assertEqual(index.data(), "Intro (Page 2)")
+        self.assertEqual(index.data(Qt.ItemDataRole.UserRole).page_number, 1)
+        
+        # Refreshing with the same bookmarks keeps the model as it is
+        resets = []
+        model.modelReset.connect(lambda: resets.append(True))
+        self.main_window.update_bookmarks()
+        self.assertEqual(resets, [])
+        self.assertTrue(viewer.add_bookmark(title="Outro", page_number=2))
+        self.assertEqual(resets, [True])
+        
+        removed = viewer.remove_bookmark(1)
+        self.assertEqual(removed.title, "Intro")
+        self.assertIsNone(viewer.remove_bookmark(1))
+        self.assertEqual([b.page_number for b in viewer.get_bookmarks()], [2])
+        self.assertEqual(model.rowCount(), 1)
+    
+    def test_opening_open_file_switches_to_its_tab(self):
+        """Test that reopening an open file selects its tab instead of adding one."""
+        first = self.create_pdf("a.pdf")
+        self.assertTrue(self.main_window.add_pdf_tab(first))
+        first_viewer = self.main_window.current_viewer()
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("b.pdf")))
+        
+        self.assertTrue(self.main_window.add_pdf_tab(first))
+        self.assertEqual(self.main_window.tab_widget.count(), 2)
+        self.assertIs(self.main_window.current_viewer(), first_viewer)
+        
+        self.main_window.close_tab(0)
+        self.assertTrue(self.main_window.add_pdf_tab(first))
+        self.assertEqual(self.main_window.tab_widget.count(), 2)
+        self.assertIsNot(self.main_window.current_viewer(), first_viewer)
+    
+    def test_opening_tab_refreshes_panels_once(self):
+        """Test that opening a document refreshes each panel a single time."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        window = self.main_window
+        with mock.patch.object(window, "update_toc", wraps=window.update_toc) as update_toc, \
+                mock.patch.object(window, "update_bookmarks", wraps=window.update_bookmarks) as update_bookmarks:
+            self.assertTrue(window.add_pdf_tab(self.create_pdf("b.pdf")))
+        self.assertEqual(update_toc.call_count, 1)
+        self.assertEqual(update_bookmarks.call_count, 1)
+        self.assertEqual(window.total_pages_label.text(), "/ 3")
+        self.assertEqual(window.document_name_label.text(), "b.pdf")
+    
+    def test_tab_switch_does_not_duplicate_connections(self):
+        """Test that switching tabs leaves each viewer's connections unchanged."""
+        for name in ("a.pdf", "b.pdf"):
+            self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf(name)))
+        viewer = self.main_window.tab_widget.widget(0)
+        signals = (
+            viewer.view_mode_changed,
+            viewer.current_page_changed,
+            viewer.current_page_changed_in_continuous_scroll,
+            viewer.zoom_changed,
+            viewer.bookmarks_changed,
+        )
+        counts = [viewer.receivers(signal) for signal in signals]
+        
+        for index in (0, 1, 0, 1, 0):
+            self.main_window.tab_widget.setCurrentIndex(index)
+        self.assertEqual([viewer.receivers(signal) for signal in signals], counts)
+    
+    def test_annotation_tool_actions_track_active_type(self):
+        """Test that the checked annotation tool follows the active type."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        self.main_window.toggle_annotation(AnnotationType.UNDERLINE)
+        self.assertTrue(self.main_window.underline_action.isChecked())
+        self.assertFalse(self.main_window.highlight_action.isChecked())
+        
+        self.main_window.highlight_action.trigger()
+        self.assertIs(self.main_window.current_viewer().active_annotation_type, AnnotationType.HIGHLIGHT)
+        self.assertTrue(self.main_window.highlight_action.isChecked())
+        self.assertFalse(self.main_window.underline_action.isChecked())
+        
+        self.main_window.highlight_action.trigger()
+        self.assertIsNone(self.main_window.current_viewer().active_annotation_type)
+        self.assertFalse(self.main_window.highlight_action.isChecked())
+        
+        # Without a document a tool cannot stay selected
+        self.main_window.close_tab(0)
+        self.main_window.underline_action.trigger()
+        self.assertIsNone(self.main_window.annotation_tool_group.checkedAction())
+    
+    def test_clear_current_page_annotations(self):
+        """Test that clearing annotations only touches the current page."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        viewer = self.main_window.current_viewer()
+        for page in (0, 0, 1):
+            viewer.add_annotation(Annotation(AnnotationType.HIGHLIGHT, page, QPoint(1, 1), QPoint(5, 5)))
+        
+        self.main_window.clear_current_page_annotations()
+        self.assertEqual([ann.page for ann in viewer.annotations], [1])
+        
+        # Clearing everything asks without blocking, then repaints the current
+        # page only if it had annotations
+        self.main_window.clear_all_annotations()
+        box = self.main_window.findChild(QMessageBox)
+        self.assertTrue(box.isVisible())
+        self.assertEqual(len(viewer.annotations), 1)
+        with mock.patch.object(viewer, "render_page_with_annotations") as render:
+            box.button(QMessageBox.StandardButton.Yes).click()
+        self.assertEqual(viewer.annotations, [])
+        render.assert_not_called()
+    
+    def test_delete_multiple_annotations(self):
+        """Test that deleting several annotations keeps the others and drops empty pages."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        viewer = self.main_window.current_viewer()
+        annotations = [
+            Annotation(AnnotationType.HIGHLIGHT, page, QPoint(1, 1), QPoint(5, 5))
+            for page in (0, 0, 0, 1)
+        ]
+        for ann in annotations:
+            viewer.add_annotation(ann)
+        
+        viewer._delete_multiple_annotations([annotations[0], annotations[2], annotations[3]])
+        self.assertEqual(viewer.annotations, [annotations[1]])
+        self.assertNotIn(1, viewer.annotations_by_page)
+    
+    def test_toc_hierarchy(self):
+        """Test that the table of contents is shown as a tree."""
+        path = self.create_pdf("toc.pdf", page_count=3)
+        doc = fitz.open(path)
+        doc.set_toc([[1, "Chapter 1", 1], [2, "Section 1.1", 2], [1, "Chapter 2", 3]])
+        doc.saveIncr()
+        doc.close()
+        self.assertTrue(self.main_window.add_pdf_tab(path))
+        # Hidden panels are not filled
+        self.assertEqual(self.main_window.toc_model.rowCount(), 0)
+        
+        self.main_window.toggle_toc_panel()
+        # The outline is filled in once pending events are processed
+        self.assertEqual(self.main_window.toc_model.item(0).text(), "Loading…")
+        QApplication.processEvents()
+        model = self.main_window.toc_model
+        self.assertEqual(model.rowCount(), 2)
+        chapter = model.item(0)
+        self.assertEqual(chapter.text(), "Chapter 1")
+        self.assertEqual(chapter.rowCount(), 1)
+        self.assertEqual(chapter.child(0).data(Qt.ItemDataRole.UserRole), 1)
+        self.assertEqual(model.item(1).data(Qt.ItemDataRole.UserRole), 2)
+        
+        # Choosing an entry jumps there, and the toolbar follows from the event loop
+        self.main_window.toc_navigate(model.item(1).index())
+        self.assertEqual(self.main_window.current_viewer().current_page, 2)
+        QApplication.processEvents()
+        self.assertEqual(self.main_window.page_num_input.text(), "3")
+        
+        # Reopening the panel without a tab switch does not rebuild anything
+        self.main_window.toggle_toc_panel()
+        with mock.patch.object(self.main_window, "_set_toc_model") as set_model:
+            self.main_window.toggle_toc_panel()
+        set_model.assert_not_called()
+        
+        # Switching tabs reuses the outline built for each document
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("plain.pdf")))
+        QApplication.processEvents()
+        self.assertEqual(self.main_window.toc_model.rowCount(), 0)
+        self.main_window.tab_widget.setCurrentIndex(0)
+        self.assertIs(self.main_window.toc_model, model)
+    
+    def test_page_pixmaps_reused(self):
+        """Test that revisiting a page reuses its rasterized pixmap."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        viewer = self.main_window.current_viewer()
+        viewer.next_page()
+        viewer.prev_page()
+        with mock.patch.object(fitz.Page, "get_pixmap") as get_pixmap:
+            viewer.next_page()
+        get_pixmap.assert_not_called()
+        self.assertEqual(viewer.current_page, 1)
+        
+        # Least recently used pages are dropped once the memory budget is exceeded
+        page_bytes = viewer._page_pixmap_cache_bytes // len(viewer._page_pixmap_cache)
+        with mock.patch("src.pdf_reader.ui.pdf_viewer._PAGE_PIXMAP_CACHE_BYTES", page_bytes * 2):
+            viewer.next_page()
+        self.assertEqual(len(viewer._page_pixmap_cache), 2)
+        self.assertNotIn(0, [page for page, _ in viewer._page_pixmap_cache])
+        
+        self.main_window.close_tab(0)
+        self.assertEqual(len(viewer._page_pixmap_cache), 0)
+        self.assertTrue(viewer.single_double_canvas.pixmap().isNull())
+    
+    def test_rendered_pages_persist_across_opens(self):
+        """Test that reopening a document reuses slow pages rendered before it was closed."""
+        path = self.create_pdf("a.pdf")
+        # Pages that render quickly are not worth storing
+        with mock.patch("src.pdf_reader.ui.pdf_viewer._PERSIST_MIN_RENDER_SECONDS", 60):
+            self.assertTrue(self.main_window.add_pdf_tab(path))
+        self.assertEqual(len(self.main_window.current_viewer()._unsaved_pages), 0)
+        self.main_window.close_tab(0)
+        
+        with mock.patch("src.pdf_reader.ui.pdf_viewer._PERSIST_MIN_RENDER_SECONDS", 0):
+            self.assertTrue(self.main_window.add_pdf_tab(path))
+        viewer = self.main_window.current_viewer()
+        self.assertEqual(len(viewer._unsaved_pages), 1)
+        self.assertTrue(viewer._store_timer.isActive())
+        # Closing hands the pages to an encoder thread; they are written once it reports back
+        self.main_window.close_tab(0)
+        self.assertEqual(len(viewer._unsaved_pages), 0)
+        QThreadPool.globalInstance().waitForDone()
+        QApplication.processEvents()
+        
+        with mock.patch.object(fitz.Page, "get_pixmap") as get_pixmap:
+            self.assertTrue(self.main_window.add_pdf_tab(path))
+        get_pixmap.assert_not_called()
+        viewer = self.main_window.current_viewer()
+        self.assertFalse(viewer.single_double_canvas.pixmap().isNull())
+    
+    def test_prefetch_follows_reading_direction(self):
+        """Test that the next page in the reading direction is prefetched."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=5)))
+        viewer = self.main_window.current_viewer()
+        viewer.jump_to_page(2)
+        viewer.next_page()
+        self.assertTrue(viewer._prefetch_timer.isActive())
+        self.assertNotIn(4, {page for page, _ in viewer._page_pixmap_cache})
+        viewer._prefetch_neighbor_pages()
+        self.assertIn(4, {page for page, _ in viewer._page_pixmap_cache})
+        
+        viewer.prev_page()
+        self.assertNotIn(1, {page for page, _ in viewer._page_pixmap_cache})
+        viewer._prefetch_neighbor_pages()
+        self.assertIn(1, {page for page, _ in viewer._page_pixmap_cache})
+    
+    def test_continuous_scroll_tracks_visible_pages(self):
+        """Test that continuous scrolling renders pages near the viewport and follows the page."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=8)))
+        viewer = self.main_window.current_viewer()
+        self.main_window.resize(800, 600)
+        self.main_window.show()
+        viewer.set_view_mode(ViewMode.CONTINUOUS_SCROLL)
+        QTest.qWait(250)  # Lets the initial jump settle
+        tops = viewer._page_tops
+        self.assertEqual(len(tops), 8)
+        self.assertEqual(tops, sorted(tops))
+        
+        # Page 5's middle is just above the viewport center
+        viewer.scroll_area.verticalScrollBar().setValue(
+            tops[5] + viewer._page_geometries[5].height() // 2
+            - viewer.scroll_area.viewport().height() // 2 + 1
+        )
+        viewer._update_visible_pages()
+        inflated = [i for i, widget in enumerate(viewer._page_widgets) if widget is not None]
+        self.assertIn(5, inflated)
+        self.assertNotIn(0, inflated)
+        self.assertEqual(inflated, list(range(inflated[0], inflated[-1] + 1)))
+        self.assertEqual(viewer.current_page, 5)
+    
+    def test_search_reports_results_progressively(self):
+        """Test that search results stream in and the first match is shown early."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=4)))
+        viewer = self.main_window.current_viewer()
+        self.main_window.search_input.setText("Page")
+        
+        with mock.patch("src.pdf_reader.ui.pdf_viewer._SEARCH_PAGES_PER_BATCH", 1):
+            self.main_window.perform_search()
+            viewer._search_next_batch()
+            self.assertEqual(self.main_window.search_result_label.text(), "1 results…")
+            self.assertEqual(viewer.current_search_index, 0)
+            while viewer._search_timer.isActive():
+                QApplication.processEvents()
+        self.assertEqual(self.main_window.search_result_label.text(), "4 results")
+        self.assertTrue(self.main_window.search_next_action.isEnabled())
+        self.main_window.search_next_action.trigger()
+        self.assertEqual(viewer.current_search_index, 1)
+        
+        # Annotating clears the search and its toolbar state
+        self.main_window.toggle_annotation_mode()
+        self.assertEqual(viewer.search_results, [])
+        self.assertEqual(self.main_window.search_result_label.text(), "0 results")
+        self.assertFalse(self.main_window.search_next_action.isEnabled())
+    
+    def test_search_runs_after_typing_pauses(self):
+        """Test that typing in the search box searches once, after a pause."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=2)))
+        viewer = self.main_window.current_viewer()
+        QTest.keyClicks(self.main_window.search_input, "Page")
+        self.assertTrue(self.main_window._search_debounce.isActive())
+        self.assertEqual(viewer.search_text_str, "")
+        
+        QTest.qWait(300)
+        self.assertEqual(viewer.search_text_str, "Page")
+        self.assertFalse(self.main_window._search_debounce.isActive())
+    
+    def test_reload_releases_previous_document(self):
+        """Test that loading another file drops the old document and its cached pages."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf", page_count=3)))
+        viewer = self.main_window.current_viewer()
+        viewer.next_page()
+        old_doc = viewer.doc
+        self.assertTrue(viewer._prefetch_timer.isActive())
+        
+        self.assertTrue(viewer.load_pdf(self.create_pdf("b.pdf", page_count=1)))
+        self.assertTrue(old_doc.is_closed)
+        self.assertEqual(viewer.page_count, 1)
+        self.assertEqual({page for page, _ in viewer._page_pixmap_cache}, {0})
+    
+    def test_close_tab_releases_viewer(self):
+        """Test that closing a tab detaches the viewer and closes its document."""
+        self.assertTrue(self.main_window.add_pdf_tab(self.create_pdf("a.pdf")))
+        viewer = self.main_window.current_viewer()
+        doc = viewer.doc
+        
+        self.main_window.close_tab(0)
+        self.assertIsNone(viewer.parent())
+        self.assertIsNone(viewer.doc)
+        self.assertTrue(doc.is_closed)
+        self.assertEqual(viewer._page_bounds, [])
+        self.assertFalse(viewer._page_pixmap_cache)
+        for signal in (viewer.view_mode_changed, viewer.current_page_changed,
+                       viewer.zoom_changed, viewer.bookmarks_changed, viewer.search_progress):
+            self.assertEqual(viewer.receivers(signal), 0)
 
 
 if __name__ == '__main__':